@@ -0,0 +1,59 @@
+"""
+Measure the throughput of the word-guru HTTP service.
+
+Start the fake OpenAI backend and the service before running it:
+
+    python dev/fake-openai/fake-openai.py --port 9000 --delay 0.5 &
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 word-guru --openai-key fake http --max-concurrency 64 &
+    python dev/benchmark/http-server.py --requests 512 --clients 64
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import http.client
+import json
+import threading
+import time
+
+local = threading.local()
+
+
+def post(host: str, port: int, path: str, body):
+    if not hasattr(local, "connection"):
+        local.connection = http.client.HTTPConnection(host, port)
+    local.connection.request(
+        "POST", path, json.dumps(body), {"Content-Type": "application/json"}
+    )
+    response = local.connection.getresponse()
+    response.read()
+    return response.status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument(
+        "--distinct-words",
+        type=int,
+        default=0,
+        help="Number of distinct words requested. Defaults to one word per request.",
+    )
+    args = parser.parse_args()
+
+    distinct_words = args.distinct_words or args.requests
+
+    def send(i: int):
+        body = {"message": f"word{i % distinct_words}", "language": "eng"}
+        return post(args.host, args.port, "/definition", body)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        statuses = list(executor.map(send, range(args.requests)))
+    elapsed = time.monotonic() - start
+
+    print(f"{args.requests} requests in {elapsed:.2f}s")
+    print(f"{args.requests / elapsed:.1f} requests/s")
+    print(f"{statuses.count(200)} succeeded")
@@ -0,0 +1,45 @@
+"""
+Compare the per-call cost of preparing a prompt.
+
+- toml: open and parse the prompt file at every call (former behaviour).
+- registry: look up the parsed prompt in the prompt registry.
+- rendered: look up the system prompt already rendered for the language.
+"""
+
+from danoan.word_guru import prompts
+from danoan.word_guru.core import prompt_registry
+
+import importlib.resources as pgk_resources
+import timeit
+import toml
+
+from danoan.llm_assistant.common.model import PromptConfiguration
+
+PROMPT_FILENAME = "word-definition.toml"
+LANGUAGE_NAMES = (("language", "English"),)
+NUMBER = 2000
+
+
+def parse_toml():
+    with pgk_resources.files(prompts).joinpath(PROMPT_FILENAME).open("r") as f:
+        prompt_config = PromptConfiguration(**toml.load(f))
+    return prompt_config.system_prompt.format(**dict(LANGUAGE_NAMES))
+
+
+def lookup_registry():
+    prompt_config = prompt_registry.get_prompt(PROMPT_FILENAME)
+    return prompt_config.system_prompt.format(**dict(LANGUAGE_NAMES))
+
+
+def lookup_rendered():
+    return prompt_registry.render_system_prompt(PROMPT_FILENAME, LANGUAGE_NAMES)
+
+
+if __name__ == "__main__":
+    for name, function in [
+        ("toml", parse_toml),
+        ("registry", lookup_registry),
+        ("rendered", lookup_rendered),
+    ]:
+        seconds = timeit.timeit(function, number=NUMBER)
+        print(f"{name:>10}: {seconds / NUMBER * 1e6:10.2f} us/call")
@@ -0,0 +1,162 @@
+"""
+Local fake of the OpenAI chat completions endpoint.
+
+Every completion answers the user message as a json list after a
+configurable delay. Streamed completions spread the delay over chunks of
+eight characters. Point word-guru to it by setting OPENAI_BASE_URL:
+
+    python dev/fake-openai/fake-openai.py --port 9000 --delay 0.5 &
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 word-guru --openai-key fake http
+
+Provider hiccups are simulated with --error-rate, the fraction of requests
+answered with 429 and a Retry-After header, and --slow-rate, the fraction of
+requests delayed by --slow-delay seconds instead of --delay.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import random
+import time
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    error_rate = 0.0
+    retry_after = 0.1
+    slow_rate = 0.0
+    slow_delay = 5.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(content_length))
+        if random.random() < self.error_rate:
+            self._rate_limited()
+            return
+
+        user_message = request["messages"][-1]["content"]
+        content = json.dumps([user_message.strip()])
+        if request.get("stream"):
+            self._stream(request, content)
+            return
+
+        time.sleep(self.slow_delay if random.random() < self.slow_rate else self.delay)
+        prompt_tokens = sum(len(m["content"].split()) for m in request["messages"])
+        completion_tokens = len(user_message.split())
+        body = json.dumps(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": content,
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _rate_limited(self):
+        body = json.dumps(
+            {"error": {"message": "Rate limit reached.", "type": "requests"}}
+        ).encode()
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Retry-After", str(self.retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, request, content: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = [content[i : i + 8] for i in range(0, len(content), 8)]
+        for index, piece in enumerate(pieces):
+            time.sleep(self.delay / len(pieces))
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": piece},
+                        "finish_reason": "stop" if index == len(pieces) - 1 else None,
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--delay", type=float, default=0.5, help="Seconds to wait before answering."
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429 Too Many Requests.",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=0.1,
+        help="Seconds given in the Retry-After header of 429 responses.",
+    )
+    parser.add_argument(
+        "--slow-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered after --slow-delay seconds.",
+    )
+    parser.add_argument(
+        "--slow-delay",
+        type=float,
+        default=5.0,
+        help="Seconds to wait before answering slow requests.",
+    )
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.delay = args.delay
+    FakeOpenAIHandler.error_rate = args.error_rate
+    FakeOpenAIHandler.retry_after = args.retry_after
+    FakeOpenAIHandler.slow_rate = args.slow_rate
+    FakeOpenAIHandler.slow_delay = args.slow_delay
+    server = FakeOpenAIServer(("127.0.0.1", args.port), FakeOpenAIHandler)
+    server.serve_forever()
@@ -0,0 +1,54 @@
+"""
+Generate the language table used by danoan.word_guru.core.language.
+
+The table holds every language having an ISO 639-1 code, which covers
+the languages in common use. Other ISO 639-3 codes are resolved with
+pycountry at runtime.
+
+Usage: python dev/generate-language-table/generate-language-table.py
+"""
+
+import json
+from pathlib import Path
+import pycountry
+
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+OUTPUT_FILEPATH = (
+    PROJECT_PATH / "src" / "danoan" / "word_guru" / "core" / "language_table.py"
+)
+
+HEADER = '''"""
+ISO 639 languages with an ISO 639-1 code.
+
+Generated by dev/generate-language-table/generate-language-table.py
+from pycountry {version}. Do not edit by hand.
+"""
+
+'''
+
+
+def _quote(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def main():
+    languages = sorted(
+        (language for language in pycountry.languages if hasattr(language, "alpha_2")),
+        key=lambda language: language.alpha_3,
+    )
+
+    lines = [HEADER.format(version=pycountry.__version__)]
+    lines.append("LANGUAGE_NAMES = {\n")
+    for language in languages:
+        lines.append(f"    {_quote(language.alpha_3)}: {_quote(language.name)},\n")
+    lines.append("}\n\nALPHA2_TO_ALPHA3 = {\n")
+    for language in sorted(languages, key=lambda language: language.alpha_2):
+        lines.append(f"    {_quote(language.alpha_2)}: {_quote(language.alpha_3)},\n")
+    lines.append("}\n")
+
+    OUTPUT_FILEPATH.write_text("".join(lines))
+    print(f"{len(languages)} languages written to {OUTPUT_FILEPATH}")
+
+
+if __name__ == "__main__":
+    main()
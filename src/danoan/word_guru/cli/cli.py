@@ -1,7 +1,28 @@
-from danoan.word_guru.cli.commands import copywriter, dictionary, translate, setup
+from danoan.word_guru.cli.commands import (
+    cache,
+    copywriter,
+    dictionary,
+    http_server,
+    translate,
+    serve,
+    setup,
+    shell,
+    stats,
+)
 from danoan.word_guru.cli import config
+from danoan.word_guru.core import rate_limit
+from danoan.word_guru.logging_config import setup_logging
 
 import argparse
+from typing import Any, Dict
+
+# Configuration fields passed to the clients of danoan.word_guru.core.api
+CLIENT_OPTIONS = [
+    "cache_max_entries",
+    "cache_ttl",
+    "cache_memory_max_entries",
+    "cache_memory_max_bytes",
+]
 
 
 def extend_parser(subcommand_action=None):
@@ -30,14 +51,50 @@ def extend_parser(subcommand_action=None):
 
     subparser_action = parser.add_subparsers()
 
-    list_of_commands = [copywriter, dictionary, translate, setup]
+    list_of_commands = [
+        copywriter,
+        dictionary,
+        translate,
+        setup,
+        shell,
+        serve,
+        http_server,
+        cache,
+        stats,
+    ]
     for command in list_of_commands:
         command.extend_parser(subparser_action)
 
     return parser
 
 
+def configure_clients(input_params: Dict[str, Any]):
+    """
+    Set the cache and retry options of the clients used by the commands.
+
+    The client modules are only imported if an option is configured, such
+    that commands which do not send requests start fast.
+    """
+    client_options = {
+        name: input_params[name]
+        for name in CLIENT_OPTIONS
+        if input_params.get(name) is not None
+    }
+    retry_policy = input_params.get("retry_policy")
+    if not client_options and retry_policy is None:
+        return
+
+    from danoan.word_guru.core import api
+    from danoan.word_guru.core.resilience import RetryPolicy
+
+    if retry_policy is not None:
+        client_options["retry_policy"] = RetryPolicy(**retry_policy)
+    api.configure_default_clients(**client_options)
+
+
 def main():
+    setup_logging()
+
     config_file_params = {}
     try:
         configuration_file = config.get_configuration()
@@ -55,6 +112,13 @@ def main():
         elif input_params[key] is None:
             input_params[key] = value
 
+    rate_limit.configure_shared_limits(
+        input_params.get("requests_per_minute"),
+        input_params.get("tokens_per_minute"),
+        input_params.get("rate_limit_path"),
+    )
+    configure_clients(input_params)
+
     if "func" in args:
         args.func(**input_params)
     elif "subcommand_help" in args:
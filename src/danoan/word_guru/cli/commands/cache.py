@@ -0,0 +1,35 @@
+from danoan.word_guru.cli.commands.cache_commands import (
+    export_entries,
+    import_entries,
+    prune,
+    stats,
+    warm,
+)
+
+import argparse
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "cache"
+    description = "Maintain the cache of responses"
+    help = description
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(description)
+
+    subparser_action = parser.add_subparsers()
+
+    list_of_commands = [stats, prune, export_entries, import_entries, warm]
+    for command in list_of_commands:
+        command.extend_parser(subparser_action)
+
+    parser.set_defaults(subcommand_help=parser.print_help)
+
+    return parser
@@ -0,0 +1,61 @@
+from danoan.word_guru.cli import utils
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+
+def export_entries(
+    cache_path: Optional[str],
+    output: str = "-",
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Export the cache as json lines.
+
+    Each line holds one entry with its operation, message, languages,
+    prompt version, model and response. The least recently used entries
+    come first, such that importing the file preserves the eviction order.
+    """
+    result_cache = utils.open_cache(cache_path, cache_max_entries, cache_ttl)
+    f = sys.stdout if output == "-" else open(output, "w")
+    try:
+        for entry in result_cache.export_entries():
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "export"
+    description = export_entries.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="File where entries are written. Defaults to the standard output.",
+    )
+
+    parser.set_defaults(func=export_entries, subcommand_help=parser.print_help)
+
+    return parser
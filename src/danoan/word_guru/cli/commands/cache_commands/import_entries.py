@@ -0,0 +1,68 @@
+from danoan.word_guru.cli import utils
+
+import argparse
+import json
+import logging
+import sys
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def import_entries(
+    cache_path: Optional[str],
+    input_file: str,
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Import cache entries from a json lines file created by word-guru cache export.
+
+    Imported entries replace the ones with the same key. Entries of prompts
+    that differ from the installed ones are imported but never served, see
+    word-guru cache prune.
+    """
+    result_cache = utils.open_cache(cache_path, cache_max_entries, cache_ttl)
+    f = sys.stdin if input_file == "-" else open(input_file, "r")
+    try:
+        entries = (json.loads(line) for line in f if line.strip())
+        imported = result_cache.import_entries(entries)
+    except (KeyError, json.JSONDecodeError) as ex:
+        logger.error(f"Invalid cache entry: {ex}")
+        exit(1)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    print(f"Imported {imported} entries.")
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "import"
+    description = import_entries.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "input_file",
+        help="File created by word-guru cache export. Use - to read from the standard input.",
+    )
+
+    parser.set_defaults(func=import_entries, subcommand_help=parser.print_help)
+
+    return parser
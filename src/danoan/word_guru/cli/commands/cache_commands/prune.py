@@ -0,0 +1,59 @@
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import operation, packing
+
+import argparse
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def prune(
+    cache_path: Optional[str],
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Remove unreachable entries from the cache and compact it.
+
+    Entries generated with a prompt that has changed since, e.g. after an
+    upgrade of word-guru, are never served again. This command removes
+    them, together with the entries written by versions of word-guru
+    prior to its own cache, and gives the freed space back to the file
+    system.
+    """
+    result_cache = utils.open_cache(cache_path, cache_max_entries, cache_ttl)
+    size_before = result_cache.size_bytes()
+    removed = result_cache.prune(
+        {**operation.get_prompt_versions(), **packing.get_prompt_versions()}
+    )
+    result_cache.compact()
+    print(
+        f"Removed {removed} entries. {len(result_cache)} entries left. Size: {size_before} -> {result_cache.size_bytes()} bytes."
+    )
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "prune"
+    description = prune.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.set_defaults(func=prune, subcommand_help=parser.print_help)
+
+    return parser
@@ -0,0 +1,86 @@
+from danoan.word_guru.cli import utils
+
+import argparse
+from datetime import datetime
+from typing import Optional
+
+
+def stats(
+    cache_path: Optional[str],
+    top: int = 10,
+    reset: bool = False,
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Show statistics of the cache.
+
+    Report the number of entries per operation and language, the size of
+    the cache file, the ratio of lookups answered by the cache and the
+    entries with most hits. Hits and misses are counted by every process
+    using the cache file since its creation or since the last reset.
+    """
+    result_cache = utils.open_cache(cache_path, cache_max_entries, cache_ttl)
+    if reset:
+        result_cache.reset_counters()
+        print("Counters reset.")
+        return
+
+    cache_stats = result_cache.stats(top)
+
+    print(f"Cache file: {result_cache.path} ({cache_stats.size_bytes} bytes)")
+    since = datetime.fromtimestamp(cache_stats.since).strftime("%Y-%m-%d %H:%M:%S")
+    if cache_stats.hit_ratio is None:
+        print(f"Hit ratio: no lookups since {since}")
+    else:
+        print(
+            f"Hit ratio: {cache_stats.hit_ratio:.1%} ({cache_stats.hits} hits, {cache_stats.misses} misses since {since})"
+        )
+
+    print("\nEntries:")
+    for (operation_name, languages), count in cache_stats.entries.items():
+        print(f"  {operation_name:<20} {' '.join(languages):<10} {count:>8}")
+    print(f"  {'total':<31} {sum(cache_stats.entries.values()):>8}")
+
+    if cache_stats.top_keys:
+        print("\nTop keys:")
+        for operation_name, message, languages, hits in cache_stats.top_keys:
+            print(f"  {hits:>8}  {operation_name} {' '.join(languages)}: {message}")
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "stats"
+    description = stats.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of entries with most hits to show.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Set the hits and misses counters to zero.",
+    )
+
+    parser.set_defaults(func=stats, subcommand_help=parser.print_help)
+
+    return parser
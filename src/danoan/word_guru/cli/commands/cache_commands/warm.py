@@ -0,0 +1,121 @@
+from danoan.word_guru.cli import utils
+
+import argparse
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPERATIONS = ["definition", "synonym", "pos-tag"]
+WARMABLE_OPERATIONS = ["definition", "synonym", "usage-examples", "pos-tag"]
+
+
+def read_word_list(word_list: str, top: Optional[int] = None) -> List[str]:
+    """
+    Read a frequency-ranked word list, most frequent word first.
+
+    Each line holds a word, optionally followed by a tab and its frequency.
+    """
+    words = []
+    for line in utils.read_batch_file(word_list):
+        words.append(line.split("\t")[0].strip())
+        if top and len(words) == top:
+            break
+    return words
+
+
+def warm(
+    openai_key: str,
+    cache_path: Optional[str],
+    word_list: str,
+    languages: List[str],
+    top: Optional[int] = None,
+    operations: Optional[List[str]] = None,
+    max_concurrency: int = 8,
+    requests_per_second: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Fill the cache with the responses for the most frequent words.
+
+    Every operation is executed for every word of the list and every
+    language. Words already in the cache are not requested again, so an
+    interrupted warm-up can be resumed by running the command again.
+    """
+    from danoan.word_guru.core import api
+
+    utils.check_cache_path(cache_path)
+    client = api.get_client(openai_key, cache_path)
+    words = read_word_list(word_list, top)
+
+    for operation_name in operations or DEFAULT_OPERATIONS:
+        for language in languages:
+            failed = 0
+            for batch_item in client.execute_batch(
+                operation_name,
+                words,
+                (language,),
+                max_concurrency,
+                requests_per_second,
+            ):
+                if not batch_item.ok:
+                    failed += 1
+                    logger.debug(f"{batch_item.input}: {batch_item.error}")
+            print(
+                f"{operation_name} {language}: {len(words) - failed} cached, {failed} failed.",
+                flush=True,
+            )
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "warm"
+    description = warm.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "word_list",
+        help="File with one word per line, most frequent first. Use - to read from the standard input.",
+    )
+    parser.add_argument(
+        "languages",
+        nargs="+",
+        help="The ISO 639-3 or ISO 639-1 codes of the languages. E.g. eng fra",
+    )
+    parser.add_argument("--top", type=int, help="Only warm the first TOP words.")
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=WARMABLE_OPERATIONS,
+        default=DEFAULT_OPERATIONS,
+        help="Operations to execute for each word.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of requests in flight at the same time.",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        help="Maximum number of requests started per second.",
+    )
+
+    parser.set_defaults(func=warm, subcommand_help=parser.print_help)
+
+    return parser
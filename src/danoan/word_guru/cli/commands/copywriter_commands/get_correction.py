@@ -1,29 +1,72 @@
-from danoan.word_guru.logging_config import setup_logging
-from danoan.word_guru.core import api, exception
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import exception
 
 import argparse
 import logging
+import sys
 from typing import Optional
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 def get_correction(
     openai_key: str,
     cache_path: Optional[str],
-    text: str,
+    text: Optional[str],
     language: str,
+    stream: bool = False,
+    file: Optional[str] = None,
+    chunk_size: int = 2000,
+    max_concurrency: int = 4,
     *args,
     **kwargs,
 ):
     """
     Get the corrected version of a text.
+
+    With --stream, the correction is printed as it is written.
+
+    With --file, a whole document is corrected by chunks aligned to its
+    paragraphs, sent concurrently and cached one by one. Correcting the
+    document again after editing a paragraph only sends the chunks of this
+    paragraph.
     """
+    if (text is None) == (file is None):
+        logger.error("Give either a text or the --file option.")
+        exit(1)
+
     try:
-        print(api.get_correction(openai_key, cache_path, text, language))
+        if file is not None:
+            from danoan.word_guru.core import api
+
+            if file == "-":
+                document = sys.stdin.read()
+            else:
+                with open(file, "r") as f:
+                    document = f.read()
+
+            print(
+                api.get_document_correction(
+                    openai_key,
+                    cache_path,
+                    document,
+                    language,
+                    chunk_size,
+                    max_concurrency,
+                )
+            )
+        elif stream:
+            from danoan.word_guru.core import api
+
+            utils.print_stream(
+                api.get_correction_stream(openai_key, cache_path, text, language)
+            )
+        else:
+            print(utils.execute(openai_key, cache_path, "correction", text, language))
     except exception.OpenAIEmptyResponseError:
         logger.error("OpeanAI returned an empty response.")
+    except ValueError as ex:
+        logger.error(f"Could not correct the text: {ex}")
 
 
 def extend_parser(subcommand_action=None):
@@ -45,10 +88,28 @@ def extend_parser(subcommand_action=None):
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
 
-    parser.add_argument("text", help="The text you want a correction.")
+    parser.add_argument("text", nargs="?", help="The text you want a correction.")
     parser.add_argument(
         "language",
-        help="The IETF 639-3 code of the language. E.g. eng",
+        help="The ISO 639-3 or ISO 639-1 code of the language. E.g. eng or en",
+    )
+
+    utils.add_stream_argument(parser)
+    parser.add_argument(
+        "--file",
+        help="Correct the document in this file instead of the text. Use - to read from the standard input.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=2000,
+        help="Maximum number of characters of each chunk of the document sent with --file.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of chunks of the document in flight at the same time.",
     )
 
     parser.set_defaults(func=get_correction, subcommand_help=parser.print_help)
@@ -4,6 +4,7 @@ from danoan.word_guru.cli.commands.dictionary_commands import (
     get_reverse_definition,
     get_usage_examples,
     get_pos_tag,
+    get_word_card,
 )
 
 import argparse
@@ -32,6 +33,7 @@ def extend_parser(subcommand_action=None):
         get_reverse_definition,
         get_usage_examples,
         get_pos_tag,
+        get_word_card,
     ]
     for command in list_of_commands:
         command.extend_parser(subparser_action)
@@ -1,19 +1,22 @@
-from danoan.word_guru.logging_config import setup_logging
-from danoan.word_guru.core import api, exception
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import exception
 
 import argparse
 import logging
 from typing import Optional
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 def get_reverse_definition(
     openai_key: str,
     cache_path: Optional[str],
-    text: str,
+    text: Optional[str],
     language: str,
+    batch_file: Optional[str] = None,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
     *args,
     **kwargs,
 ):
@@ -21,7 +24,29 @@ def get_reverse_definition(
     Get a list of words that best encodes a given text.
     """
     try:
-        print(api.get_reverse_definition(openai_key, cache_path, text, language))
+        if batch_file:
+            from danoan.word_guru.core import api
+
+            texts = utils.read_batch_file(batch_file)
+            batch_items = api.get_reverse_definition_batch(
+                openai_key,
+                cache_path,
+                texts,
+                language,
+                max_concurrency,
+                requests_per_second,
+                pack_size,
+            )
+            utils.print_batch_items(batch_items)
+        elif text:
+            print(
+                utils.execute(
+                    openai_key, cache_path, "reverse-definition", text, language
+                )
+            )
+        else:
+            logger.error("Either the text or the --batch-file option must be given.")
+            exit(1)
     except exception.OpenAIEmptyResponseError:
         logger.error("OpeanAI returned an empty response.")
 
@@ -46,11 +71,15 @@ def extend_parser(subcommand_action=None):
         )
 
     parser.add_argument(
-        "text", help="The text you ask for the word that best encode its intention."
+        "text",
+        nargs="?",
+        help="The text you ask for the word that best encode its intention.",
     )
     parser.add_argument(
-        "language", help="The IETF 639-3 code of the language. E.g. eng"
+        "language",
+        help="The ISO 639-3 or ISO 639-1 code of the language. E.g. eng or en",
     )
+    utils.add_batch_arguments(parser)
 
     parser.set_defaults(func=get_reverse_definition, subcommand_help=parser.print_help)
 
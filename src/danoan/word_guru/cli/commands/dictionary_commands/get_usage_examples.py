@@ -1,19 +1,22 @@
-from danoan.word_guru.logging_config import setup_logging
-from danoan.word_guru.core import api, exception
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import exception
 
 import argparse
 import logging
 from typing import Optional
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 def get_usage_examples(
     openai_key: str,
     cache_path: Optional[str],
-    word: str,
+    word: Optional[str],
     language: str,
+    batch_file: Optional[str] = None,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
     *args,
     **kwargs,
 ):
@@ -21,7 +24,27 @@ def get_usage_examples(
     Get common examples using the given word in the given language.
     """
     try:
-        print(api.get_usage_examples(openai_key, cache_path, word, language))
+        if batch_file:
+            from danoan.word_guru.core import api
+
+            words = utils.read_batch_file(batch_file)
+            batch_items = api.get_usage_examples_batch(
+                openai_key,
+                cache_path,
+                words,
+                language,
+                max_concurrency,
+                requests_per_second,
+                pack_size,
+            )
+            utils.print_batch_items(batch_items)
+        elif word:
+            print(
+                utils.execute(openai_key, cache_path, "usage-examples", word, language)
+            )
+        else:
+            logger.error("Either the word or the --batch-file option must be given.")
+            exit(1)
     except exception.OpenAIEmptyResponseError:
         logger.error("OpeanAI returned an empty response.")
 
@@ -45,10 +68,12 @@ def extend_parser(subcommand_action=None):
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
 
-    parser.add_argument("word", help="The word you ask for usage examples.")
+    parser.add_argument("word", nargs="?", help="The word you ask for usage examples.")
     parser.add_argument(
-        "language", help="The IETF 639-3 code of the language. E.g. eng"
+        "language",
+        help="The ISO 639-3 or ISO 639-1 code of the language. E.g. eng or en",
     )
+    utils.add_batch_arguments(parser)
 
     parser.set_defaults(func=get_usage_examples, subcommand_help=parser.print_help)
 
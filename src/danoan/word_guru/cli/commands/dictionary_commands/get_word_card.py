@@ -0,0 +1,69 @@
+from danoan.word_guru.core import exception
+
+import argparse
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_word_card(
+    openai_key: str,
+    cache_path: Optional[str],
+    word: str,
+    language: str,
+    separate_requests: bool = False,
+    *args,
+    **kwargs,
+):
+    """
+    Get the definitions, synonyms, part-of-speech tags and usage examples of a word.
+
+    The word card is printed as a json object. All fields are requested in
+    a single request unless --separate-requests is given.
+    """
+    from danoan.word_guru.core import api
+
+    try:
+        print(
+            api.get_word_card(
+                openai_key, cache_path, word, language, not separate_requests
+            )
+        )
+    except exception.OpenAIEmptyResponseError:
+        logger.error("OpeanAI returned an empty response.")
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "get-word-card"
+    description = get_word_card.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument("word", help="The word you ask for the word card.")
+    parser.add_argument(
+        "language",
+        help="The ISO 639-3 or ISO 639-1 code of the language. E.g. eng or en",
+    )
+    parser.add_argument(
+        "--separate-requests",
+        action="store_true",
+        help="Request each field in parallel with the individual operations.",
+    )
+
+    parser.set_defaults(func=get_word_card, subcommand_help=parser.print_help)
+
+    return parser
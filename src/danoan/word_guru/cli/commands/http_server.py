@@ -0,0 +1,69 @@
+import argparse
+import logging
+import signal
+import sys
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def http_server(
+    openai_key: Optional[str],
+    cache_path: Optional[str],
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    max_concurrency: int = 16,
+    *args,
+    **kwargs,
+):
+    """
+    Start an HTTP json service exposing the word-guru operations.
+
+    Each operation is available at POST /<operation> and POST /<operation>/batch.
+    The list of operations and their language fields is given by GET /operations.
+
+    Example:
+        curl -d '{"message": "pareil", "from_language": "fra", "to_language": "eng"}' localhost:8000/translation
+    """
+    from danoan.word_guru.core import api, http_server
+
+    client = api.get_client(openai_key, cache_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info(f"Listening on http://{host}:{port}")
+    try:
+        http_server.serve(host, port, client, max_concurrency)
+    except KeyboardInterrupt:
+        pass
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "http"
+    description = http_server.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind.")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of requests sent to openai at the same time.",
+    )
+
+    parser.set_defaults(func=http_server, subcommand_help=parser.print_help)
+
+    return parser
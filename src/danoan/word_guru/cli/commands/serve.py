@@ -0,0 +1,65 @@
+from danoan.word_guru.core import daemon
+
+import argparse
+import logging
+import signal
+import sys
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def serve(
+    openai_key: Optional[str],
+    cache_path: Optional[str],
+    socket_path: Optional[str] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Start the word-guru daemon.
+
+    The daemon keeps the client, the prompts and the cache warm and listens
+    on a Unix domain socket. While it is running, word-guru commands send
+    their requests to it instead of setting up a new client. Stop it with
+    Ctrl+C.
+    """
+    path = socket_path or daemon.get_socket_path()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info(f"Listening on {path}")
+    try:
+        daemon.serve(path, openai_key, cache_path)
+    except FileExistsError as ex:
+        logger.error(ex)
+        exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "serve"
+    description = serve.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "--socket-path",
+        help=f"Path of the Unix domain socket. Defaults to the value of {daemon.WORD_GURU_SOCKET_ENV_VARIABLE} or to a file in the temporary directory.",
+    )
+
+    parser.set_defaults(func=serve, subcommand_help=parser.print_help)
+
+    return parser
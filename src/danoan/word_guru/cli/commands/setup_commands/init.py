@@ -4,10 +4,11 @@ from danoan.word_guru.cli import config
 import argparse
 import os
 from pathlib import Path
-import toml
 
 
 def init(*args, **kwargs):
+    import toml
+
     configuration_file = Path(os.getcwd()) / config.WORD_GURU_CONFIGURATION_FILENAME
 
     if configuration_file.exists():
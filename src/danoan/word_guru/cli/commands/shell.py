@@ -0,0 +1,143 @@
+from danoan.word_guru.core import operation
+
+import argparse
+import logging
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMPT = "word-guru> "
+
+ALIASES = {
+    "def": "definition",
+    "syn": "synonym",
+    "rev": "reverse-definition",
+    "ex": "usage-examples",
+    "pos": "pos-tag",
+    "tr": "translation",
+    "fix": "correction",
+    "card": "word-card",
+}
+
+USAGE = """Enter one query per line: <operation> <word or text> <language codes>
+
+  def happiness eng           definition
+  syn terrible eng            synonym
+  rev a black energetic drink eng
+                              reverse-definition
+  ex manteau fra              usage-examples
+  pos notes eng               pos-tag
+  tr il pleut fra eng         translation
+  fix I has a dog eng         correction
+  card happiness eng          word-card
+
+Type help to see this message and quit to leave."""
+
+
+def parse_query(query: str) -> Tuple[str, str, List[str]]:
+    """
+    Split a query into operation name, message and language codes.
+
+    The language codes are the last words of the query. Everything between
+    the operation and the language codes is the message, such that
+    expressions do not need to be quoted, e.g. `tr il pleut fra eng`.
+
+    Raises:
+        OperationNotFoundError: If the operation does not exist.
+        ValueError: If the query has not enough words.
+    """
+    parts = query.strip().split(maxsplit=1)
+    if not parts:
+        raise ValueError("Empty query.")
+
+    operation_name = ALIASES.get(parts[0], parts[0])
+    op = operation.get_operation(operation_name)
+    number_of_languages = len(op.language_variables)
+
+    remainder = parts[1].rsplit(maxsplit=number_of_languages) if len(parts) > 1 else []
+    if len(remainder) != number_of_languages + 1:
+        raise ValueError(
+            f"Usage: {parts[0]} <message> {' '.join(op.language_variables)}"
+        )
+
+    return operation_name, remainder[0].strip(), remainder[1:]
+
+
+def _read_queries(interactive: bool) -> Iterator[str]:
+    if not interactive:
+        yield from sys.stdin
+        return
+
+    try:
+        import readline  # noqa: F401 Enables line editing and history in input
+    except ImportError:
+        pass
+
+    while True:
+        try:
+            yield input(PROMPT)
+        except EOFError:
+            print()
+            return
+
+
+def shell(
+    openai_key: str,
+    cache_path: Optional[str],
+    *args,
+    **kwargs,
+):
+    """
+    Run queries in a single session.
+
+    Queries are read line by line from the terminal or from the standard
+    input, and each response is printed as soon as it arrives. The setup
+    is done once for the whole session.
+    """
+    from danoan.word_guru.core import api
+
+    client = api.get_client(openai_key, cache_path)
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print(USAGE)
+
+    for query in _read_queries(interactive):
+        query = query.strip()
+        if not query or query.startswith("#"):
+            continue
+        if query in ("quit", "exit"):
+            break
+        if query == "help":
+            print(USAGE)
+            continue
+
+        try:
+            operation_name, message, language_codes = parse_query(query)
+            print(client.execute(operation_name, message, *language_codes), flush=True)
+        except Exception as ex:
+            logger.error(ex)
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "shell"
+    description = shell.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.set_defaults(func=shell, subcommand_help=parser.print_help)
+
+    return parser
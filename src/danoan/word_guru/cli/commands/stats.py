@@ -0,0 +1,128 @@
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import operation, prompt_registry, rate_limit
+from danoan.word_guru.core.usage import UsageLog
+
+import argparse
+from datetime import datetime
+from typing import Optional
+
+
+def _print_prompt_sizes():
+    print("\nPrompt sizes (estimated tokens sent with every request):")
+    for name, op in operation.OPERATIONS.items():
+        prompt_config = prompt_registry.get_prompt(op.prompt_filename)
+        language_names = tuple(
+            (variable, "English") for variable in op.language_variables
+        )
+        system_prompt = prompt_registry.render_system_prompt(
+            op.prompt_filename, language_names
+        )
+        tokens = rate_limit.estimate_tokens(system_prompt + prompt_config.user_prompt)
+        print(f"  {name:<28} {tokens:>8}")
+
+
+def stats(
+    cache_path: Optional[str],
+    calls: Optional[int] = None,
+    prompts: bool = False,
+    reset: bool = False,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    *args,
+    **kwargs,
+):
+    """
+    Show the tokens used per operation and language.
+
+    Prompt and completion tokens are read from the usage reported by
+    openai or, when it is missing, estimated from the length of the texts.
+    Usage is recorded in the cache file by every process using it since its
+    creation or since the last reset.
+
+    With --calls, the tokens and, if rate limits are configured, the time
+    of a batch of that many calls are projected from the average usage of
+    each operation.
+    """
+    utils.check_cache_path(cache_path)
+    usage_log = UsageLog(cache_path)
+    if reset:
+        usage_log.reset()
+        print("Usage reset.")
+        return
+
+    report = usage_log.report()
+    since = datetime.fromtimestamp(report.since).strftime("%Y-%m-%d %H:%M:%S")
+    print(f"Token usage since {since}:\n")
+    print(
+        f"  {'operation':<28} {'languages':<10} {'model':<14} {'calls':>7} {'prompt':>10} {'completion':>10} {'prompt/call':>11} {'compl./call':>11}"
+    )
+    for key, usage in report.usage.items():
+        estimated = "*" if usage.estimated_calls else ""
+        print(
+            f"  {key.operation:<28} {' '.join(key.languages):<10} {key.model:<14} {usage.calls:>7} {usage.prompt_tokens:>10} {usage.completion_tokens:>10} {usage.prompt_tokens / usage.calls:>11.0f} {usage.completion_tokens / usage.calls:>11.0f}{estimated}"
+        )
+
+    total = report.total
+    print(
+        f"  {'total':<54} {total.calls:>7} {total.prompt_tokens:>10} {total.completion_tokens:>10}"
+    )
+    if total.estimated_calls:
+        print(
+            f"\n* Includes calls with estimated tokens ({total.estimated_calls} in total)."
+        )
+
+    if calls:
+        print(f"\nProjection for {calls} calls:")
+        for key, usage in report.usage.items():
+            tokens = round(usage.total_tokens / usage.calls * calls)
+            minutes = [
+                calls / requests_per_minute if requests_per_minute else 0,
+                tokens / tokens_per_minute if tokens_per_minute else 0,
+            ]
+            duration = f" {max(minutes):>8.1f} min" if any(minutes) else ""
+            print(
+                f"  {key.operation:<28} {' '.join(key.languages):<10} {tokens:>10} tokens{duration}"
+            )
+
+    if prompts:
+        _print_prompt_sizes()
+
+
+def extend_parser(subcommand_action=None):
+    command_name = "stats"
+    description = stats.__doc__
+    help = description.split(".")[0] if description else ""
+
+    if subcommand_action:
+        parser = subcommand_action.add_parser(
+            command_name,
+            help=help,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+    else:
+        parser = argparse.ArgumentParser(
+            command_name,
+            description=description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+    parser.add_argument(
+        "--calls",
+        type=int,
+        help="Project the tokens and time of a batch of this number of calls.",
+    )
+    parser.add_argument(
+        "--prompts",
+        action="store_true",
+        help="Show the estimated size of the prompt of each operation.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Remove the recorded usage.",
+    )
+
+    parser.set_defaults(func=stats, subcommand_help=parser.print_help)
+
+    return parser
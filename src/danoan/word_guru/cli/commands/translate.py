@@ -1,11 +1,11 @@
-from danoan.word_guru.logging_config import setup_logging
-from danoan.word_guru.core import api, exception
+from danoan.word_guru.cli import utils
+from danoan.word_guru.core import exception
 
 import argparse
+import json
 import logging
-from typing import Optional
+from typing import List, Optional
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -14,17 +14,65 @@ def get_translation(
     cache_path: Optional[str],
     word: str,
     from_language: str,
-    to_language: str,
+    to_language: List[str],
+    stream: bool = False,
     *args,
     **kwargs,
 ):
     """
     Translate text.
+
+    With --stream, the translation is printed as it is written.
+
+    With several target languages, the translations are requested in
+    parallel and printed as a json object keyed by target language.
     """
+    if len(to_language) > 1:
+        if stream:
+            logger.error("--stream accepts a single target language.")
+            exit(1)
+
+        from danoan.word_guru.core import api
+
+        try:
+            translations = api.get_translations(
+                openai_key, cache_path, word, from_language, to_language
+            )
+        except exception.OpenAIEmptyResponseError:
+            logger.error("OpeanAI returned an empty response.")
+            return
+
+        print(
+            json.dumps(
+                {
+                    target: utils.to_json_value(translation)
+                    for target, translation in translations.items()
+                },
+                ensure_ascii=False,
+            )
+        )
+        return
+
+    to_language = to_language[0]
     try:
+        if stream:
+            from danoan.word_guru.core import api
+
+            utils.print_stream(
+                api.get_translation_stream(
+                    openai_key, cache_path, word, from_language, to_language
+                )
+            )
+            return
+
         print(
-            api.get_translation(
-                openai_key, cache_path, word, from_language, to_language
+            utils.execute(
+                openai_key,
+                cache_path,
+                "translation",
+                word,
+                from_language,
+                to_language,
             )
         )
     except exception.OpenAIEmptyResponseError:
@@ -54,14 +102,17 @@ def extend_parser(subcommand_action=None):
     parser.add_argument(
         "from_language",
         metavar="from-language",
-        help="The language of the original word. It should be the IETF 639-3 code of the language. E.g. eng",
+        help="The language of the original word. It should be the ISO 639-3 or ISO 639-1 code of the language. E.g. eng or en",
     )
     parser.add_argument(
         "to_language",
         metavar="to-language",
-        help="The language of the translation. It should be the IETF 639-3 code of the language. E.g. eng",
+        nargs="+",
+        help="The languages of the translation. They should be ISO 639-3 or ISO 639-1 codes of languages. E.g. eng or en",
     )
 
+    utils.add_stream_argument(parser)
+
     parser.set_defaults(func=get_translation, subcommand_help=parser.print_help)
 
     return parser
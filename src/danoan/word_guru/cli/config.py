@@ -2,7 +2,6 @@
 word-guru CLI configuration
 """
 
-from danoan.word_guru.logging_config import setup_logging
 from danoan.word_guru.cli import exception
 from danoan.word_guru.cli import model
 
@@ -10,10 +9,8 @@ from functools import lru_cache
 import logging
 import os
 from pathlib import Path
-import toml
 from typing import Optional
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 ########################################
@@ -113,6 +110,8 @@ def get_configuration() -> model.WordGuruConfiguration:
     if not config_filepath.exists():
         raise exception.ConfigurationFileDoesNotExistError()
 
+    import toml
+
     with open(config_filepath, "r") as f:
         return model.WordGuruConfiguration(**toml.load(f))
 
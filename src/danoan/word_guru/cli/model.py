@@ -1,20 +1,33 @@
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 @dataclass
 class WordGuruConfiguration:
     openai_key: Optional[str] = None
     cache_path: Optional[Path] = None
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    rate_limit_path: Optional[Path] = None
+    cache_max_entries: Optional[int] = None
+    cache_ttl: Optional[float] = None
+    cache_memory_max_entries: Optional[int] = None
+    cache_memory_max_bytes: Optional[int] = None
+    # Fields of danoan.word_guru.core.resilience.RetryPolicy
+    retry_policy: Optional[Dict[str, Any]] = None
 
     def __post_init__(self):
         if self.cache_path:
             self.cache_path = Path(self.cache_path)
+        if self.rate_limit_path:
+            self.rate_limit_path = Path(self.rate_limit_path)
 
     def __asdict__(self):
         d = asdict(self)
         if self.cache_path:
             d["cache_path"] = str(self.cache_path)
+        if self.rate_limit_path:
+            d["rate_limit_path"] = str(self.rate_limit_path)
 
         return d
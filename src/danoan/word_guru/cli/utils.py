@@ -0,0 +1,161 @@
+"""
+Helpers shared by word-guru commands.
+"""
+
+from danoan.word_guru.core import daemon, exception
+from danoan.word_guru.core.cache import DEFAULT_MAX_ENTRIES, ResultCache
+from danoan.word_guru.core.model import BatchItem
+
+import argparse
+import json
+import logging
+import sys
+from typing import Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def execute(
+    openai_key: str,
+    cache_path: Optional[str],
+    operation_name: str,
+    message: str,
+    *language_codes: str,
+) -> str:
+    """
+    Execute an operation in the word-guru daemon if it is running.
+
+    If the daemon is not running, the operation is executed in this process.
+    """
+    try:
+        return daemon.request(
+            daemon.get_socket_path(),
+            openai_key,
+            cache_path,
+            operation_name,
+            message,
+            *language_codes,
+        )
+    except exception.DaemonNotRunningError:
+        pass
+
+    from danoan.word_guru.core import api
+
+    client = api.get_client(openai_key, cache_path)
+    return client.execute(operation_name, message, *language_codes)
+
+
+def check_cache_path(cache_path: Optional[str]):
+    """
+    Exit with an error if no cache path is configured.
+    """
+    if not cache_path:
+        logger.error(
+            "No cache path given. Use the --cache-path option or set cache_path in the configuration file."
+        )
+        exit(1)
+
+
+def open_cache(
+    cache_path: Optional[str],
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+) -> ResultCache:
+    """
+    Open the cache of the cache commands with the bounds of the
+    configuration, such that expired entries are pruned.
+
+    Exit with an error if no cache path is configured.
+    """
+    check_cache_path(cache_path)
+    if cache_max_entries is None:
+        cache_max_entries = DEFAULT_MAX_ENTRIES
+    return ResultCache(cache_path, cache_max_entries, cache_ttl)
+
+
+def print_stream(chunks: Iterable[str]):
+    """
+    Print chunks of a response as soon as they arrive, then a new line.
+    """
+    for chunk in chunks:
+        print(chunk, end="", flush=True)
+    print()
+
+
+def add_stream_argument(parser: argparse.ArgumentParser):
+    """
+    Add the option printing the response as it arrives.
+    """
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the response as it arrives. The request is executed in this process, even if the daemon is running.",
+    )
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the options controlling the batch mode of a command.
+    """
+    parser.add_argument(
+        "--batch-file",
+        help="File with one entry per line. Use - to read from the standard input. One json response is printed per line.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of requests in flight at the same time in batch mode.",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        help="Maximum number of requests started per second in batch mode.",
+    )
+    parser.add_argument(
+        "--pack-size",
+        type=int,
+        help="Send up to this number of entries in each request in batch mode. Saves the tokens of the prompt examples resent at every request.",
+    )
+
+
+def read_batch_file(batch_file: str) -> List[str]:
+    """
+    Read the entries of a batch file, one entry per line.
+
+    Empty lines are ignored. If batch_file is `-`, entries are read
+    from the standard input.
+    """
+    if batch_file == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(batch_file, "r") as f:
+            lines = f.readlines()
+
+    return [line.strip() for line in lines if line.strip()]
+
+
+def to_json_value(response: str) -> Any:
+    """
+    Parse a response as json. Return the raw string if it is not valid json.
+    """
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        return response
+
+
+def print_batch_items(batch_items: Iterable[BatchItem]):
+    """
+    Print one json object per line pairing each entry with its response.
+
+    Failed entries are printed with an error field instead of a response.
+    Lines are flushed as soon as each response arrives.
+    """
+    for batch_item in batch_items:
+        line = {"input": batch_item.input}
+        if batch_item.ok:
+            line["response"] = to_json_value(batch_item.response)
+        else:
+            line["error"] = str(batch_item.error) or type(batch_item.error).__name__
+        print(json.dumps(line, ensure_ascii=False), flush=True)
@@ -1 +1,14 @@
-from danoan.word_guru.core import api, exception
+"""
+word-guru core library.
+
+Submodules are imported on first access, such that importing a light
+submodule, e.g. exception, does not import the openai client.
+"""
+
+import importlib
+
+
+def __getattr__(name: str):
+    if name in ("api", "exception"):
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,40 +1,67 @@
-from danoan.word_guru.core import exception
-
-import pycountry
-from typing import Dict, Optional, Any
+from danoan.word_guru.core import document, rate_limit
+from danoan.word_guru.core.client import DEFAULT_MODEL, WordGuru
+from danoan.word_guru.core.model import BatchItem
+from danoan.word_guru.core.resilience import RetryPolicy
+from danoan.word_guru.core.result import Result
+
+from functools import lru_cache
+import hashlib
 from pathlib import Path
-import toml
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
-import importlib.resources as pgk_resources
-from danoan.word_guru import prompts
-from danoan.llm_assistant.runner.core import api as llma
-from danoan.llm_assistant.common.model import RunnerConfiguration, PromptConfiguration
+_default_client_options: Dict[str, Any] = {}
 
 
-def _call_llm(
-    openai_key: str,
-    cache_path: Optional[Path],
-    prompt_filename: str,
-    prompt_data: Dict[str, Any],
+def configure_default_clients(
+    cache_max_entries: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    cache_memory_max_entries: Optional[int] = None,
+    cache_memory_max_bytes: Optional[int] = None,
+    retry_policy: Optional[RetryPolicy] = None,
 ):
-    use_cache = cache_path is not None
+    """
+    Set the options of the clients returned by get_client.
 
-    runner_config = RunnerConfiguration(
-        openai_key, "gpt-4o-mini", use_cache, cache_path
+    Options left to None keep the defaults of WordGuru. Clients created
+    before the call are not reused.
+    """
+    options = {
+        "cache_max_entries": cache_max_entries,
+        "cache_ttl": cache_ttl,
+        "cache_memory_max_entries": cache_memory_max_entries,
+        "cache_memory_max_bytes": cache_memory_max_bytes,
+        "retry_policy": retry_policy,
+    }
+    _default_client_options.clear()
+    _default_client_options.update(
+        {name: value for name, value in options.items() if value is not None}
+    )
+    _get_default_client.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _get_default_client(openai_key: str, cache_path: Optional[Path]) -> WordGuru:
+    # Clients of the same openai account share the same rate limits.
+    bucket_name = hashlib.sha256((openai_key or "").encode()).hexdigest()[:16]
+    return WordGuru(
+        openai_key,
+        DEFAULT_MODEL,
+        cache_path,
+        rate_limiter=rate_limit.get_shared_limiter(bucket_name),
+        **_default_client_options,
     )
-    llma.LLMAssistant().setup(runner_config)
-
-    with pgk_resources.open_text(prompts, prompt_filename) as f:
-        prompt_config = PromptConfiguration(**toml.load(f))
 
-    return llma.custom(prompt_config, **prompt_data)
 
+def get_client(openai_key: str, cache_path: Optional[Path]) -> WordGuru:
+    """
+    Return the default client for a pair of openai key and cache path.
 
-def _get_language(language_alpha3: str):
-    language = pycountry.languages.get(alpha_3=language_alpha3)
-    if not language:
-        raise exception.LanguageCodeNotRecognizedError(language_alpha3)
-    return language
+    The client is created on the first call and reused by every function
+    of this module called with the same arguments. Its options are the ones
+    set with configure_default_clients and its requests are rate limited if
+    limits were set with rate_limit.configure_shared_limits.
+    """
+    return _get_default_client(openai_key, Path(cache_path) if cache_path else None)
 
 
 def get_definition(
@@ -49,14 +76,8 @@ def get_definition(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "word-definition.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": word}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
-
-    return response.content
+    client = get_client(openai_key, cache_path)
+    return client.definition(word, language_alpha3)
 
 
 def get_synonym(
@@ -71,14 +92,8 @@ def get_synonym(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "alternative-expression.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": word}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
-
-    return response.content
+    client = get_client(openai_key, cache_path)
+    return client.synonyms(word, language_alpha3)
 
 
 def get_reverse_definition(
@@ -93,14 +108,8 @@ def get_reverse_definition(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "reverse-definition.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": text}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
-
-    return response.content
+    client = get_client(openai_key, cache_path)
+    return client.reverse_definition(text, language_alpha3)
 
 
 def get_usage_examples(
@@ -115,14 +124,8 @@ def get_usage_examples(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "usage-examples.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": word}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
-
-    return response.content
+    client = get_client(openai_key, cache_path)
+    return client.usage_examples(word, language_alpha3)
 
 
 def get_pos_tag(
@@ -137,14 +140,8 @@ def get_pos_tag(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "classify-pos.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": word}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
-
-    return response.content
+    client = get_client(openai_key, cache_path)
+    return client.pos_tags(word, language_alpha3)
 
 
 def get_translation(
@@ -161,19 +158,29 @@ def get_translation(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "translate.toml"
-    from_language = _get_language(from_language_alpha3)
-    to_language = _get_language(to_language_alpha3)
-    data = {
-        "from_language": from_language.name,
-        "to_language": to_language.name,
-        "message": word,
-    }
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
+    client = get_client(openai_key, cache_path)
+    return client.translate(word, from_language_alpha3, to_language_alpha3)
+
+
+def get_translations(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    from_language_alpha3: str,
+    to_languages_alpha3: Iterable[str],
+) -> Dict[str, str]:
+    """
+    Get the translations of a word or expression into several languages.
+
+    The translations are requested in parallel and the response maps each
+    target language code to its translation.
 
-    return response.content
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.translate_many(word, from_language_alpha3, to_languages_alpha3)
 
 
 def get_correction(
@@ -186,11 +193,379 @@ def get_correction(
         OpenAIEmptyResponseError: If openai return an empty response.
         LanguageCodeNotRecognizedError: If language code is not recognized.
     """
-    prompt_filename = "correct-text.toml"
-    language = _get_language(language_alpha3)
-    data = {"language": language.name, "message": word}
-    response = _call_llm(openai_key, cache_path, prompt_filename, data)
-    if not response:
-        raise exception.OpenAIEmptyResponseError()
+    client = get_client(openai_key, cache_path)
+    return client.correct(word, language_alpha3)
+
+
+def get_translation_stream(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    from_language_alpha3: str,
+    to_language_alpha3: str,
+) -> Iterator[str]:
+    """
+    Get the translation of a word or expression in chunks, as they arrive.
+
+    Joined together, the chunks are the response of get_translation.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.stream("translation", word, from_language_alpha3, to_language_alpha3)
 
-    return response.content
+
+def get_correction_stream(
+    openai_key: str, cache_path: Optional[Path], text: str, language_alpha3: str
+) -> Iterator[str]:
+    """
+    Get the corrected version of a text in chunks, as they arrive.
+
+    Joined together, the chunks are the response of get_correction.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.stream("correction", text, language_alpha3)
+
+
+def get_document_correction(
+    openai_key: str,
+    cache_path: Optional[Path],
+    text: str,
+    language_alpha3: str,
+    chunk_size: int = document.DEFAULT_CHUNK_SIZE,
+    max_concurrency: int = 4,
+) -> str:
+    """
+    Get the corrections of a document too large for a single request.
+
+    The document is corrected by chunks of at most chunk_size characters
+    aligned to its paragraphs, with at most max_concurrency requests in
+    flight. The response has the same format of the one returned by
+    get_correction.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+        ValueError: If the correction of a chunk is not a json object of lists.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.correct_document(text, language_alpha3, chunk_size, max_concurrency)
+
+
+def get_word_card(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    language_alpha3: str,
+    composite: bool = True,
+) -> str:
+    """
+    Get the definitions, synonyms, part-of-speech tags and usage examples of a word.
+
+    The response is a string which content is a json object with the lists
+    definitions, synonyms, pos_tags and usage_examples. If composite is true,
+    the four fields are requested in a single request, falling back to
+    parallel requests of the individual operations if the response is not
+    valid.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.word_card(word, language_alpha3, composite)
+
+
+def get_result(
+    openai_key: str,
+    cache_path: Optional[Path],
+    operation_name: str,
+    message: str,
+    *language_codes: str,
+) -> Result:
+    """
+    Get the typed result of an operation, e.g.
+    get_result(openai_key, cache_path, "synonym", "love", "eng") returns a
+    SynonymList. See danoan.word_guru.core.result.
+
+    Raises:
+        OperationNotFoundError: If there is no operation with this name.
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+        InvalidResponseError: If the response is invalid, even once repaired.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.get_result(operation_name, message, *language_codes)
+
+
+########################################
+# Batch
+########################################
+
+
+def _execute_batch(
+    client: WordGuru,
+    operation_name: str,
+    messages: Iterable[str],
+    language_codes: Tuple[str, ...],
+    max_concurrency: int,
+    requests_per_second: Optional[float],
+    pack_size: Optional[int],
+) -> Iterator[BatchItem]:
+    if pack_size:
+        return client.execute_packed(
+            operation_name,
+            messages,
+            language_codes,
+            pack_size,
+            max_concurrency,
+            requests_per_second,
+        )
+    return client.execute_batch(
+        operation_name, messages, language_codes, max_concurrency, requests_per_second
+    )
+
+
+def get_definition_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the definition of each word in a list of words.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_definition. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "definition",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_synonym_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the synonyms of each word in a list of words.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_synonym. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "synonym",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_reverse_definition_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    texts: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the reverse definition of each text in a list of texts.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_reverse_definition. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "reverse-definition",
+        texts,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_usage_examples_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get usage examples of each word in a list of words.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_usage_examples. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "usage-examples",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_pos_tag_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the part-of-speech tags of each word in a list of words.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_pos_tag. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "pos-tag",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_translation_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    from_language_alpha3: str,
+    to_language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the translation of each word or expression in a list.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_translation. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "translation",
+        words,
+        (from_language_alpha3, to_language_alpha3),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
+
+
+def get_correction_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    texts: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+    pack_size: Optional[int] = None,
+) -> Iterator[BatchItem]:
+    """
+    Get the corrected version of each text in a list of texts.
+
+    Results are yielded in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_correction. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    If pack_size is given, up to pack_size entries are sent in each request,
+    see danoan.word_guru.core.client.WordGuru.execute_packed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    return _execute_batch(
+        get_client(openai_key, cache_path),
+        "correction",
+        texts,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+        pack_size,
+    )
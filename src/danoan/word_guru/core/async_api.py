@@ -0,0 +1,440 @@
+"""
+Asynchronous counterparts of the functions in danoan.word_guru.core.api.
+
+Requests are sent with the non-blocking http client of openai, such that
+a single event loop serves many concurrent requests without a thread per
+request.
+"""
+
+from danoan.word_guru.core.api import get_client
+from danoan.word_guru.core.model import BatchItem
+from danoan.word_guru.core.result import Result
+
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+
+async def get_definition(
+    openai_key: str, cache_path: Optional[Path], word: str, language_alpha3
+) -> str:
+    """
+    Get the definition of a word.
+
+    The response is a string containing the definition of the word.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("definition", word, language_alpha3)
+
+
+async def get_synonym(
+    openai_key: str, cache_path: Optional[Path], word: str, language_alpha3
+) -> str:
+    """
+    Get the synonyms of a word.
+
+    The response is string which content is a json list with strings, each one representing a synonym.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("synonym", word, language_alpha3)
+
+
+async def get_reverse_definition(
+    openai_key: str, cache_path: Optional[Path], text: str, language_alpha3: str
+) -> str:
+    """
+    Get a list of words that best encode the intention of a text.
+
+    The response is a string which the content is a json list with strings, each one representing a word.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("reverse-definition", text, language_alpha3)
+
+
+async def get_usage_examples(
+    openai_key: str, cache_path: Optional[Path], word: str, language_alpha3: str
+) -> str:
+    """
+    Get a list of sentences in which the word is used with their different meanings.
+
+    The response is a string which the content is a json list with strings, each one representing a word.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("usage-examples", word, language_alpha3)
+
+
+async def get_pos_tag(
+    openai_key: str, cache_path: Optional[Path], word: str, language_alpha3: str
+) -> str:
+    """
+    Get the part-of-speech tag of the most common uses of the word.
+
+    The response is a string which the content is a json list with strings, each one representing a pos tag.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("pos-tag", word, language_alpha3)
+
+
+async def get_translation(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    from_language_alpha3: str,
+    to_language_alpha3: str,
+) -> str:
+    """
+    Get the translation of a word or expression.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute(
+        "translation", word, from_language_alpha3, to_language_alpha3
+    )
+
+
+async def get_translations(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    from_language_alpha3: str,
+    to_languages_alpha3: Iterable[str],
+) -> Dict[str, str]:
+    """
+    Get the translations of a word or expression into several languages.
+
+    The translations are requested concurrently and the response maps each
+    target language code to its translation.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_translate_many(
+        word, from_language_alpha3, to_languages_alpha3
+    )
+
+
+async def get_correction(
+    openai_key: str, cache_path: Optional[Path], word: str, language_alpha3: str
+) -> str:
+    """
+    Get the corrected version of a text.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute("correction", word, language_alpha3)
+
+
+def get_translation_stream(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    from_language_alpha3: str,
+    to_language_alpha3: str,
+) -> AsyncIterator[str]:
+    """
+    Get the translation of a word or expression in chunks, as they arrive.
+
+    Iterate the result with async for.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.async_stream(
+        "translation", word, from_language_alpha3, to_language_alpha3
+    )
+
+
+def get_correction_stream(
+    openai_key: str, cache_path: Optional[Path], text: str, language_alpha3: str
+) -> AsyncIterator[str]:
+    """
+    Get the corrected version of a text in chunks, as they arrive.
+
+    Iterate the result with async for.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return client.async_stream("correction", text, language_alpha3)
+
+
+async def get_word_card(
+    openai_key: str,
+    cache_path: Optional[Path],
+    word: str,
+    language_alpha3: str,
+    composite: bool = True,
+) -> str:
+    """
+    Get the definitions, synonyms, part-of-speech tags and usage examples of a word.
+
+    See danoan.word_guru.core.api.get_word_card.
+
+    Raises:
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_word_card(word, language_alpha3, composite)
+
+
+async def get_result(
+    openai_key: str,
+    cache_path: Optional[Path],
+    operation_name: str,
+    message: str,
+    *language_codes: str,
+) -> Result:
+    """
+    Get the typed result of an operation, e.g.
+    get_result(openai_key, cache_path, "synonym", "love", "eng") returns a
+    SynonymList. See danoan.word_guru.core.result.
+
+    Raises:
+        OperationNotFoundError: If there is no operation with this name.
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+        InvalidResponseError: If the response is invalid, even once repaired.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_get_result(operation_name, message, *language_codes)
+
+
+########################################
+# Batch
+########################################
+
+
+async def get_definition_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the definition of each word in a list of words.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_definition. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "definition",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_synonym_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the synonyms of each word in a list of words.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_synonym. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "synonym",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_reverse_definition_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    texts: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the reverse definition of each text in a list of texts.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_reverse_definition. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "reverse-definition",
+        texts,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_usage_examples_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get usage examples of each word in a list of words.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_usage_examples. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "usage-examples",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_pos_tag_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the part-of-speech tags of each word in a list of words.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_pos_tag. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "pos-tag",
+        words,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_translation_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    words: Iterable[str],
+    from_language_alpha3: str,
+    to_language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the translation of each word or expression in a list.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_translation. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "translation",
+        words,
+        (from_language_alpha3, to_language_alpha3),
+        max_concurrency,
+        requests_per_second,
+    )
+
+
+async def get_correction_batch(
+    openai_key: str,
+    cache_path: Optional[Path],
+    texts: Iterable[str],
+    language_alpha3: str,
+    max_concurrency: int = 1,
+    requests_per_second: Optional[float] = None,
+) -> List[BatchItem]:
+    """
+    Get the corrected version of each text in a list of texts.
+
+    Results are returned in input order as BatchItem objects. The response of
+    each BatchItem has the same format of the one returned by get_correction. If an
+    entry fails, e.g. because openai returned an empty response, the error
+    is stored in its BatchItem and the remaining entries are still processed.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    client = get_client(openai_key, cache_path)
+    return await client.async_execute_batch(
+        "correction",
+        texts,
+        (language_alpha3,),
+        max_concurrency,
+        requests_per_second,
+    )
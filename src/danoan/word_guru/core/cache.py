@@ -0,0 +1,605 @@
+"""
+Cache of operation responses.
+
+Responses are stored in a sqlite file and keyed by operation, normalized
+message, language codes, prompt version and model, such that the same
+query written with a different casing or spacing is answered from the
+cache. The number of entries is bounded: the least recently used entries
+are evicted first and, if a time to live is given, older entries are
+considered missing.
+
+The most recently used responses are also kept in memory, such that hot
+entries of a long-running process are served without reading the file.
+
+Entries are tagged with a hash of their prompt. When a prompt changes, its
+entries are no longer reachable and can be removed with ResultCache.prune.
+
+Entries are exported and imported as dictionaries, one per entry, such
+that they can be streamed to and from json lines files.
+
+Hits and misses are counted per file and per entry, such that the
+statistics of ResultCache.stats cover every process using the file.
+"""
+
+import asyncio
+import atexit
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MEMORY_MAX_ENTRIES = 4096
+DEFAULT_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+
+# Counters are written to the file at most once per interval, in seconds
+_COUNTERS_FLUSH_INTERVAL = 1.0
+
+# Tables written by the langchain cache used by previous versions
+_LEGACY_TABLES = ("full_llm_cache", "full_md5_llm_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_guru_cache (
+    key TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    message TEXT NOT NULL,
+    languages TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS word_guru_cache_accessed_at
+    ON word_guru_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS word_guru_cache_counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+_INSERT = """
+INSERT OR REPLACE INTO word_guru_cache
+    (key, operation, message, languages, prompt_version, model, response, created_at, accessed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    operation: str
+    message: str
+    languages: Tuple[str, ...]
+    prompt_version: str
+    model: str
+
+    @property
+    def digest(self) -> str:
+        fields = [
+            self.operation,
+            self.message,
+            self.languages,
+            self.prompt_version,
+            self.model,
+        ]
+        return hashlib.sha256(
+            json.dumps(fields, ensure_ascii=False).encode()
+        ).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """
+    Statistics of a cache file.
+
+    Attributes:
+        entries: Number of entries per operation and language codes.
+        size_bytes: Size of the cache files.
+        hits: Number of lookups answered by the cache since `since`.
+        misses: Number of lookups not answered by the cache since `since`.
+        since: Time at which the counters were created or reset.
+        top_keys: Operation, message, language codes and number of hits of
+                  the entries with most hits.
+    """
+
+    entries: Dict[Tuple[str, Tuple[str, ...]], int] = field(default_factory=dict)
+    size_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    since: Optional[float] = None
+    top_keys: List[Tuple[str, str, Tuple[str, ...], int]] = field(default_factory=list)
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+class MemoryCache:
+    """
+    In-memory least recently used cache bounded by entries and bytes.
+
+    Values are pairs of response and creation time. The size of an entry
+    is the size of its utf-8 encoded response. It is not thread-safe.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: str) -> Optional[Tuple[str, float]]:
+        if digest not in self._entries:
+            return None
+        self._entries.move_to_end(digest)
+        response, created_at, _ = self._entries[digest]
+        return response, created_at
+
+    def put(self, digest: str, response: str, created_at: float):
+        self.pop(digest)
+        size = len(response.encode())
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+
+        self._entries[digest] = (response, created_at, size)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+
+    def pop(self, digest: str):
+        if digest in self._entries:
+            self.size_bytes -= self._entries.pop(digest)[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+
+class ResultCache:
+    """
+    Sqlite cache of operation responses.
+
+    A single instance can be shared among threads, and several processes
+    can use the same file. Responses found in memory do not refresh the
+    access time of their entry in the file, so the eviction from the file
+    follows the access order of the file only.
+
+    Args:
+        path: The sqlite file storing the responses.
+        max_entries: Maximum number of entries kept in the file.
+        ttl: If given, entries older than ttl seconds are not served.
+        memory_max_entries: Maximum number of entries kept in memory.
+                            Zero disables the memory tier.
+        memory_max_bytes: Maximum size of the responses kept in memory.
+
+    Attributes:
+        hits: Number of lookups answered by the cache since its creation.
+        memory_hits: Number of hits answered from memory.
+        misses: Number of lookups not answered by the cache since its creation.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        memory_max_entries: int = DEFAULT_MEMORY_MAX_ENTRIES,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        self.memory = MemoryCache(memory_max_entries, memory_max_bytes)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._migrate()
+        self._connection.execute(
+            "INSERT OR IGNORE INTO word_guru_cache_counters VALUES ('since', ?)",
+            (time.time(),),
+        )
+        self._size = self._count()
+
+        self._closed = False
+        self._pending_hits: Dict[str, int] = {}
+        self._pending_misses = 0
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush_counters)
+
+    def _migrate(self):
+        columns = {
+            row[1]
+            for row in self._connection.execute("PRAGMA table_info(word_guru_cache)")
+        }
+        if "hits" not in columns:
+            self._connection.execute(
+                "ALTER TABLE word_guru_cache ADD COLUMN hits INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def _count(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM word_guru_cache"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def get(self, key: CacheKey, count: bool = True) -> Optional[str]:
+        """
+        Return the cached response of a key or None if there is none.
+
+        If count is false, the lookup is left out of the hit and miss
+        statistics, e.g. when checking again a key just counted as a miss.
+        """
+        digest = key.digest
+        now = time.time()
+        with self._lock:
+            entry = self.memory.get(digest)
+            if entry and not self._expired(entry[1], now):
+                if count:
+                    self.hits += 1
+                    self.memory_hits += 1
+                    self._count_lookup(digest)
+                return entry[0]
+            self.memory.pop(digest)
+
+            row = self._connection.execute(
+                "SELECT response, created_at FROM word_guru_cache WHERE key = ?",
+                (digest,),
+            ).fetchone()
+
+            if row and self._expired(row[1], now):
+                self._connection.execute(
+                    "DELETE FROM word_guru_cache WHERE key = ?", (digest,)
+                )
+                self._size -= 1
+                row = None
+
+            if not row:
+                if count:
+                    self.misses += 1
+                    self._count_lookup(None)
+                return None
+
+            self._connection.execute(
+                "UPDATE word_guru_cache SET accessed_at = ? WHERE key = ?",
+                (now, digest),
+            )
+            self.memory.put(digest, row[0], row[1])
+            if count:
+                self.hits += 1
+                self._count_lookup(digest)
+            return row[0]
+
+    async def async_get(self, key: CacheKey, count: bool = True) -> Optional[str]:
+        """
+        Asynchronous counterpart of get.
+
+        The lookup runs in a worker thread, such that a file locked by
+        another process does not block the event loop.
+        """
+        return await asyncio.to_thread(self.get, key, count)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def put(self, key: CacheKey, response: str):
+        """
+        Store the response of a key, evicting the least recently used
+        entries if the cache is full.
+        """
+        digest = key.digest
+        now = time.time()
+        with self._lock:
+            self.memory.put(digest, response, now)
+            cursor = self._connection.execute(
+                "UPDATE word_guru_cache SET response = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                (response, now, now, digest),
+            )
+            if cursor.rowcount:
+                return
+
+            self._connection.execute(
+                _INSERT,
+                (
+                    digest,
+                    key.operation,
+                    key.message,
+                    ",".join(key.languages),
+                    key.prompt_version,
+                    key.model,
+                    response,
+                    now,
+                    now,
+                ),
+            )
+            self._size += 1
+            if self._size > self.max_entries:
+                self._evict()
+
+    async def async_put(self, key: CacheKey, response: str):
+        """
+        Asynchronous counterpart of put, running in a worker thread.
+        """
+        await asyncio.to_thread(self.put, key, response)
+
+    def _evict(self):
+        # Other processes may have written to the same file
+        self._size = self._count()
+        excess = self._size - self.max_entries
+        if excess <= 0:
+            return
+
+        evicted = [
+            row[0]
+            for row in self._connection.execute(
+                "SELECT key FROM word_guru_cache ORDER BY accessed_at LIMIT ?",
+                (excess,),
+            )
+        ]
+        self._connection.executemany(
+            "DELETE FROM word_guru_cache WHERE key = ?", ((key,) for key in evicted)
+        )
+        # Evicted entries are not served from memory either.
+        for digest in evicted:
+            self.memory.pop(digest)
+        self._size -= len(evicted)
+
+    def export_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every entry as a dictionary of its key fields, response and
+        creation time.
+
+        Entries are read from their own connection as they are yielded and
+        the least recently used entries come first.
+        """
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            rows = connection.execute(
+                "SELECT operation, message, languages, prompt_version, model, response, created_at FROM word_guru_cache ORDER BY accessed_at"
+            )
+            for (
+                operation,
+                message,
+                languages,
+                prompt_version,
+                model,
+                response,
+                created_at,
+            ) in rows:
+                yield {
+                    "operation": operation,
+                    "message": message,
+                    "languages": languages.split(",") if languages else [],
+                    "prompt_version": prompt_version,
+                    "model": model,
+                    "response": response,
+                    "created_at": created_at,
+                }
+        finally:
+            connection.close()
+
+    def import_entries(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Store entries produced by export_entries.
+
+        Imported entries replace the ones with the same key. Entries are
+        considered accessed in the order they are given.
+
+        Returns:
+            The number of imported entries.
+
+        Raises:
+            KeyError: If an entry misses a field.
+        """
+        imported = 0
+        with self._lock:
+            self.memory.clear()
+            self._connection.execute("BEGIN")
+            try:
+                for entry in entries:
+                    key = CacheKey(
+                        entry["operation"],
+                        entry["message"],
+                        tuple(entry["languages"]),
+                        entry["prompt_version"],
+                        entry["model"],
+                    )
+                    now = time.time()
+                    self._connection.execute(
+                        _INSERT,
+                        (
+                            key.digest,
+                            key.operation,
+                            key.message,
+                            ",".join(key.languages),
+                            key.prompt_version,
+                            key.model,
+                            entry["response"],
+                            entry.get("created_at", now),
+                            now,
+                        ),
+                    )
+                    imported += 1
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+            self._evict()
+            return imported
+
+    def prune(self, prompt_versions: Dict[str, str]) -> int:
+        """
+        Remove the entries that can no longer be reached.
+
+        An entry is unreachable if its operation is unknown, if it was
+        generated with another version of the prompt of its operation or, if
+        a ttl is set, if it is expired. Tables left by the langchain cache of
+        previous versions are dropped as well.
+
+        Args:
+            prompt_versions: The current prompt version of each operation.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self._lock:
+            self.memory.clear()
+            removed = 0
+            for operation, prompt_version in self._connection.execute(
+                "SELECT DISTINCT operation, prompt_version FROM word_guru_cache"
+            ).fetchall():
+                if prompt_versions.get(operation) != prompt_version:
+                    removed += self._connection.execute(
+                        "DELETE FROM word_guru_cache WHERE operation = ? AND prompt_version = ?",
+                        (operation, prompt_version),
+                    ).rowcount
+
+            if self.ttl is not None:
+                removed += self._connection.execute(
+                    "DELETE FROM word_guru_cache WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                ).rowcount
+
+            for table in _LEGACY_TABLES:
+                self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+            self._size = self._count()
+            return removed
+
+    def compact(self):
+        """
+        Give the space freed by removed entries back to the file system.
+        """
+        with self._lock:
+            self._connection.execute("VACUUM")
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def size_bytes(self) -> int:
+        """
+        Return the size of the cache files, including the write-ahead log.
+        """
+        return sum(
+            path.stat().st_size
+            for path in [self.path, Path(f"{self.path}-wal")]
+            if path.exists()
+        )
+
+    def _count_lookup(self, digest: Optional[str]):
+        """
+        Count a hit of digest, or a miss if digest is None.
+
+        Counts are accumulated in memory and written at most once per
+        interval, such that hits served from memory rarely touch the file.
+        """
+        if digest:
+            self._pending_hits[digest] = self._pending_hits.get(digest, 0) + 1
+        else:
+            self._pending_misses += 1
+
+        if time.monotonic() - self._last_flush >= _COUNTERS_FLUSH_INTERVAL:
+            self._flush_counters()
+
+    def _flush_counters(self):
+        self._last_flush = time.monotonic()
+        if self._closed or not (self._pending_hits or self._pending_misses):
+            return
+
+        hits = sum(self._pending_hits.values())
+        self._connection.execute("BEGIN")
+        self._connection.executemany(
+            "UPDATE word_guru_cache SET hits = hits + ? WHERE key = ?",
+            [(count, digest) for digest, count in self._pending_hits.items()],
+        )
+        self._connection.executemany(
+            "INSERT INTO word_guru_cache_counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [("hits", hits), ("misses", self._pending_misses)],
+        )
+        self._connection.execute("COMMIT")
+        self._pending_hits.clear()
+        self._pending_misses = 0
+
+    def flush_counters(self):
+        """
+        Write the hits and misses counted since the last write to the file.
+        """
+        with self._lock:
+            self._flush_counters()
+
+    def reset_counters(self):
+        """
+        Set the hits and misses of the file and of every entry to zero.
+        """
+        with self._lock:
+            self._pending_hits.clear()
+            self._pending_misses = 0
+            self._connection.execute("UPDATE word_guru_cache SET hits = 0")
+            self._connection.execute("DELETE FROM word_guru_cache_counters")
+            self._connection.execute(
+                "INSERT INTO word_guru_cache_counters VALUES ('since', ?)",
+                (time.time(),),
+            )
+
+    def stats(self, top: int = 10) -> CacheStats:
+        """
+        Return the statistics of the cache file.
+
+        Args:
+            top: Number of entries with most hits to report.
+        """
+        self.flush_counters()
+        with self._lock:
+            stats = CacheStats(size_bytes=self.size_bytes())
+            for operation, languages, count in self._connection.execute(
+                "SELECT operation, languages, COUNT(*) FROM word_guru_cache GROUP BY operation, languages ORDER BY operation, languages"
+            ):
+                stats.entries[(operation, tuple(languages.split(",")))] = count
+
+            counters = dict(
+                self._connection.execute(
+                    "SELECT name, value FROM word_guru_cache_counters"
+                ).fetchall()
+            )
+            stats.hits = int(counters.get("hits", 0))
+            stats.misses = int(counters.get("misses", 0))
+            stats.since = counters.get("since")
+
+            for operation, message, languages, hits in self._connection.execute(
+                "SELECT operation, message, languages, hits FROM word_guru_cache WHERE hits > 0 ORDER BY hits DESC, operation, message LIMIT ?",
+                (top,),
+            ):
+                stats.top_keys.append(
+                    (operation, message, tuple(languages.split(",")), hits)
+                )
+            return stats
+
+    def close(self):
+        atexit.unregister(self.flush_counters)
+        with self._lock:
+            self._flush_counters()
+            self._closed = True
+            self.memory.clear()
+            self._connection.close()
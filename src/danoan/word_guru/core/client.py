@@ -0,0 +1,1179 @@
+"""
+Long-lived word-guru client.
+"""
+
+from danoan.word_guru.core import (
+    cache,
+    concurrency,
+    document,
+    exception,
+    language,
+    operation,
+    packing,
+    prompt_registry,
+    rate_limit,
+    resilience,
+    result,
+    usage,
+    word_card,
+)
+from danoan.word_guru.core.model import BatchItem
+from danoan.word_guru.core.operation import Operation
+from danoan.word_guru.core.rate_limit import RateLimiter, SharedRateLimiter
+from danoan.word_guru.core.resilience import RetryPolicy
+
+import asyncio
+import json
+import logging
+import dataclasses
+from pathlib import Path
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+LanguageNames = Tuple[Tuple[str, str], ...]
+
+
+class WordGuru:
+    """
+    Client to the word-guru prompts.
+
+    The http connection to openai, the cache and the parsed prompts are
+    created once and reused by every request of the client. A single
+    instance can be shared among threads and coroutines.
+
+    Responses of operations are cached, see danoan.word_guru.core.cache.
+    Responses of prompts executed with run and run_batch are not.
+    Concurrent executions of the same operation, message and languages
+    share a single request to openai.
+
+    Requests failing with transient errors are attempted again according
+    to the retry policy, see danoan.word_guru.core.resilience. The circuit
+    breaker of the policy is shared by every request of the client.
+
+    If a shared rate limiter is given, every request to openai waits for
+    its turn in the requests and tokens per minute budget of the machine,
+    see danoan.word_guru.core.rate_limit.
+
+    If a cache path is given, the tokens used by each request are recorded
+    per operation and languages in the cache file, see
+    danoan.word_guru.core.usage.
+
+    Args:
+        openai_key: The OpenAI key used to authenticate requests.
+        model: The model used by prompts that do not specify one.
+        cache_path: If given, responses are cached and token usage is
+                    recorded in this sqlite file.
+        timeout: Maximum number of seconds to wait for a response.
+        cache_max_entries: Maximum number of responses kept in the cache.
+        cache_ttl: If given, cached responses older than cache_ttl seconds
+                   are requested again.
+        cache_memory_max_entries: Maximum number of cached responses also
+                                  kept in memory.
+        cache_memory_max_bytes: Maximum size of the cached responses kept
+                                in memory.
+        retry_policy: Retries, timeouts and hedging of the requests to
+                      openai. If None, the openai http client retries on its
+                      own.
+        rate_limiter: If given, the requests and tokens per minute limits
+                      shared with other processes.
+    """
+
+    def __init__(
+        self,
+        openai_key: str,
+        model: str = DEFAULT_MODEL,
+        cache_path: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        cache_max_entries: int = cache.DEFAULT_MAX_ENTRIES,
+        cache_ttl: Optional[float] = None,
+        cache_memory_max_entries: int = cache.DEFAULT_MEMORY_MAX_ENTRIES,
+        cache_memory_max_bytes: int = cache.DEFAULT_MEMORY_MAX_BYTES,
+        retry_policy: Optional[RetryPolicy] = resilience.DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+    ):
+        self.openai_key = openai_key
+        self.model = model
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+
+        self.cache: Optional[cache.ResultCache] = None
+        if self.cache_path:
+            self.cache = cache.ResultCache(
+                self.cache_path,
+                cache_max_entries,
+                cache_ttl,
+                cache_memory_max_entries,
+                cache_memory_max_bytes,
+            )
+
+        self.usage_log: Optional[usage.UsageLog] = None
+        if self.cache_path:
+            self.usage_log = usage.UsageLog(self.cache_path)
+
+        self._single_flight = concurrency.SingleFlight()
+        self._async_single_flight = concurrency.AsyncSingleFlight()
+        self._circuit_breaker: Optional[resilience.CircuitBreaker] = None
+        if retry_policy:
+            self._circuit_breaker = resilience.CircuitBreaker(
+                retry_policy.failure_threshold, retry_policy.reset_timeout
+            )
+
+        self._lock = threading.Lock()
+        self._llms: Dict[str, ChatOpenAI] = {}
+        self._chains: Dict[Tuple[str, LanguageNames, Optional[str]], Any] = {}
+
+    def _get_llm(self, model: str) -> ChatOpenAI:
+        if model not in self._llms:
+            if self.retry_policy:
+                # Attempts are retried by the retry policy instead.
+                self._llms[model] = ChatOpenAI(
+                    api_key=self.openai_key,
+                    model=model,
+                    timeout=self.retry_policy.timeout or self.timeout,
+                    max_retries=0,
+                    stream_usage=True,
+                    cache=False,
+                )
+            else:
+                self._llms[model] = ChatOpenAI(
+                    api_key=self.openai_key,
+                    model=model,
+                    timeout=self.timeout,
+                    stream_usage=True,
+                    cache=False,
+                )
+        return self._llms[model]
+
+    def _get_chain(
+        self,
+        prompt_filename: str,
+        language_names: LanguageNames,
+        wrapper_prompt_filename: Optional[str] = None,
+    ):
+        """
+        Return the prompt | llm chain of a prompt for the given languages.
+
+        The system prompt is rendered once per combination of languages,
+        such that only the user prompt is formatted at each request.
+
+        If a wrapper prompt is given, its system prompt follows the one of
+        the prompt and its user prompt replaces the one of the prompt.
+        """
+        key = (prompt_filename, language_names, wrapper_prompt_filename)
+        with self._lock:
+            if key not in self._chains:
+                prompt_config = prompt_registry.get_prompt(prompt_filename)
+                messages = [
+                    SystemMessage(
+                        content=prompt_registry.render_system_prompt(
+                            prompt_filename, language_names
+                        )
+                    )
+                ]
+                user_prompt = prompt_config.user_prompt
+                if wrapper_prompt_filename:
+                    messages.append(
+                        SystemMessage(
+                            content=prompt_registry.render_system_prompt(
+                                wrapper_prompt_filename, language_names
+                            )
+                        )
+                    )
+                    user_prompt = prompt_registry.get_prompt(
+                        wrapper_prompt_filename
+                    ).user_prompt
+
+                prompt = ChatPromptTemplate.from_messages(
+                    messages + [("user", user_prompt)]
+                )
+                llm = self._get_llm(prompt_config.model or self.model)
+                self._chains[key] = prompt | llm
+            return self._chains[key]
+
+    def _format_prompt(self, chain, data: Dict[str, str]) -> str:
+        """
+        Return the text of the messages sent by a request.
+        """
+        prompt = getattr(chain, "first", None)
+        return prompt.format(**data) if prompt is not None else data["message"]
+
+    def _estimate_tokens(self, chain, data: Dict[str, str]) -> int:
+        """
+        Estimate the tokens of a request: its formatted prompt and an
+        allowance for the completion.
+        """
+        return (
+            rate_limit.estimate_tokens(self._format_prompt(chain, data))
+            + rate_limit.DEFAULT_COMPLETION_TOKENS
+        )
+
+    def _usage_key(
+        self,
+        prompt_filename: str,
+        languages_alpha3: Dict[str, str],
+        operation_name: Optional[str] = None,
+    ) -> Optional[usage.UsageKey]:
+        """
+        Return the key under which the usage of a prompt is recorded, or
+        None if usage is not recorded.
+        """
+        if self.usage_log is None:
+            return None
+        prompt_config = prompt_registry.get_prompt(prompt_filename)
+        return usage.UsageKey(
+            operation_name or operation.get_operation_name(prompt_filename),
+            tuple(language.get_alpha3(code) for code in languages_alpha3.values()),
+            prompt_config.model or self.model,
+        )
+
+    def _get_call_usage(self, chain, data: Dict[str, str], response) -> usage.Usage:
+        call_usage = usage.get_reported_usage(response)
+        if call_usage is None:
+            call_usage = usage.estimate_usage(
+                self._format_prompt(chain, data), response.content
+            )
+        return call_usage
+
+    def _record_usage(
+        self, usage_key: Optional[usage.UsageKey], chain, data: Dict[str, str], response
+    ):
+        if usage_key is not None:
+            self.usage_log.record(
+                usage_key, self._get_call_usage(chain, data, response)
+            )
+
+    async def _async_record_usage(
+        self, usage_key: Optional[usage.UsageKey], chain, data: Dict[str, str], response
+    ):
+        if usage_key is not None:
+            await self.usage_log.async_record(
+                usage_key, self._get_call_usage(chain, data, response)
+            )
+
+    def _refund_tokens(self, estimated_tokens: int, response):
+        """
+        Give back to the rate limiter the tokens estimated in excess.
+        """
+        usage = getattr(response, "usage_metadata", None)
+        if usage and "total_tokens" in usage:
+            self.rate_limiter.refund(estimated_tokens - usage["total_tokens"])
+
+    async def _async_refund_tokens(self, estimated_tokens: int, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage and "total_tokens" in usage:
+            await self.rate_limiter.async_refund(
+                estimated_tokens - usage["total_tokens"]
+            )
+
+    def _invoke(
+        self,
+        chain,
+        data: Dict[str, str],
+        usage_key: Optional[usage.UsageKey] = None,
+    ) -> str:
+        """
+        Invoke a chain applying the rate limiter and the retry policy and
+        return the content of its response.
+
+        If a usage key is given, the tokens of the request are recorded
+        under it.
+        """
+        tokens = self._estimate_tokens(chain, data) if self.rate_limiter else 0
+
+        def attempt():
+            if not self.rate_limiter:
+                return chain.invoke(data)
+            self.rate_limiter.acquire(tokens)
+            response = chain.invoke(data)
+            # Each attempt gives back its own excess, such that both
+            # requests of a hedged call are accounted for.
+            self._refund_tokens(tokens, response)
+            return response
+
+        if self.retry_policy:
+            response = resilience.call(
+                attempt, self.retry_policy, self._circuit_breaker
+            )
+        else:
+            response = attempt()
+        if not response:
+            raise exception.OpenAIEmptyResponseError()
+        self._record_usage(usage_key, chain, data, response)
+
+        return response.content
+
+    async def _async_invoke(
+        self,
+        chain,
+        data: Dict[str, str],
+        usage_key: Optional[usage.UsageKey] = None,
+    ) -> str:
+        """
+        Asynchronous counterpart of _invoke.
+        """
+        tokens = self._estimate_tokens(chain, data) if self.rate_limiter else 0
+
+        async def attempt():
+            if not self.rate_limiter:
+                return await chain.ainvoke(data)
+            await self.rate_limiter.async_acquire(tokens)
+            response = await chain.ainvoke(data)
+            await self._async_refund_tokens(tokens, response)
+            return response
+
+        if self.retry_policy:
+            response = await resilience.async_call(
+                attempt, self.retry_policy, self._circuit_breaker
+            )
+        else:
+            response = await attempt()
+        if not response:
+            raise exception.OpenAIEmptyResponseError()
+        await self._async_record_usage(usage_key, chain, data, response)
+
+        return response.content
+
+    def _language_names(self, **languages_alpha3: str) -> LanguageNames:
+        return tuple(
+            (key, language.get_language_name(language_code))
+            for key, language_code in languages_alpha3.items()
+        )
+
+    ########################################
+    # Generic execution
+    ########################################
+
+    def run(self, prompt_filename: str, message: str, **languages_alpha3: str) -> str:
+        """
+        Execute a prompt and return the content of its response.
+
+        Each keyword argument is a prompt variable set to the name of the
+        language of the given code.
+
+        Raises:
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        language_names = self._language_names(**languages_alpha3)
+        chain = self._get_chain(prompt_filename, language_names)
+        return self._invoke(
+            chain,
+            {**dict(language_names), "message": message},
+            self._usage_key(prompt_filename, languages_alpha3),
+        )
+
+    async def async_run(
+        self, prompt_filename: str, message: str, **languages_alpha3: str
+    ) -> str:
+        """
+        Asynchronous counterpart of run.
+        """
+        language_names = self._language_names(**languages_alpha3)
+        chain = self._get_chain(prompt_filename, language_names)
+        return await self._async_invoke(
+            chain,
+            {**dict(language_names), "message": message},
+            self._usage_key(prompt_filename, languages_alpha3),
+        )
+
+    def run_batch(
+        self,
+        prompt_filename: str,
+        entries: Iterable[str],
+        max_concurrency: int = 1,
+        requests_per_second: Optional[float] = None,
+        **languages_alpha3: str,
+    ) -> Iterator[BatchItem]:
+        """
+        Execute a prompt with every entry as message.
+
+        At most max_concurrency requests are in flight at the same time
+        and, if given, at most requests_per_second requests are started
+        per second.
+
+        Results are yielded in input order. A failing entry, e.g. because
+        of an empty response, has its error stored in its BatchItem and does
+        not interrupt the batch.
+
+        Raises:
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        language_names = self._language_names(**languages_alpha3)
+        chain = self._get_chain(prompt_filename, language_names)
+        data = dict(language_names)
+        usage_key = self._usage_key(prompt_filename, languages_alpha3)
+        rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        def call(entry: str) -> str:
+            return self._invoke(chain, {**data, "message": entry}, usage_key)
+
+        return concurrency.ordered_map(call, entries, max_concurrency, rate_limiter)
+
+    async def async_run_batch(
+        self,
+        prompt_filename: str,
+        entries: Iterable[str],
+        max_concurrency: int = 1,
+        requests_per_second: Optional[float] = None,
+        **languages_alpha3: str,
+    ) -> List[BatchItem]:
+        """
+        Asynchronous counterpart of run_batch.
+        """
+        language_names = self._language_names(**languages_alpha3)
+        chain = self._get_chain(prompt_filename, language_names)
+        data = dict(language_names)
+        usage_key = self._usage_key(prompt_filename, languages_alpha3)
+        rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        async def call(entry: str) -> str:
+            return await self._async_invoke(
+                chain, {**data, "message": entry}, usage_key
+            )
+
+        return await concurrency.async_ordered_map(
+            call, entries, max_concurrency, rate_limiter
+        )
+
+    def _operation_languages(
+        self, operation_name: str, language_codes: Sequence[str]
+    ) -> Tuple[Operation, Dict[str, str]]:
+        op = operation.get_operation(operation_name)
+        if len(language_codes) != len(op.language_variables):
+            raise TypeError(
+                f"The operation {operation_name} expects {len(op.language_variables)} language codes but {len(language_codes)} were given."
+            )
+        return op, dict(zip(op.language_variables, language_codes))
+
+    def _cache_key(
+        self, op: Operation, message: str, languages: Dict[str, str]
+    ) -> cache.CacheKey:
+        prompt_config = prompt_registry.get_prompt(op.prompt_filename)
+        return cache.CacheKey(
+            op.name,
+            op.normalize(message),
+            tuple(language.get_alpha3(code) for code in languages.values()),
+            prompt_registry.get_prompt_version(op.prompt_filename),
+            prompt_config.model or self.model,
+        )
+
+    def _packed_cache_key(self, op: Operation, key: cache.CacheKey) -> cache.CacheKey:
+        """
+        Return the key of the answer to a packed request, see
+        danoan.word_guru.core.packing.
+        """
+        return cache.CacheKey(
+            packing.get_packed_name(op.name),
+            key.message,
+            key.languages,
+            packing.get_prompt_version(op.prompt_filename),
+            key.model,
+        )
+
+    def _execute(
+        self,
+        op: Operation,
+        message: str,
+        languages: Dict[str, str],
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        key = self._cache_key(op, message, languages)
+        if self.cache is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
+        def call() -> str:
+            # The flight of an identical request may have ended since.
+            if self.cache is not None:
+                response = self.cache.get(key, count=False)
+                if response is not None:
+                    return response
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = self.run(op.prompt_filename, message, **languages)
+            if self.cache is not None:
+                self.cache.put(key, response)
+            return response
+
+        return self._single_flight.do(key, call)
+
+    async def _async_execute(
+        self,
+        op: Operation,
+        message: str,
+        languages: Dict[str, str],
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        key = self._cache_key(op, message, languages)
+        if self.cache is not None:
+            response = await self.cache.async_get(key)
+            if response is not None:
+                return response
+
+        async def call() -> str:
+            # The flight of an identical request may have ended since.
+            if self.cache is not None:
+                response = await self.cache.async_get(key, count=False)
+                if response is not None:
+                    return response
+            if rate_limiter:
+                await rate_limiter.async_acquire()
+            response = await self.async_run(op.prompt_filename, message, **languages)
+            if self.cache is not None:
+                await self.cache.async_put(key, response)
+            return response
+
+        return await self._async_single_flight.do(key, call)
+
+    def execute(self, operation_name: str, message: str, *language_codes: str) -> str:
+        """
+        Execute an operation by name, e.g. execute("translation", "pareil", "fra", "eng").
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        return self._execute(op, message, languages)
+
+    async def async_execute(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> str:
+        """
+        Asynchronous counterpart of execute.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        return await self._async_execute(op, message, languages)
+
+    def is_cached(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> bool:
+        """
+        Tell whether the response of an operation is cached, such that
+        executing it does not send a request to openai.
+
+        The lookup is not counted in the statistics of the cache.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        if self.cache is None:
+            return False
+        op, languages = self._operation_languages(operation_name, language_codes)
+        key = self._cache_key(op, message, languages)
+        return self.cache.get(key, count=False) is not None
+
+    def get_result(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> result.Result:
+        """
+        Execute an operation by name and return its typed result, e.g.
+        get_result("synonym", "love", "eng") returns a SynonymList.
+
+        Invalid json responses are repaired locally or, failing that, sent
+        once to the repair-json prompt. The repaired response replaces the
+        invalid one in the cache.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+            InvalidResponseError: If the response is invalid, even once repaired.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        response = self._execute(op, message, languages)
+        try:
+            return result.parse(op.name, response)
+        except exception.InvalidResponseError as ex:
+            logger.warning(f"{ex}. Ask for a repair.")
+
+        repaired = self.run(result.REPAIR_PROMPT_FILENAME, response)
+        parsed = result.parse(op.name, repaired)
+        if self.cache is not None:
+            self.cache.put(self._cache_key(op, message, languages), repaired)
+        return parsed
+
+    async def async_get_result(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> result.Result:
+        """
+        Asynchronous counterpart of get_result.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        response = await self._async_execute(op, message, languages)
+        try:
+            return result.parse(op.name, response)
+        except exception.InvalidResponseError as ex:
+            logger.warning(f"{ex}. Ask for a repair.")
+
+        repaired = await self.async_run(result.REPAIR_PROMPT_FILENAME, response)
+        parsed = result.parse(op.name, repaired)
+        if self.cache is not None:
+            await self.cache.async_put(
+                self._cache_key(op, message, languages), repaired
+            )
+        return parsed
+
+    def _stream_policy(self) -> RetryPolicy:
+        # A second stream would yield its chunks after the ones of the first.
+        return dataclasses.replace(self.retry_policy, hedge_after=None)
+
+    def _stream_response(
+        self, contents: List[str], usage_metadata: Optional[Dict[str, int]]
+    ) -> AIMessage:
+        """
+        Return the message made of the chunks of a stream, with the usage
+        reported by its last chunks, if any.
+
+        Raises:
+            OpenAIEmptyResponseError: If the stream has no content.
+        """
+        if not contents:
+            raise exception.OpenAIEmptyResponseError()
+        if usage_metadata:
+            return AIMessage(content="".join(contents), usage_metadata=usage_metadata)
+        return AIMessage(content="".join(contents))
+
+    def stream(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> Iterator[str]:
+        """
+        Execute an operation by name and yield its response in chunks, as
+        they arrive.
+
+        A cached response is yielded in a single chunk. Once complete, the
+        response is cached. Streams are not shared among identical requests.
+
+        Opening the stream, up to its first chunk, follows the retry policy
+        and the circuit breaker, without hedging. A stream failing after
+        its first chunk is not attempted again.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        language_names = self._language_names(**languages)
+        key = self._cache_key(op, message, languages)
+        chain = self._get_chain(op.prompt_filename, language_names)
+
+        def generate() -> Iterator[str]:
+            if self.cache is not None:
+                response = self.cache.get(key)
+                if response is not None:
+                    yield response
+                    return
+
+            data = {**dict(language_names), "message": message}
+            tokens = self._estimate_tokens(chain, data) if self.rate_limiter else 0
+
+            def open_stream():
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(tokens)
+                chunks = iter(chain.stream(data))
+                return chunks, next(chunks, None)
+
+            if self.retry_policy:
+                chunks, chunk = resilience.call(
+                    open_stream, self._stream_policy(), self._circuit_breaker
+                )
+            else:
+                chunks, chunk = open_stream()
+
+            contents = []
+            usage_metadata = None
+            while chunk is not None:
+                if chunk.content:
+                    contents.append(chunk.content)
+                    yield chunk.content
+                usage_metadata = (
+                    getattr(chunk, "usage_metadata", None) or usage_metadata
+                )
+                chunk = next(chunks, None)
+
+            response = self._stream_response(contents, usage_metadata)
+            if self.cache is not None:
+                self.cache.put(key, response.content)
+            if self.rate_limiter:
+                self._refund_tokens(tokens, response)
+            self._record_usage(
+                self._usage_key(op.prompt_filename, languages), chain, data, response
+            )
+
+        return generate()
+
+    def async_stream(
+        self, operation_name: str, message: str, *language_codes: str
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of stream.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        language_names = self._language_names(**languages)
+        key = self._cache_key(op, message, languages)
+        chain = self._get_chain(op.prompt_filename, language_names)
+
+        async def generate() -> AsyncIterator[str]:
+            if self.cache is not None:
+                response = await self.cache.async_get(key)
+                if response is not None:
+                    yield response
+                    return
+
+            data = {**dict(language_names), "message": message}
+            tokens = self._estimate_tokens(chain, data) if self.rate_limiter else 0
+
+            async def open_stream():
+                if self.rate_limiter:
+                    await self.rate_limiter.async_acquire(tokens)
+                chunks = aiter(chain.astream(data))
+                return chunks, await anext(chunks, None)
+
+            if self.retry_policy:
+                chunks, chunk = await resilience.async_call(
+                    open_stream, self._stream_policy(), self._circuit_breaker
+                )
+            else:
+                chunks, chunk = await open_stream()
+
+            contents = []
+            usage_metadata = None
+            while chunk is not None:
+                if chunk.content:
+                    contents.append(chunk.content)
+                    yield chunk.content
+                usage_metadata = (
+                    getattr(chunk, "usage_metadata", None) or usage_metadata
+                )
+                chunk = await anext(chunks, None)
+
+            response = self._stream_response(contents, usage_metadata)
+            if self.cache is not None:
+                await self.cache.async_put(key, response.content)
+            if self.rate_limiter:
+                await self._async_refund_tokens(tokens, response)
+            await self._async_record_usage(
+                self._usage_key(op.prompt_filename, languages), chain, data, response
+            )
+
+        return generate()
+
+    def execute_batch(
+        self,
+        operation_name: str,
+        entries: Iterable[str],
+        language_codes: Sequence[str],
+        max_concurrency: int = 1,
+        requests_per_second: Optional[float] = None,
+    ) -> Iterator[BatchItem]:
+        """
+        Execute an operation with every entry as message.
+
+        Works as run_batch, except that responses are cached and cached
+        responses do not count in the requests_per_second limit.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        self._language_names(**languages)
+        rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        return concurrency.ordered_map(
+            lambda entry: self._execute(op, entry, languages, rate_limiter),
+            entries,
+            max_concurrency,
+        )
+
+    async def async_execute_batch(
+        self,
+        operation_name: str,
+        entries: Iterable[str],
+        language_codes: Sequence[str],
+        max_concurrency: int = 1,
+        requests_per_second: Optional[float] = None,
+    ) -> List[BatchItem]:
+        """
+        Asynchronous counterpart of execute_batch.
+        """
+        op, languages = self._operation_languages(operation_name, language_codes)
+        self._language_names(**languages)
+        rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        return await concurrency.async_ordered_map(
+            lambda entry: self._async_execute(op, entry, languages, rate_limiter),
+            entries,
+            max_concurrency,
+        )
+
+    def execute_packed(
+        self,
+        operation_name: str,
+        entries: Iterable[str],
+        language_codes: Sequence[str],
+        pack_size: int = packing.DEFAULT_PACK_SIZE,
+        max_concurrency: int = 1,
+        requests_per_second: Optional[float] = None,
+        retries: int = 1,
+    ) -> Iterator[BatchItem]:
+        """
+        Execute an operation with every entry as message, sending up to
+        pack_size entries per request.
+
+        Works as execute_batch, except that the entries missing from the
+        cache are packed in requests of at most pack_size entries, see
+        danoan.word_guru.core.packing. Entries missing or invalid in the
+        response are packed again up to retries times and then requested
+        one by one. Answers are validated against the result type of the
+        operation and cached per entry, apart from the answers of single
+        requests. If a pack fails as a whole, each of its entries has the
+        error stored in its BatchItem.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+            ValueError: If pack_size is smaller than 1.
+        """
+        if pack_size < 1:
+            raise ValueError("pack_size must be at least 1.")
+
+        op, languages = self._operation_languages(operation_name, language_codes)
+        language_names = self._language_names(**languages)
+        chain = self._get_chain(
+            op.prompt_filename, language_names, packing.PACKED_PROMPT_FILENAME
+        )
+        data = dict(language_names)
+        usage_key = self._usage_key(
+            op.prompt_filename, languages, packing.get_packed_name(op.name)
+        )
+        rate_limiter = RateLimiter(requests_per_second) if requests_per_second else None
+
+        def call_pack(entries: List[str]) -> Dict[str, str]:
+            if rate_limiter:
+                rate_limiter.acquire()
+            try:
+                response = self._invoke(
+                    chain, {**data, "message": packing.pack(entries)}, usage_key
+                )
+            except (
+                exception.OpenAIEmptyResponseError,
+                *resilience.PROVIDER_ERRORS,
+            ) as ex:
+                logger.warning(f"Packed request of {len(entries)} entries failed: {ex}")
+                return {}
+
+            responses = {}
+            for entry, entry_response in packing.unpack(
+                response, entries, op.normalize
+            ).items():
+                try:
+                    result.parse(op.name, entry_response)
+                except exception.InvalidResponseError as ex:
+                    logger.debug(f"Invalid packed answer for {entry}: {ex}")
+                    continue
+                responses[entry] = entry_response
+            return responses
+
+        def execute_pack(pack: List[str]) -> List[BatchItem]:
+            keys = {entry: self._cache_key(op, entry, languages) for entry in pack}
+            packed_keys = {
+                entry: self._packed_cache_key(op, key) for entry, key in keys.items()
+            }
+            responses = {}
+            if self.cache is not None:
+                for entry in pack:
+                    response = self.cache.get(keys[entry])
+                    if response is None:
+                        response = self.cache.get(packed_keys[entry])
+                    if response is not None:
+                        responses[entry] = response
+
+            missing = list(dict.fromkeys(e for e in pack if e not in responses))
+            for _ in range(retries + 1):
+                if not missing:
+                    break
+                packed_responses = call_pack(missing)
+                for entry, response in packed_responses.items():
+                    responses[entry] = response
+                    if self.cache is not None:
+                        self.cache.put(packed_keys[entry], response)
+                missing = [e for e in missing if e not in packed_responses]
+
+            batch_items = []
+            for entry in pack:
+                if entry in responses:
+                    batch_items.append(BatchItem(entry, responses[entry]))
+                    continue
+                try:
+                    response = self._execute(op, entry, languages, rate_limiter)
+                    batch_items.append(BatchItem(entry, response))
+                except Exception as ex:
+                    batch_items.append(BatchItem(entry, error=ex))
+            return batch_items
+
+        def flatten(packs: Iterator[BatchItem]) -> Iterator[BatchItem]:
+            for batch_item in packs:
+                if batch_item.ok:
+                    yield from batch_item.response
+                    continue
+                # The pack failed as a whole, e.g. because the circuit is open.
+                for entry in batch_item.input:
+                    yield BatchItem(entry, error=batch_item.error)
+
+        return flatten(
+            concurrency.ordered_map(
+                execute_pack, packing.split(entries, pack_size), max_concurrency
+            )
+        )
+
+    ########################################
+    # Operations
+    ########################################
+
+    def definition(self, word: str, language_alpha3: str) -> str:
+        """
+        Get the definition of a word.
+
+        The response is a string containing the definition of the word.
+        """
+        return self.execute("definition", word, language_alpha3)
+
+    def synonyms(self, word: str, language_alpha3: str) -> str:
+        """
+        Get the synonyms of a word.
+
+        The response is string which content is a json list with strings, each one representing a synonym.
+        """
+        return self.execute("synonym", word, language_alpha3)
+
+    def reverse_definition(self, text: str, language_alpha3: str) -> str:
+        """
+        Get a list of words that best encode the intention of a text.
+
+        The response is a string which the content is a json list with strings, each one representing a word.
+        """
+        return self.execute("reverse-definition", text, language_alpha3)
+
+    def usage_examples(self, word: str, language_alpha3: str) -> str:
+        """
+        Get a list of sentences in which the word is used with their different meanings.
+
+        The response is a string which the content is a json list with strings, each one representing a word.
+        """
+        return self.execute("usage-examples", word, language_alpha3)
+
+    def pos_tags(self, word: str, language_alpha3: str) -> str:
+        """
+        Get the part-of-speech tag of the most common uses of the word.
+
+        The response is a string which the content is a json list with strings, each one representing a pos tag.
+        """
+        return self.execute("pos-tag", word, language_alpha3)
+
+    def translate(
+        self, word: str, from_language_alpha3: str, to_language_alpha3: str
+    ) -> str:
+        """
+        Get the translation of a word or expression.
+        """
+        return self.execute(
+            "translation", word, from_language_alpha3, to_language_alpha3
+        )
+
+    def translate_many(
+        self,
+        word: str,
+        from_language_alpha3: str,
+        to_languages_alpha3: Iterable[str],
+    ) -> Dict[str, str]:
+        """
+        Get the translations of a word or expression into several languages.
+
+        The translations are requested in parallel, one per target language,
+        such that they take the time of a single request. Each translation is
+        cached as if it were requested with translate.
+
+        The response maps each target language code to its translation.
+
+        Raises:
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        to_languages_alpha3 = list(dict.fromkeys(to_languages_alpha3))
+        for language_code in [from_language_alpha3, *to_languages_alpha3]:
+            language.get_alpha3(language_code)
+
+        batch_items = concurrency.ordered_map(
+            lambda to_language: self.translate(word, from_language_alpha3, to_language),
+            to_languages_alpha3,
+            max(len(to_languages_alpha3), 1),
+        )
+        translations = {}
+        for to_language, batch_item in zip(to_languages_alpha3, batch_items):
+            if not batch_item.ok:
+                raise batch_item.error
+            translations[to_language] = batch_item.response
+        return translations
+
+    async def async_translate_many(
+        self,
+        word: str,
+        from_language_alpha3: str,
+        to_languages_alpha3: Iterable[str],
+    ) -> Dict[str, str]:
+        """
+        Asynchronous counterpart of translate_many.
+        """
+        to_languages_alpha3 = list(dict.fromkeys(to_languages_alpha3))
+        responses = await asyncio.gather(
+            *(
+                self.async_execute(
+                    "translation", word, from_language_alpha3, to_language
+                )
+                for to_language in to_languages_alpha3
+            )
+        )
+        return dict(zip(to_languages_alpha3, responses))
+
+    def correct(self, text: str, language_alpha3: str) -> str:
+        """
+        Get the corrected version of a text.
+        """
+        return self.execute("correction", text, language_alpha3)
+
+    def correct_document(
+        self,
+        text: str,
+        language_alpha3: str,
+        chunk_size: int = document.DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = 4,
+    ) -> str:
+        """
+        Get the corrections of a document too large for a single request.
+
+        The document is split into paragraph-aligned chunks, see
+        danoan.word_guru.core.document, which are corrected concurrently
+        and cached one by one. After editing a paragraph, only the chunks
+        of this paragraph are requested again.
+
+        The response is a string which content is the json object returned
+        by correct, with the corrections of every chunk in document order.
+
+        Raises:
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+            ValueError: If the correction of a chunk is not a json object of lists.
+        """
+        chunks = document.split_chunks(text, chunk_size)
+        batch_items = list(
+            self.execute_batch(
+                "correction", chunks, (language_alpha3,), max_concurrency
+            )
+        )
+        for batch_item in batch_items:
+            if not batch_item.ok:
+                raise batch_item.error
+
+        corrections = document.merge_corrections(
+            batch_item.response for batch_item in batch_items
+        )
+        return json.dumps(corrections, ensure_ascii=False)
+
+    def _word_card_cache_key(self, word: str, language_alpha3: str) -> cache.CacheKey:
+        op, languages = self._operation_languages("word-card", (language_alpha3,))
+        return self._cache_key(op, word, languages)
+
+    def word_card(self, word: str, language_alpha3: str, composite: bool = True) -> str:
+        """
+        Get the definitions, synonyms, part-of-speech tags and usage examples of a word.
+
+        The response is a string which content is a json object with the
+        lists definitions, synonyms, pos_tags and usage_examples. If composite
+        is true, the word card is requested in a single request. Otherwise, or
+        if the single response is not a valid word card, the individual
+        operations are requested in parallel. The card assembled from them
+        then replaces the invalid single response in the cache.
+
+        Raises:
+            OpenAIEmptyResponseError: If openai return an empty response.
+            LanguageCodeNotRecognizedError: If language code is not recognized.
+        """
+        if composite:
+            try:
+                card = word_card.validate(
+                    result.loads(self.execute("word-card", word, language_alpha3))
+                )
+                return json.dumps(card, ensure_ascii=False)
+            except ValueError as ex:
+                logger.warning(f"Invalid word card for {word}, fall back: {ex}")
+
+        batch_items = concurrency.ordered_map(
+            lambda operation_name: self.execute(operation_name, word, language_alpha3),
+            word_card.FIELDS.values(),
+            len(word_card.FIELDS),
+        )
+        card = {}
+        for field, batch_item in zip(word_card.FIELDS, batch_items):
+            if not batch_item.ok:
+                raise batch_item.error
+            card[field] = word_card.parse_field(batch_item.response)
+        response = json.dumps(card, ensure_ascii=False)
+        if composite and self.cache is not None:
+            self.cache.put(self._word_card_cache_key(word, language_alpha3), response)
+        return response
+
+    async def async_word_card(
+        self, word: str, language_alpha3: str, composite: bool = True
+    ) -> str:
+        """
+        Asynchronous counterpart of word_card.
+        """
+        if composite:
+            try:
+                response = await self.async_execute("word-card", word, language_alpha3)
+                card = word_card.validate(result.loads(response))
+                return json.dumps(card, ensure_ascii=False)
+            except ValueError as ex:
+                logger.warning(f"Invalid word card for {word}, fall back: {ex}")
+
+        responses = await asyncio.gather(
+            *(
+                self.async_execute(operation_name, word, language_alpha3)
+                for operation_name in word_card.FIELDS.values()
+            )
+        )
+        card = {
+            field: word_card.parse_field(response)
+            for field, response in zip(word_card.FIELDS, responses)
+        }
+        response = json.dumps(card, ensure_ascii=False)
+        if composite and self.cache is not None:
+            await self.cache.async_put(
+                self._word_card_cache_key(word, language_alpha3), response
+            )
+        return response
@@ -0,0 +1,165 @@
+"""
+Bounded concurrent execution of requests.
+"""
+
+from danoan.word_guru.core.model import BatchItem
+from danoan.word_guru.core.rate_limit import RateLimiter
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+class SingleFlight:
+    """
+    Share a single call among concurrent callers asking for the same key.
+
+    The first caller of a key executes the function. Callers arriving while
+    that call is in flight wait for it and receive the same result, or the
+    same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            is_leader = key not in self._calls
+            if is_leader:
+                self._calls[key] = Future()
+            future = self._calls[key]
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = function()
+            future.set_result(result)
+            return result
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Event loop counterpart of SingleFlight.
+
+    Calls are shared among the coroutines of the same event loop. The
+    shared call runs in its own task, such that cancelling any caller,
+    the first one included, does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(loop_key)
+        if task is None:
+            task = asyncio.ensure_future(function())
+            self._calls[loop_key] = task
+
+            def on_done(done: asyncio.Future):
+                if self._calls.get(loop_key) is done:
+                    del self._calls[loop_key]
+                # Every caller may be gone, avoid the never retrieved warning
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(on_done)
+        return await asyncio.shield(task)
+
+
+def _to_batch_item(item: Any, future: Future) -> BatchItem:
+    try:
+        return BatchItem(item, future.result())
+    except Exception as ex:
+        return BatchItem(item, error=ex)
+
+
+def ordered_map(
+    function: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int = 1,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Iterator[BatchItem]:
+    """
+    Apply function to every item using at most max_concurrency threads.
+
+    Results are yielded in input order as BatchItem objects. An exception
+    raised by function is stored in the corresponding BatchItem instead of
+    interrupting the remaining items. Items are consumed lazily, such that
+    at most twice max_concurrency items are in memory at the same time.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+
+    def task(item):
+        if rate_limiter:
+            rate_limiter.acquire()
+        return function(item)
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    pending: Deque[Tuple[Any, Future]] = deque()
+    try:
+        for item in items:
+            pending.append((item, executor.submit(task, item)))
+            if len(pending) >= 2 * max_concurrency:
+                yield _to_batch_item(*pending.popleft())
+
+        while pending:
+            yield _to_batch_item(*pending.popleft())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def async_ordered_map(
+    function: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    max_concurrency: int = 1,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[BatchItem]:
+    """
+    Await function for every item with at most max_concurrency pending calls.
+
+    This is the event loop counterpart of ordered_map. Results are returned
+    in input order as BatchItem objects and an exception raised by function
+    is stored in the corresponding BatchItem.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+
+    # A pool of max_concurrency workers consumes the items lazily.
+    entries = enumerate(items)
+    results: Dict[int, BatchItem] = {}
+
+    async def worker():
+        for index, item in entries:
+            try:
+                if rate_limiter:
+                    await rate_limiter.async_acquire()
+                results[index] = BatchItem(item, await function(item))
+            except Exception as ex:
+                results[index] = BatchItem(item, error=ex)
+
+    await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+    return [results[index] for index in range(len(results))]
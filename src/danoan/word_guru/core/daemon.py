@@ -0,0 +1,211 @@
+"""
+Local word-guru daemon.
+
+The daemon keeps the clients, the prompt registry and the cache warm and
+executes operations requested through a Unix domain socket. Messages are
+json objects, one per line, and a connection can carry several requests.
+
+The client side of this module only depends on the standard library, such
+that forwarding a request to the daemon does not pay the import of the
+openai client.
+"""
+
+from danoan.word_guru.core import exception
+
+import json
+import os
+from pathlib import Path
+import socket
+import socketserver
+import tempfile
+from typing import Any, Dict, Optional
+
+WORD_GURU_SOCKET_ENV_VARIABLE = "WORD_GURU_SOCKET"
+
+# Seconds to wait for the reply of the daemon. Requests to openai are
+# attempted several times, so this is well above a single request.
+DEFAULT_REQUEST_TIMEOUT = 300.0
+
+# Errors raised again with their own type by the client side
+_FORWARDED_ERRORS = {
+    error.__name__: error
+    for error in (
+        exception.OpenAIEmptyResponseError,
+        exception.LanguageCodeNotRecognizedError,
+        exception.OperationNotFoundError,
+        exception.InvalidResponseError,
+        exception.CircuitOpenError,
+    )
+}
+
+
+def get_socket_path() -> Path:
+    """
+    Return the path of the daemon socket.
+
+    The path is read from the WORD_GURU_SOCKET environment variable and
+    defaults to a per-user file in the temporary directory.
+    """
+    if WORD_GURU_SOCKET_ENV_VARIABLE in os.environ:
+        return Path(os.environ[WORD_GURU_SOCKET_ENV_VARIABLE]).expanduser()
+    return Path(tempfile.gettempdir()) / f"word-guru-{os.getuid()}.sock"
+
+
+########################################
+# Server
+########################################
+
+
+def _handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    from danoan.word_guru.core import api
+
+    try:
+        client = api.get_client(request["openai_key"], request.get("cache_path"))
+        response = client.execute(
+            request["operation"], request["message"], *request["languages"]
+        )
+        return {"response": response}
+    except Exception as ex:
+        reply = {"error": str(ex), "error_type": type(ex).__name__}
+        if type(ex).__name__ in _FORWARDED_ERRORS:
+            reply["error_args"] = list(ex.args)
+        return reply
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = _handle_request(json.loads(line))
+            except json.JSONDecodeError as ex:
+                reply = {"error": str(ex), "error_type": type(ex).__name__}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(socket_path: Path) -> socketserver.BaseServer:
+    """
+    Create a daemon server bound to socket_path.
+
+    A stale socket file left by a daemon that is not running anymore is
+    replaced. The socket is only accessible by the current user.
+
+    Raises:
+        FileExistsError: If a daemon is already listening on socket_path.
+    """
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        if is_running(socket_path):
+            raise FileExistsError(f"A daemon is already listening on {socket_path}")
+        socket_path.unlink()
+
+    server = _Server(str(socket_path), _RequestHandler)
+    os.chmod(socket_path, 0o600)
+    return server
+
+
+def serve(socket_path: Path, openai_key: Optional[str], cache_path: Optional[Path]):
+    """
+    Warm up the default client and serve requests until interrupted.
+    """
+    from danoan.word_guru.core import api, prompt_registry
+
+    prompt_registry.list_prompts()
+    if openai_key:
+        api.get_client(openai_key, cache_path)
+
+    server = create_server(socket_path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        Path(socket_path).unlink(missing_ok=True)
+
+
+########################################
+# Client
+########################################
+
+
+def _connect(socket_path: Path, timeout: Optional[float] = None) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        raise exception.DaemonNotRunningError()
+    return sock
+
+
+def is_running(socket_path: Path) -> bool:
+    """
+    Check if a daemon is listening on socket_path.
+    """
+    try:
+        _connect(socket_path).close()
+        return True
+    except exception.DaemonNotRunningError:
+        return False
+
+
+def request(
+    socket_path: Path,
+    openai_key: Optional[str],
+    cache_path: Optional[Path],
+    operation_name: str,
+    message: str,
+    *language_codes: str,
+    timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+) -> str:
+    """
+    Execute an operation in the daemon listening on socket_path.
+
+    Errors of danoan.word_guru.core.exception raised by the daemon, e.g.
+    LanguageCodeNotRecognizedError, are raised again with their own type.
+
+    Raises:
+        DaemonNotRunningError: If no daemon is listening on socket_path.
+        OpenAIEmptyResponseError: If openai return an empty response.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+        OperationNotFoundError: If there is no operation with this name.
+        InvalidResponseError: If the response is invalid.
+        CircuitOpenError: If requests to openai are suspended.
+        DaemonRequestError: If the daemon fails to execute the operation or
+                            does not reply within timeout seconds.
+    """
+    payload = {
+        "openai_key": openai_key,
+        "cache_path": str(Path(cache_path).resolve()) if cache_path else None,
+        "operation": operation_name,
+        "message": message,
+        "languages": list(language_codes),
+    }
+
+    with _connect(socket_path, timeout) as sock:
+        try:
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except socket.timeout:
+            raise exception.DaemonRequestError(
+                "TimeoutError", f"The daemon did not reply within {timeout}s."
+            )
+
+    if not line:
+        raise exception.DaemonRequestError(
+            "ConnectionError", "The daemon closed the connection without replying."
+        )
+
+    reply = json.loads(line)
+
+    if "error" in reply:
+        if reply["error_type"] in _FORWARDED_ERRORS:
+            raise _FORWARDED_ERRORS[reply["error_type"]](*reply.get("error_args", []))
+        raise exception.DaemonRequestError(reply["error_type"], reply["error"])
+
+    return reply["response"]
@@ -0,0 +1,88 @@
+"""
+Correction of documents larger than a single request.
+
+A document is split into chunks aligned to its paragraphs. A paragraph
+longer than the chunk size is split into groups of sentences. Chunks only
+depend on their own paragraph, such that editing a paragraph does not
+change the chunks, and therefore the cached corrections, of the others.
+"""
+
+from danoan.word_guru.core import result
+
+import re
+from typing import Any, Dict, Iterable, List
+
+DEFAULT_CHUNK_SIZE = 2000
+
+_PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+_SENTENCE_SEPARATOR = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Split a text on its blank lines, ignoring empty paragraphs.
+    """
+    paragraphs = (p.strip() for p in _PARAGRAPH_SEPARATOR.split(text))
+    return [p for p in paragraphs if p]
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    """
+    Split a paragraph after each end of sentence punctuation.
+    """
+    sentences = (s.strip() for s in _SENTENCE_SEPARATOR.split(paragraph))
+    return [s for s in sentences if s]
+
+
+def split_chunks(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """
+    Split a document into chunks of at most chunk_size characters.
+
+    Each paragraph is a chunk. Paragraphs longer than chunk_size are split
+    into consecutive sentences grouped up to chunk_size characters. A
+    single sentence longer than chunk_size is a chunk of its own.
+
+    Raises:
+        ValueError: If chunk_size is smaller than 1.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    chunks = []
+    for paragraph in split_paragraphs(text):
+        if len(paragraph) <= chunk_size:
+            chunks.append(paragraph)
+            continue
+
+        group = ""
+        for sentence in split_sentences(paragraph):
+            if group and len(group) + 1 + len(sentence) > chunk_size:
+                chunks.append(group)
+                group = ""
+            group = f"{group} {sentence}" if group else sentence
+        if group:
+            chunks.append(group)
+    return chunks
+
+
+def merge_corrections(responses: Iterable[str]) -> Dict[str, List[Any]]:
+    """
+    Merge the corrections of the chunks of a document.
+
+    Each response is a json object mapping a category of correction to a
+    list of corrections. Corrections of each category are concatenated in
+    the order of the chunks.
+
+    Raises:
+        ValueError: If a response is not a json object of lists.
+    """
+    merged: Dict[str, List[Any]] = {}
+    for response in responses:
+        corrections = result.loads(response)
+        if not isinstance(corrections, dict):
+            raise ValueError(f"The correction is not a json object: {response}")
+        for category, items in corrections.items():
+            if not isinstance(items, list):
+                raise ValueError(f"The corrections of {category} are not a list.")
+            merged.setdefault(category, []).extend(items)
+    return merged
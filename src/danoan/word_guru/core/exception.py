@@ -7,4 +7,59 @@ class LanguageCodeNotRecognizedError(Exception):
         self.language_code = language_code
 
     def __str__(self):
-        return f"The language code {self.language_code} is not recognized. Make sure to enter a valid ISO 639-3 code. For example, `eng` for English"
+        return f"The language code {self.language_code} is not recognized. Make sure to enter a valid ISO 639-3 or ISO 639-1 code. For example, `eng` or `en` for English"
+
+
+class PromptNotFoundError(Exception):
+    def __init__(self, prompt_filename: str):
+        self.prompt_filename = prompt_filename
+
+    def __str__(self):
+        return f"The prompt {self.prompt_filename} does not exist."
+
+
+class InvalidPromptError(Exception):
+    def __init__(self, prompt_filename: str, reason: str):
+        self.prompt_filename = prompt_filename
+        self.reason = reason
+
+    def __str__(self):
+        return f"The prompt {self.prompt_filename} is invalid: {self.reason}"
+
+
+class OperationNotFoundError(Exception):
+    def __init__(self, operation_name: str):
+        self.operation_name = operation_name
+
+    def __str__(self):
+        return f"The operation {self.operation_name} does not exist."
+
+
+class DaemonNotRunningError(Exception):
+    pass
+
+
+class DaemonRequestError(Exception):
+    def __init__(self, error_type: str, message: str):
+        self.error_type = error_type
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, remaining: float):
+        self.remaining = remaining
+
+    def __str__(self):
+        return f"Requests to openai are suspended after repeated failures. Try again in {self.remaining:.0f}s."
+
+
+class InvalidResponseError(Exception):
+    def __init__(self, operation_name: str, reason: str):
+        self.operation_name = operation_name
+        self.reason = reason
+
+    def __str__(self):
+        return f"The response of {self.operation_name} is invalid: {self.reason}"
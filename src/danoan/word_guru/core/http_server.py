@@ -0,0 +1,319 @@
+"""
+HTTP json service exposing the word-guru operations.
+
+Endpoints:
+    GET  /health
+    GET  /operations
+    POST /<operation>        {"message": "pareil", "from_language": "fra", "to_language": "eng"}
+    POST /<operation>/batch  {"messages": ["pareil", "travail"], "from_language": "fra", "to_language": "eng"}
+    POST /translations       {"message": "pareil", "from_language": "fra", "to_languages": ["eng", "ita"]}
+    POST /document-correction  {"message": "...", "language": "fra", "chunk_size": 2000}
+    POST /word-card          {"message": "pareil", "language": "fra"}
+
+Operations are the ones listed in danoan.word_guru.core.operation and the
+language fields are named after their language variables, e.g. `language`
+for definition. The endpoints translations, document-correction and
+word-card follow WordGuru.translate_many, correct_document and word_card,
+such that word cards fall back to the individual operations. Every
+endpoint has a /batch variant.
+
+Responses hold the parsed json value of the answer, e.g.
+{"response": ["same"]}. Connections are kept alive (HTTP/1.1), each
+connection is served by its own thread and at most max_concurrency
+requests waiting for openai are served at the same time. Cached answers
+do not wait.
+
+Requests with an invalid body are answered with 400, errors of openai with
+502 and an open circuit breaker with 503.
+"""
+
+from danoan.word_guru.core import (
+    concurrency,
+    document,
+    exception,
+    language,
+    operation,
+    resilience,
+)
+from danoan.word_guru.core.client import WordGuru
+from danoan.word_guru.core.model import BatchItem
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def _get_string(body: Dict[str, Any], field: str) -> str:
+    value = body[field]
+    if not isinstance(value, str):
+        raise TypeError(f"The field {field} must be a string.")
+    return value
+
+
+def _get_strings(body: Dict[str, Any], field: str) -> List[str]:
+    value = body[field]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise TypeError(f"The field {field} must be a list of strings.")
+    return value
+
+
+def _get_chunk_size(body: Dict[str, Any]) -> int:
+    value = body.get("chunk_size", document.DEFAULT_CHUNK_SIZE)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise TypeError("The field chunk_size must be a positive integer.")
+    return value
+
+
+# Endpoints of the WordGuru functions that combine several requests, with
+# their parameter fields. The word-card operation is served by
+# WordGuru.word_card, which falls back to the individual operations.
+ENDPOINTS: Dict[str, Tuple[str, ...]] = {
+    "translations": ("from_language", "to_languages"),
+    "document-correction": ("language",),
+    "word-card": ("language",),
+}
+
+
+def _get_parameters(endpoint: str, body: Dict[str, Any]) -> List[Any]:
+    """
+    Return the parameters of an endpoint found in a request body.
+
+    Raises:
+        OperationNotFoundError: If there is no endpoint with this name.
+        KeyError: If a field is missing.
+        TypeError: If a field has the wrong type.
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    if endpoint in ENDPOINTS:
+        fields = ENDPOINTS[endpoint]
+    else:
+        fields = operation.get_operation(endpoint).language_variables
+
+    parameters = []
+    for field in fields:
+        if field == "to_languages":
+            language_codes = _get_strings(body, field)
+        else:
+            language_codes = [_get_string(body, field)]
+        for language_code in language_codes:
+            language.get_alpha3(language_code)
+        parameters.append(
+            language_codes if field == "to_languages" else language_codes[0]
+        )
+    if endpoint == "document-correction":
+        parameters.append(_get_chunk_size(body))
+    return parameters
+
+
+def _batch_item_to_json(batch_item: BatchItem) -> Dict[str, Any]:
+    if batch_item.ok:
+        return {"input": batch_item.input, "response": batch_item.response}
+    return {
+        "input": batch_item.input,
+        "error": str(batch_item.error) or type(batch_item.error).__name__,
+    }
+
+
+class WordGuruHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, server_address, client: WordGuru, max_concurrency: int = 16):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        super().__init__(server_address, _RequestHandler)
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def _limit(self, cached: bool, function: Callable[[], T]) -> T:
+        # Cached answers are served without waiting for the requests to openai.
+        if cached:
+            return function()
+        with self._semaphore:
+            return function()
+
+    def execute(self, endpoint: str, message: str, parameters: List[Any]) -> Any:
+        """
+        Execute an operation or one of the ENDPOINTS and return the json
+        value of its result.
+
+        Identical requests in flight are coalesced by the client.
+
+        Raises:
+            OperationNotFoundError: If there is no operation with this name.
+            OpenAIEmptyResponseError: If openai return an empty response.
+            InvalidResponseError: If the response is invalid, even once repaired.
+        """
+        client = self.client
+        if endpoint == "translations":
+            from_language, to_languages = parameters
+            self._limit(
+                all(
+                    client.is_cached("translation", message, from_language, to)
+                    for to in to_languages
+                ),
+                lambda: client.translate_many(message, from_language, to_languages),
+            )
+            # The translations are cached now; get_result repairs invalid ones.
+            return {
+                to: client.get_result(
+                    "translation", message, from_language, to
+                ).to_json_value()
+                for to in to_languages
+            }
+        if endpoint == "document-correction":
+            language_code, chunk_size = parameters
+            chunks = document.split_chunks(message, chunk_size)
+            try:
+                corrections = self._limit(
+                    all(
+                        client.is_cached("correction", chunk, language_code)
+                        for chunk in chunks
+                    ),
+                    lambda: client.correct_document(message, language_code, chunk_size),
+                )
+            except ValueError as ex:
+                raise exception.InvalidResponseError("correction", str(ex))
+            return json.loads(corrections)
+        if endpoint == "word-card":
+            (language_code,) = parameters
+            return json.loads(
+                self._limit(
+                    client.is_cached("word-card", message, language_code),
+                    lambda: client.word_card(message, language_code),
+                )
+            )
+        return self._limit(
+            client.is_cached(endpoint, message, *parameters),
+            lambda: client.get_result(endpoint, message, *parameters),
+        ).to_json_value()
+
+    def execute_batch(
+        self, endpoint: str, messages: List[str], parameters: List[Any]
+    ) -> List[BatchItem]:
+        return list(
+            concurrency.ordered_map(
+                lambda message: self.execute(endpoint, message, parameters),
+                messages,
+                self.max_concurrency,
+            )
+        )
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: WordGuruHTTPServer
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status: HTTPStatus, body: Dict[str, Any]):
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/operations":
+            self._send_json(
+                HTTPStatus.OK,
+                {
+                    **{
+                        name: list(op.language_variables)
+                        for name, op in operation.OPERATIONS.items()
+                    },
+                    **{name: list(fields) for name, fields in ENDPOINTS.items()},
+                },
+            )
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"{self.path} does not exist.")
+
+    def do_POST(self):
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+            if content_length < 0:
+                raise ValueError
+        except ValueError:
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+            return
+        data = self.rfile.read(content_length)
+
+        parts = self.path.strip("/").split("/")
+        is_batch = parts[1:] == ["batch"]
+        if len(parts) > 2 or (len(parts) == 2 and not is_batch):
+            self._send_error(HTTPStatus.NOT_FOUND, f"{self.path} does not exist.")
+            return
+
+        endpoint = parts[0]
+        try:
+            if endpoint not in ENDPOINTS:
+                operation.get_operation(endpoint)
+            body = json.loads(data or b"{}")
+            if not isinstance(body, dict):
+                raise TypeError("The request body must be a json object.")
+            parameters = _get_parameters(endpoint, body)
+            if is_batch:
+                messages = _get_strings(body, "messages")
+            else:
+                message = _get_string(body, "message")
+        except exception.OperationNotFoundError as ex:
+            self._send_error(HTTPStatus.NOT_FOUND, str(ex))
+            return
+        except KeyError as ex:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"Missing field {ex}.")
+            return
+        except (TypeError, ValueError, exception.LanguageCodeNotRecognizedError) as ex:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(ex))
+            return
+
+        try:
+            if is_batch:
+                batch_items = self.server.execute_batch(endpoint, messages, parameters)
+                self._send_json(
+                    HTTPStatus.OK,
+                    {"results": [_batch_item_to_json(item) for item in batch_items]},
+                )
+            else:
+                response = self.server.execute(endpoint, message, parameters)
+                self._send_json(HTTPStatus.OK, {"response": response})
+        except exception.CircuitOpenError as ex:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(ex))
+        except exception.OpenAIEmptyResponseError:
+            self._send_error(
+                HTTPStatus.BAD_GATEWAY, "OpenAI returned an empty response."
+            )
+        except exception.InvalidResponseError as ex:
+            self._send_error(HTTPStatus.BAD_GATEWAY, str(ex))
+        except resilience.PROVIDER_ERRORS as ex:
+            logger.warning(f"Request to openai failed: {ex!r}")
+            self._send_error(HTTPStatus.BAD_GATEWAY, str(ex))
+        except Exception as ex:
+            logger.exception(ex)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error.")
+
+
+def serve(host: str, port: int, client: WordGuru, max_concurrency: int = 16):
+    """
+    Serve requests until interrupted.
+    """
+    server = WordGuruHTTPServer((host, port), client, max_concurrency)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
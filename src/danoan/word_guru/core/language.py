@@ -0,0 +1,59 @@
+"""
+Resolution of ISO 639 language codes.
+
+Languages in common use are resolved with a precomputed table. Other
+ISO 639-3 codes fall back to pycountry, which is only imported when such
+a code is requested.
+"""
+
+from danoan.word_guru.core import exception
+from danoan.word_guru.core.language_table import ALPHA2_TO_ALPHA3, LANGUAGE_NAMES
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _get_pycountry_language_name(language_alpha3: str) -> str:
+    import pycountry
+
+    language = pycountry.languages.get(alpha_3=language_alpha3)
+    if not language:
+        raise exception.LanguageCodeNotRecognizedError(language_alpha3)
+    return language.name
+
+
+def get_alpha3(language_code: str) -> str:
+    """
+    Return the ISO 639-3 code of a language.
+
+    The language_code is either an ISO 639-3 code, e.g. `eng`, or an
+    ISO 639-1 code, e.g. `en`.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    code = language_code.strip().lower()
+    if len(code) == 2:
+        if code not in ALPHA2_TO_ALPHA3:
+            raise exception.LanguageCodeNotRecognizedError(language_code)
+        return ALPHA2_TO_ALPHA3[code]
+
+    if code not in LANGUAGE_NAMES:
+        _get_pycountry_language_name(code)
+    return code
+
+
+def get_language_name(language_code: str) -> str:
+    """
+    Return the English name of a language, e.g. `English` for `eng`.
+
+    The language_code is either an ISO 639-3 code or an ISO 639-1 code.
+
+    Raises:
+        LanguageCodeNotRecognizedError: If language code is not recognized.
+    """
+    language_alpha3 = get_alpha3(language_code)
+    if language_alpha3 in LANGUAGE_NAMES:
+        return LANGUAGE_NAMES[language_alpha3]
+
+    return _get_pycountry_language_name(language_alpha3)
@@ -0,0 +1,380 @@
+"""
+ISO 639 languages with an ISO 639-1 code.
+
+Generated by dev/generate-language-table/generate-language-table.py
+from pycountry 26.2.16. Do not edit by hand.
+"""
+
+LANGUAGE_NAMES = {
+    "aar": "Afar",
+    "abk": "Abkhazian",
+    "afr": "Afrikaans",
+    "aka": "Akan",
+    "amh": "Amharic",
+    "ara": "Arabic",
+    "arg": "Aragonese",
+    "asm": "Assamese",
+    "ava": "Avaric",
+    "ave": "Avestan",
+    "aym": "Aymara",
+    "aze": "Azerbaijani",
+    "bak": "Bashkir",
+    "bam": "Bambara",
+    "bel": "Belarusian",
+    "ben": "Bengali",
+    "bis": "Bislama",
+    "bod": "Tibetan",
+    "bos": "Bosnian",
+    "bre": "Breton",
+    "bul": "Bulgarian",
+    "cat": "Catalan",
+    "ces": "Czech",
+    "cha": "Chamorro",
+    "che": "Chechen",
+    "chu": "Church Slavic",
+    "chv": "Chuvash",
+    "cor": "Cornish",
+    "cos": "Corsican",
+    "cre": "Cree",
+    "cym": "Welsh",
+    "dan": "Danish",
+    "deu": "German",
+    "div": "Divehi",
+    "dzo": "Dzongkha",
+    "ell": "Modern Greek (1453-)",
+    "eng": "English",
+    "epo": "Esperanto",
+    "est": "Estonian",
+    "eus": "Basque",
+    "ewe": "Ewe",
+    "fao": "Faroese",
+    "fas": "Persian",
+    "fij": "Fijian",
+    "fin": "Finnish",
+    "fra": "French",
+    "fry": "Western Frisian",
+    "ful": "Fulah",
+    "gla": "Scottish Gaelic",
+    "gle": "Irish",
+    "glg": "Galician",
+    "glv": "Manx",
+    "grn": "Guarani",
+    "guj": "Gujarati",
+    "hat": "Haitian",
+    "hau": "Hausa",
+    "hbs": "Serbo-Croatian",
+    "heb": "Hebrew",
+    "her": "Herero",
+    "hin": "Hindi",
+    "hmo": "Hiri Motu",
+    "hrv": "Croatian",
+    "hun": "Hungarian",
+    "hye": "Armenian",
+    "ibo": "Igbo",
+    "ido": "Ido",
+    "iii": "Sichuan Yi",
+    "iku": "Inuktitut",
+    "ile": "Interlingue",
+    "ina": "Interlingua (International Auxiliary Language Association)",
+    "ind": "Indonesian",
+    "ipk": "Inupiaq",
+    "isl": "Icelandic",
+    "ita": "Italian",
+    "jav": "Javanese",
+    "jpn": "Japanese",
+    "kal": "Kalaallisut",
+    "kan": "Kannada",
+    "kas": "Kashmiri",
+    "kat": "Georgian",
+    "kau": "Kanuri",
+    "kaz": "Kazakh",
+    "khm": "Khmer",
+    "kik": "Kikuyu",
+    "kin": "Kinyarwanda",
+    "kir": "Kirghiz",
+    "kom": "Komi",
+    "kon": "Kongo",
+    "kor": "Korean",
+    "kua": "Kuanyama",
+    "kur": "Kurdish",
+    "lao": "Lao",
+    "lat": "Latin",
+    "lav": "Latvian",
+    "lim": "Limburgan",
+    "lin": "Lingala",
+    "lit": "Lithuanian",
+    "ltz": "Luxembourgish",
+    "lub": "Luba-Katanga",
+    "lug": "Ganda",
+    "mah": "Marshallese",
+    "mal": "Malayalam",
+    "mar": "Marathi",
+    "mkd": "Macedonian",
+    "mlg": "Malagasy",
+    "mlt": "Maltese",
+    "mon": "Mongolian",
+    "mri": "Maori",
+    "msa": "Malay (macrolanguage)",
+    "mya": "Burmese",
+    "nau": "Nauru",
+    "nav": "Navajo",
+    "nbl": "South Ndebele",
+    "nde": "North Ndebele",
+    "ndo": "Ndonga",
+    "nep": "Nepali (macrolanguage)",
+    "nld": "Dutch",
+    "nno": "Norwegian Nynorsk",
+    "nob": "Norwegian Bokmål",
+    "nor": "Norwegian",
+    "nya": "Chichewa",
+    "oci": "Occitan (post 1500)",
+    "oji": "Ojibwa",
+    "ori": "Oriya (macrolanguage)",
+    "orm": "Oromo",
+    "oss": "Ossetian",
+    "pan": "Panjabi",
+    "pli": "Pali",
+    "pol": "Polish",
+    "por": "Portuguese",
+    "pus": "Pushto",
+    "que": "Quechua",
+    "roh": "Romansh",
+    "ron": "Romanian",
+    "run": "Rundi",
+    "rus": "Russian",
+    "sag": "Sango",
+    "san": "Sanskrit",
+    "sin": "Sinhala",
+    "slk": "Slovak",
+    "slv": "Slovenian",
+    "sme": "Northern Sami",
+    "smo": "Samoan",
+    "sna": "Shona",
+    "snd": "Sindhi",
+    "som": "Somali",
+    "sot": "Southern Sotho",
+    "spa": "Spanish",
+    "sqi": "Albanian",
+    "srd": "Sardinian",
+    "srp": "Serbian",
+    "ssw": "Swati",
+    "sun": "Sundanese",
+    "swa": "Swahili (macrolanguage)",
+    "swe": "Swedish",
+    "tah": "Tahitian",
+    "tam": "Tamil",
+    "tat": "Tatar",
+    "tel": "Telugu",
+    "tgk": "Tajik",
+    "tgl": "Tagalog",
+    "tha": "Thai",
+    "tir": "Tigrinya",
+    "ton": "Tonga (Tonga Islands)",
+    "tsn": "Tswana",
+    "tso": "Tsonga",
+    "tuk": "Turkmen",
+    "tur": "Turkish",
+    "twi": "Twi",
+    "uig": "Uighur",
+    "ukr": "Ukrainian",
+    "urd": "Urdu",
+    "uzb": "Uzbek",
+    "ven": "Venda",
+    "vie": "Vietnamese",
+    "vol": "Volapük",
+    "wln": "Walloon",
+    "wol": "Wolof",
+    "xho": "Xhosa",
+    "yid": "Yiddish",
+    "yor": "Yoruba",
+    "zha": "Zhuang",
+    "zho": "Chinese",
+    "zul": "Zulu",
+}
+
+ALPHA2_TO_ALPHA3 = {
+    "aa": "aar",
+    "ab": "abk",
+    "ae": "ave",
+    "af": "afr",
+    "ak": "aka",
+    "am": "amh",
+    "an": "arg",
+    "ar": "ara",
+    "as": "asm",
+    "av": "ava",
+    "ay": "aym",
+    "az": "aze",
+    "ba": "bak",
+    "be": "bel",
+    "bg": "bul",
+    "bi": "bis",
+    "bm": "bam",
+    "bn": "ben",
+    "bo": "bod",
+    "br": "bre",
+    "bs": "bos",
+    "ca": "cat",
+    "ce": "che",
+    "ch": "cha",
+    "co": "cos",
+    "cr": "cre",
+    "cs": "ces",
+    "cu": "chu",
+    "cv": "chv",
+    "cy": "cym",
+    "da": "dan",
+    "de": "deu",
+    "dv": "div",
+    "dz": "dzo",
+    "ee": "ewe",
+    "el": "ell",
+    "en": "eng",
+    "eo": "epo",
+    "es": "spa",
+    "et": "est",
+    "eu": "eus",
+    "fa": "fas",
+    "ff": "ful",
+    "fi": "fin",
+    "fj": "fij",
+    "fo": "fao",
+    "fr": "fra",
+    "fy": "fry",
+    "ga": "gle",
+    "gd": "gla",
+    "gl": "glg",
+    "gn": "grn",
+    "gu": "guj",
+    "gv": "glv",
+    "ha": "hau",
+    "he": "heb",
+    "hi": "hin",
+    "ho": "hmo",
+    "hr": "hrv",
+    "ht": "hat",
+    "hu": "hun",
+    "hy": "hye",
+    "hz": "her",
+    "ia": "ina",
+    "id": "ind",
+    "ie": "ile",
+    "ig": "ibo",
+    "ii": "iii",
+    "ik": "ipk",
+    "io": "ido",
+    "is": "isl",
+    "it": "ita",
+    "iu": "iku",
+    "ja": "jpn",
+    "jv": "jav",
+    "ka": "kat",
+    "kg": "kon",
+    "ki": "kik",
+    "kj": "kua",
+    "kk": "kaz",
+    "kl": "kal",
+    "km": "khm",
+    "kn": "kan",
+    "ko": "kor",
+    "kr": "kau",
+    "ks": "kas",
+    "ku": "kur",
+    "kv": "kom",
+    "kw": "cor",
+    "ky": "kir",
+    "la": "lat",
+    "lb": "ltz",
+    "lg": "lug",
+    "li": "lim",
+    "ln": "lin",
+    "lo": "lao",
+    "lt": "lit",
+    "lu": "lub",
+    "lv": "lav",
+    "mg": "mlg",
+    "mh": "mah",
+    "mi": "mri",
+    "mk": "mkd",
+    "ml": "mal",
+    "mn": "mon",
+    "mr": "mar",
+    "ms": "msa",
+    "mt": "mlt",
+    "my": "mya",
+    "na": "nau",
+    "nb": "nob",
+    "nd": "nde",
+    "ne": "nep",
+    "ng": "ndo",
+    "nl": "nld",
+    "nn": "nno",
+    "no": "nor",
+    "nr": "nbl",
+    "nv": "nav",
+    "ny": "nya",
+    "oc": "oci",
+    "oj": "oji",
+    "om": "orm",
+    "or": "ori",
+    "os": "oss",
+    "pa": "pan",
+    "pi": "pli",
+    "pl": "pol",
+    "ps": "pus",
+    "pt": "por",
+    "qu": "que",
+    "rm": "roh",
+    "rn": "run",
+    "ro": "ron",
+    "ru": "rus",
+    "rw": "kin",
+    "sa": "san",
+    "sc": "srd",
+    "sd": "snd",
+    "se": "sme",
+    "sg": "sag",
+    "sh": "hbs",
+    "si": "sin",
+    "sk": "slk",
+    "sl": "slv",
+    "sm": "smo",
+    "sn": "sna",
+    "so": "som",
+    "sq": "sqi",
+    "sr": "srp",
+    "ss": "ssw",
+    "st": "sot",
+    "su": "sun",
+    "sv": "swe",
+    "sw": "swa",
+    "ta": "tam",
+    "te": "tel",
+    "tg": "tgk",
+    "th": "tha",
+    "ti": "tir",
+    "tk": "tuk",
+    "tl": "tgl",
+    "tn": "tsn",
+    "to": "ton",
+    "tr": "tur",
+    "ts": "tso",
+    "tt": "tat",
+    "tw": "twi",
+    "ty": "tah",
+    "ug": "uig",
+    "uk": "ukr",
+    "ur": "urd",
+    "uz": "uzb",
+    "ve": "ven",
+    "vi": "vie",
+    "vo": "vol",
+    "wa": "wln",
+    "wo": "wol",
+    "xh": "xho",
+    "yi": "yid",
+    "yo": "yor",
+    "za": "zha",
+    "zh": "zho",
+    "zu": "zul",
+}
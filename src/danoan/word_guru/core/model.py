@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class BatchItem:
+    """
+    Outcome of a single entry of a batch.
+
+    Exactly one of response or error is set.
+    """
+
+    input: Any
+    response: Optional[Any] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,98 @@
+"""
+Operations offered by word-guru.
+
+An operation binds a prompt to the names of its language variables and
+to the normalization applied to its messages before looking up the cache.
+"""
+
+from danoan.word_guru.core import exception, prompt_registry
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+
+def normalize_text(message: str) -> str:
+    """
+    Remove the leading and trailing whitespace of a text.
+    """
+    return message.strip()
+
+
+def normalize_expression(message: str) -> str:
+    """
+    Replace every sequence of whitespace of an expression by a single space.
+    """
+    return " ".join(message.split())
+
+
+def normalize_word(message: str) -> str:
+    """
+    Normalize the whitespace of a word or expression and ignore its casing.
+    """
+    return normalize_expression(message).casefold()
+
+
+@dataclass(frozen=True)
+class Operation:
+    name: str
+    prompt_filename: str
+    language_variables: Tuple[str, ...] = ("language",)
+    normalize: Callable[[str], str] = normalize_text
+
+
+OPERATIONS: Dict[str, Operation] = {
+    operation.name: operation
+    for operation in [
+        Operation("definition", "word-definition.toml", normalize=normalize_word),
+        Operation("synonym", "alternative-expression.toml", normalize=normalize_word),
+        Operation(
+            "reverse-definition",
+            "reverse-definition.toml",
+            normalize=normalize_expression,
+        ),
+        Operation("usage-examples", "usage-examples.toml", normalize=normalize_word),
+        Operation("pos-tag", "classify-pos.toml", normalize=normalize_word),
+        Operation(
+            "translation",
+            "translate.toml",
+            ("from_language", "to_language"),
+            normalize=normalize_expression,
+        ),
+        Operation("correction", "correct-text.toml"),
+        Operation("word-card", "word-card.toml", normalize=normalize_word),
+    ]
+}
+
+
+def get_operation(operation_name: str) -> Operation:
+    """
+    Return the operation with the given name.
+
+    Raises:
+        OperationNotFoundError: If there is no operation with this name.
+    """
+    if operation_name not in OPERATIONS:
+        raise exception.OperationNotFoundError(operation_name)
+    return OPERATIONS[operation_name]
+
+
+def get_operation_name(prompt_filename: str) -> str:
+    """
+    Return the name of the operation of a prompt.
+
+    A prompt that is not the one of an operation is named after its file.
+    """
+    for name, op in OPERATIONS.items():
+        if op.prompt_filename == prompt_filename:
+            return name
+    return prompt_filename
+
+
+def get_prompt_versions() -> Dict[str, str]:
+    """
+    Return the version of the prompt of every operation.
+    """
+    return {
+        name: prompt_registry.get_prompt_version(op.prompt_filename)
+        for name, op in OPERATIONS.items()
+    }
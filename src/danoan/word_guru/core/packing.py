@@ -0,0 +1,107 @@
+"""
+Packing of several entries in a single request.
+
+The few-shot system prompts are much longer than a single entry. In packed
+mode, the system prompt of an operation is followed by the packed.toml
+prompt, which asks for a json object mapping each entry of a json list to
+the answer it would have if sent alone.
+
+Packed answers are cached apart from the answers of single requests, under
+the packed name of their operation and a version covering both prompts.
+"""
+
+from danoan.word_guru.core import operation, prompt_registry, result
+
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, TypeVar
+
+PACKED_PROMPT_FILENAME = "packed.toml"
+DEFAULT_PACK_SIZE = 10
+
+T = TypeVar("T")
+
+
+def split(items: Iterable[T], pack_size: int) -> Iterator[List[T]]:
+    """
+    Split items in consecutive lists of at most pack_size items.
+
+    Raises:
+        ValueError: If pack_size is smaller than 1.
+    """
+    if pack_size < 1:
+        raise ValueError("pack_size must be at least 1.")
+
+    pack = []
+    for item in items:
+        pack.append(item)
+        if len(pack) == pack_size:
+            yield pack
+            pack = []
+    if pack:
+        yield pack
+
+
+def get_packed_name(operation_name: str) -> str:
+    """
+    Return the name under which packed answers of an operation are cached.
+    """
+    return f"{operation_name} (packed)"
+
+
+def get_prompt_version(prompt_filename: str) -> str:
+    """
+    Return the version of a prompt followed by the packed prompt.
+
+    Raises:
+        PromptNotFoundError: If the prompt does not exist.
+    """
+    return f"{prompt_registry.get_prompt_version(prompt_filename)}+{prompt_registry.get_prompt_version(PACKED_PROMPT_FILENAME)}"
+
+
+def get_prompt_versions() -> Dict[str, str]:
+    """
+    Return the version of the packed prompt of every operation, by packed name.
+    """
+    return {
+        get_packed_name(name): get_prompt_version(op.prompt_filename)
+        for name, op in operation.OPERATIONS.items()
+    }
+
+
+def pack(entries: List[str]) -> str:
+    """
+    Return the message of a packed request.
+    """
+    return json.dumps(entries, ensure_ascii=False)
+
+
+def unpack(
+    response: str, entries: List[str], normalize: Callable[[str], str]
+) -> Dict[str, str]:
+    """
+    Split the response of a packed request into the response of each entry.
+
+    Keys of the response are matched to the entries as given or, failing
+    that, after normalization. Values are returned with the format of the
+    response of a single entry: json values are serialized and strings are
+    kept as they are. Entries without a key or with an empty value are
+    missing from the result.
+    """
+    try:
+        answers = result.loads(response)
+    except ValueError:
+        return {}
+    if not isinstance(answers, dict):
+        return {}
+
+    normalized_answers = {normalize(key): value for key, value in answers.items()}
+    responses = {}
+    for entry in entries:
+        value = answers.get(entry, normalized_answers.get(normalize(entry)))
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            responses[entry] = value
+        else:
+            responses[entry] = json.dumps(value, ensure_ascii=False)
+    return responses
@@ -0,0 +1,116 @@
+"""
+Registry of the prompts shipped with word-guru.
+
+Prompt files are parsed and validated once, on first use, and the
+resulting PromptConfiguration objects are shared by every request. The
+toml parser and llm_assistant are only imported then, such that the
+command line starts without them.
+"""
+
+from danoan.word_guru.core import exception
+from danoan.word_guru import prompts
+
+from dataclasses import asdict
+from functools import lru_cache
+import hashlib
+import importlib.resources as pgk_resources
+import json
+import string
+from typing import TYPE_CHECKING, Dict, Set, Tuple
+
+if TYPE_CHECKING:
+    from danoan.llm_assistant.common.model import PromptConfiguration
+
+
+def _get_variables(template: str) -> Set[str]:
+    return {
+        field_name
+        for _, field_name, _, _ in string.Formatter().parse(template)
+        if field_name
+    }
+
+
+def _validate(prompt_filename: str, prompt_config: "PromptConfiguration"):
+    if "message" not in _get_variables(prompt_config.user_prompt):
+        raise exception.InvalidPromptError(
+            prompt_filename, "the user prompt must contain the {message} variable."
+        )
+    if "message" in _get_variables(prompt_config.system_prompt):
+        raise exception.InvalidPromptError(
+            prompt_filename, "the system prompt must not use the {message} variable."
+        )
+
+
+@lru_cache(maxsize=None)
+def _load_registry() -> Dict[str, "PromptConfiguration"]:
+    from danoan.llm_assistant.common.model import PromptConfiguration
+    import toml
+
+    registry = {}
+    for resource in pgk_resources.files(prompts).iterdir():
+        if not resource.name.endswith(".toml"):
+            continue
+        try:
+            prompt_config = PromptConfiguration(**toml.loads(resource.read_text()))
+        except TypeError as ex:
+            raise exception.InvalidPromptError(resource.name, str(ex))
+        _validate(resource.name, prompt_config)
+        registry[resource.name] = prompt_config
+    return registry
+
+
+def list_prompts() -> Tuple[str, ...]:
+    """
+    Return the filenames of the registered prompts.
+    """
+    return tuple(sorted(_load_registry()))
+
+
+def get_prompt(prompt_filename: str) -> "PromptConfiguration":
+    """
+    Return the parsed configuration of a prompt.
+
+    All prompts are loaded and validated at the first call.
+
+    Raises:
+        PromptNotFoundError: If the prompt does not exist.
+        InvalidPromptError: If a prompt file is malformed.
+    """
+    registry = _load_registry()
+    if prompt_filename not in registry:
+        raise exception.PromptNotFoundError(prompt_filename)
+    return registry[prompt_filename]
+
+
+@lru_cache(maxsize=None)
+def get_prompt_version(prompt_filename: str) -> str:
+    """
+    Return a hash of the content of a prompt.
+
+    The version changes whenever the name, the prompts or the model of the
+    prompt file are edited, and only then.
+
+    Raises:
+        PromptNotFoundError: If the prompt does not exist.
+    """
+    content = json.dumps(asdict(get_prompt(prompt_filename)), sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1024)
+def render_system_prompt(
+    prompt_filename: str, language_names: Tuple[Tuple[str, str], ...]
+) -> str:
+    """
+    Return the system prompt with its language variables replaced.
+
+    The system prompt only depends on the languages of the request, so
+    it is rendered once per combination of prompt and languages.
+
+    Args:
+        prompt_filename: The prompt to render.
+        language_names: Pairs of variable name and language name,
+                        e.g. (("language", "English"),).
+    """
+    prompt_config = get_prompt(prompt_filename)
+    return prompt_config.system_prompt.format(**dict(language_names))
@@ -0,0 +1,264 @@
+"""
+Client-side rate limiting of requests.
+
+RateLimiter spaces out the requests of a single batch. SharedRateLimiter
+keeps the requests and tokens per minute of every process of the machine
+under the limits of the openai account, using token buckets stored in a
+sqlite file.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_COMPLETION_TOKENS = 256
+
+
+class RateLimiter:
+    """
+    Space out requests such that at most requests_per_second are started
+    per second.
+
+    It is safe to share an instance among several threads.
+    """
+
+    def __init__(self, requests_per_second: float):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self._interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def _reserve(self) -> float:
+        """
+        Reserve the next free slot and return how long to wait for it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+
+        return slot - now
+
+    def acquire(self):
+        """
+        Block until the caller is allowed to start a new request.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self):
+        """
+        Wait, without blocking the event loop, until the caller is allowed
+        to start a new request.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_guru_rate_limit (
+    name TEXT PRIMARY KEY,
+    requests REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def get_default_path() -> Path:
+    """
+    Return the path of the file shared by the rate limiters of the machine.
+
+    It is a per-user file in the temporary directory.
+    """
+    return Path(tempfile.gettempdir()) / f"word-guru-{os.getuid()}-rate-limit.db"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text, about four characters per token.
+    """
+    return len(text) // 4 + 1
+
+
+class SharedRateLimiter:
+    """
+    Keep requests under requests_per_minute and tokens_per_minute across
+    every process using the same file and bucket name.
+
+    Each limit is a token bucket holding at most one minute of budget and
+    refilled continuously. Acquiring takes from the buckets even if they
+    run into debt, and the caller waits until the debt is paid back, such
+    that callers of every process are served in order of arrival and the
+    aggregate throughput stays just under the limits.
+
+    It is safe to share an instance among several threads.
+
+    Args:
+        path: The sqlite file holding the buckets.
+        requests_per_minute: If given, maximum number of requests per minute.
+        tokens_per_minute: If given, maximum number of tokens per minute.
+        name: Buckets of different names, e.g. of different openai
+              accounts, are independent.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        name: str = "default",
+    ):
+        for limit in (requests_per_minute, tokens_per_minute):
+            if limit is not None and limit <= 0:
+                raise ValueError("Rate limits must be positive.")
+        if requests_per_minute is None and tokens_per_minute is None:
+            raise ValueError("Give requests_per_minute or tokens_per_minute.")
+
+        self.path = Path(path)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.name = name
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def _update(self, requests: float, tokens: float) -> float:
+        """
+        Take requests and tokens from the buckets and return how long to
+        wait until they are not in debt anymore.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT requests, tokens, updated_at FROM word_guru_rate_limit WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                now = time.time()
+                if row is None:
+                    row = (
+                        self.requests_per_minute or 0.0,
+                        self.tokens_per_minute or 0.0,
+                        now,
+                    )
+                elapsed = max(now - row[2], 0.0)
+
+                delay = 0.0
+                balances = []
+                for balance, limit, amount in (
+                    (row[0], self.requests_per_minute, requests),
+                    (row[1], self.tokens_per_minute, tokens),
+                ):
+                    if limit is None:
+                        balances.append(balance)
+                        continue
+                    balance = min(limit, balance + elapsed * limit / 60)
+                    # A refund, i.e. a negative amount, cannot exceed capacity.
+                    balance = min(limit, balance - min(amount, limit))
+                    balances.append(balance)
+                    if balance < 0:
+                        delay = max(delay, -balance * 60 / limit)
+
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO word_guru_rate_limit VALUES (?, ?, ?, ?)",
+                    (self.name, *balances, now),
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        return delay
+
+    def acquire(self, tokens: int = 0):
+        """
+        Block until the caller is allowed to send a request of this number
+        of tokens.
+        """
+        delay = self._update(1, tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self, tokens: int = 0):
+        """
+        Wait, without blocking the event loop, until the caller is allowed
+        to send a request of this number of tokens.
+        """
+        delay = await asyncio.to_thread(self._update, 1, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def refund(self, tokens: int):
+        """
+        Give back tokens acquired in excess, e.g. once the actual usage of
+        a request is known. A negative number takes the missing tokens. The
+        bucket never holds more than tokens_per_minute.
+        """
+        if self.tokens_per_minute is not None and tokens:
+            self._update(0, -tokens)
+
+    async def async_refund(self, tokens: int):
+        """
+        Asynchronous counterpart of refund.
+        """
+        if self.tokens_per_minute is not None and tokens:
+            await asyncio.to_thread(self._update, 0, -tokens)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_shared_limits: Tuple[Optional[float], Optional[float], Optional[Path]] = (
+    None,
+    None,
+    None,
+)
+_shared_limiters: Dict[str, SharedRateLimiter] = {}
+
+
+def configure_shared_limits(
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    path: Optional[Path] = None,
+):
+    """
+    Set the limits of the rate limiters returned by get_shared_limiter.
+
+    If path is not given, the limiters use the file of get_default_path.
+    """
+    global _shared_limits
+    _shared_limits = (
+        requests_per_minute,
+        tokens_per_minute,
+        Path(path).expanduser() if path else None,
+    )
+    _shared_limiters.clear()
+
+
+def get_shared_limiter(name: str) -> Optional[SharedRateLimiter]:
+    """
+    Return the shared rate limiter of a bucket name, e.g. of an openai key.
+
+    Return None if no limit is configured, see configure_shared_limits.
+    """
+    requests_per_minute, tokens_per_minute, path = _shared_limits
+    if requests_per_minute is None and tokens_per_minute is None:
+        return None
+    if name not in _shared_limiters:
+        _shared_limiters[name] = SharedRateLimiter(
+            path or get_default_path(), requests_per_minute, tokens_per_minute, name
+        )
+    return _shared_limiters[name]
@@ -0,0 +1,363 @@
+"""
+Retries, timeouts, circuit breaking and hedging of requests to openai.
+
+A request failing with a transient error, i.e. a timeout, a connection
+error, a rate limit (429) or a server error (5xx), is attempted again after
+an exponential backoff with full jitter. The delay asked by the Retry-After
+header of a response is honored instead, unless it exceeds the maximum
+backoff, in which case the error is raised right away.
+
+Consecutive timeouts, connection and server errors open a circuit breaker,
+such that requests fail fast with CircuitOpenError instead of piling up on
+a failing provider. After reset_timeout seconds, a single trial request is
+let through and the circuit closes again if it succeeds.
+
+A hedged request sends a second identical request if the first one did not
+answer after hedge_after seconds, and returns the first answer of either.
+
+The timeout of an attempt and the cancellation of the losing request of a
+hedged call are only enforced by async_call. A thread cannot be
+interrupted, so call relies on the timeout of the http client and lets the
+losing request run to completion in the background.
+"""
+
+from danoan.word_guru.core import exception
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Errors of the provider, as opposed to errors of the caller or of word-guru.
+PROVIDER_ERRORS = (openai.APIError, TimeoutError, asyncio.TimeoutError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Resilience settings of the requests to openai.
+
+    Args:
+        max_attempts: Maximum number of attempts of a request.
+        timeout: If given, maximum number of seconds of each attempt.
+                 Enforced by async_call only, call relies on the timeout
+                 of the http client.
+        backoff_base: Upper bound of the delay before the first retry. It
+                      doubles at each retry.
+        backoff_max: Maximum delay between two attempts.
+        hedge_after: If given, seconds after which a second identical
+                     request is sent if the first one did not answer.
+        failure_threshold: Number of consecutive timeouts, connection and
+                           server errors that open the circuit breaker.
+        reset_timeout: Seconds during which an open circuit breaker rejects
+                       requests.
+    """
+
+    max_attempts: int = 3
+    timeout: Optional[float] = None
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    hedge_after: Optional[float] = None
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if self.failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Return true if a request failing with this error may succeed if attempted again.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def is_outage(error: BaseException) -> bool:
+    """
+    Return true if this error means that the provider is failing.
+
+    Rate limits are retryable but do not count as failures of the provider,
+    since it answered with the delay to wait.
+    """
+    if isinstance(error, openai.RateLimitError):
+        return False
+    return is_retryable(error)
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Return the seconds to wait asked by the response of a failed request, if any.
+
+    The retry-after-ms and retry-after headers are read. The latter is
+    either a number of seconds or an HTTP date.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return max(float(headers["retry-after-ms"]) / 1000, 0.0)
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            date = parsedate_to_datetime(retry_after)
+            return max(date.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_backoff_delay(
+    policy: RetryPolicy, attempt: int, error: BaseException
+) -> Optional[float]:
+    """
+    Return the seconds to wait before attempting a request again.
+
+    The attempt number starts at zero. None means that the request should
+    not be attempted again because the server asks to wait longer than
+    backoff_max.
+    """
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        return retry_after if retry_after <= policy.backoff_max else None
+    return random.uniform(
+        0, min(policy.backoff_max, policy.backoff_base * 2**attempt)
+    )
+
+
+class CircuitBreaker:
+    """
+    Reject requests after failure_threshold consecutive failures of the provider.
+
+    It is safe to share an instance among several threads and coroutines.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if the request must not be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise exception.CircuitOpenError(max(remaining, 0.0))
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """
+        Let another trial request through after one that ended without an
+        answer of the provider, e.g. because of an error of the caller.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"Circuit opened after {self._failures} consecutive failures."
+                    )
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+def _hedged_call(fn: Callable[[], T], hedge_after: float) -> T:
+    """
+    Return the first answer of fn and of a second call of fn started after
+    hedge_after seconds. The losing call cannot be interrupted and runs to
+    completion in the background.
+    """
+    executor = ThreadPoolExecutor(2)
+    try:
+        futures = [executor.submit(fn)]
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            logger.debug(f"No response after {hedge_after}s, hedge the request.")
+            futures.append(executor.submit(fn))
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return futures[0].result()
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def _async_hedged_call(fn: Callable[[], Awaitable[T]], hedge_after: float) -> T:
+    tasks = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            logger.debug(f"No response after {hedge_after}s, hedge the request.")
+            tasks.append(asyncio.ensure_future(fn()))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        return tasks[0].result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _on_failure(
+    policy: RetryPolicy,
+    attempt: int,
+    error: Exception,
+    circuit_breaker: Optional[CircuitBreaker],
+) -> float:
+    """
+    Return the delay before the next attempt or raise the error if there
+    is no next attempt.
+    """
+    if circuit_breaker:
+        if is_outage(error):
+            circuit_breaker.record_failure()
+        elif isinstance(error, openai.APIStatusError):
+            # The provider answered, it is not the one failing.
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.release_trial()
+
+    if not is_retryable(error):
+        raise error
+    if attempt + 1 >= policy.max_attempts:
+        raise error
+
+    delay = get_backoff_delay(policy, attempt, error)
+    if delay is None:
+        raise error
+
+    logger.warning(f"Request failed ({error!r}), attempt again in {delay:.2f}s.")
+    return delay
+
+
+def call(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+) -> T:
+    """
+    Call fn applying the retry policy.
+
+    The timeout of each attempt is not enforced here, since a thread cannot
+    be interrupted. It is expected to be the timeout of the http client.
+    For the same reason, the losing request of a hedged call is not
+    cancelled.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker rejects the request.
+        Exception: The error of the last attempt.
+    """
+    attempt = 0
+    while True:
+        if circuit_breaker:
+            circuit_breaker.before_call()
+        try:
+            if policy.hedge_after is not None:
+                result = _hedged_call(fn, policy.hedge_after)
+            else:
+                result = fn()
+        except Exception as ex:
+            delay = _on_failure(policy, attempt, ex, circuit_breaker)
+            time.sleep(delay)
+            attempt += 1
+        else:
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            return result
+
+
+async def async_call(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+) -> T:
+    """
+    Asynchronous counterpart of call.
+
+    Each attempt is cancelled after policy.timeout seconds, and the losing
+    request of a hedged call as soon as the other one answers.
+    """
+
+    def attempt_once() -> Awaitable[T]:
+        return asyncio.wait_for(fn(), policy.timeout)
+
+    attempt = 0
+    while True:
+        if circuit_breaker:
+            circuit_breaker.before_call()
+        try:
+            if policy.hedge_after is not None:
+                result = await _async_hedged_call(attempt_once, policy.hedge_after)
+            else:
+                result = await attempt_once()
+        except Exception as ex:
+            delay = _on_failure(policy, attempt, ex, circuit_breaker)
+            await asyncio.sleep(delay)
+            attempt += 1
+        else:
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            return result
@@ -0,0 +1,214 @@
+"""
+Typed results of the operations.
+
+Responses are parsed with json.loads first. If a response is not valid
+json, common defects are repaired: markdown code fences, text around the
+json value and trailing commas. Responses that cannot be repaired locally
+are sent once to the repair-json prompt, which only holds the broken
+response, instead of running the operation again.
+
+Parsed results are memoized, such that the same response is parsed only
+once even if several callers ask for its result. They are therefore
+immutable all the way down: json lists become tuples and json objects
+become read-only mappings.
+"""
+
+from danoan.word_guru.core import exception, word_card
+
+from dataclasses import dataclass, fields
+from functools import lru_cache
+import json
+import re
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Tuple, Type, Union
+
+REPAIR_PROMPT_FILENAME = "repair-json.toml"
+
+_CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*\n(.*?)\n\s*```\s*$", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[\]}])")
+
+
+def _repair(response: str) -> str:
+    match = _CODE_FENCE.match(response)
+    if match:
+        response = match.group(1)
+
+    starts = [i for i in (response.find("["), response.find("{")) if i >= 0]
+    if starts:
+        start = min(starts)
+        end = response.rfind("]" if response[start] == "[" else "}")
+        if end > start:
+            response = response[start : end + 1]
+
+    return _TRAILING_COMMA.sub(r"\1", response)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def loads(response: str) -> Any:
+    """
+    Parse a json response, repairing it if it is not valid json.
+
+    Raises:
+        ValueError: If the response is not valid json, even once repaired.
+    """
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        pass
+    return json.loads(_repair(response))
+
+
+@dataclass(frozen=True)
+class ListResult:
+    """
+    Result made of a list of strings.
+    """
+
+    items: Tuple[str, ...]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @classmethod
+    def from_json(cls, value: Any) -> "ListResult":
+        if not isinstance(value, list):
+            raise ValueError("The response is not a json list.")
+        if not all(isinstance(item, str) for item in value):
+            raise ValueError("The response is not a json list of strings.")
+        return cls(tuple(value))
+
+    def to_json_value(self) -> Any:
+        return list(self.items)
+
+
+class Definition(ListResult):
+    """
+    The definitions of a word.
+    """
+
+
+class SynonymList(ListResult):
+    """
+    The synonyms of a word.
+    """
+
+
+class ReverseDefinition(ListResult):
+    """
+    The words matching a definition.
+    """
+
+
+class UsageExamples(ListResult):
+    """
+    Sentences using a word.
+    """
+
+
+class PosTags(ListResult):
+    """
+    The part-of-speech tags of a word.
+    """
+
+
+class Translation(ListResult):
+    """
+    The translations of a word or expression.
+    """
+
+
+@dataclass(frozen=True)
+class Correction:
+    """
+    The corrections of a text by category.
+
+    Each correction is a mapping with the original and corrected text
+    segments and an explanation.
+    """
+
+    categories: Mapping[str, Tuple[Mapping[str, Any], ...]]
+
+    @classmethod
+    def from_json(cls, value: Any) -> "Correction":
+        if not isinstance(value, dict):
+            raise ValueError("The response is not a json object.")
+        for category, corrections in value.items():
+            if not isinstance(corrections, list):
+                raise ValueError(f"The corrections of {category} are not a list.")
+        return cls(_freeze(value))
+
+    def to_json_value(self) -> Any:
+        return _thaw(self.categories)
+
+
+@dataclass(frozen=True)
+class WordCard:
+    """
+    The definitions, synonyms, part-of-speech tags and usage examples of a word.
+    """
+
+    definitions: Tuple[str, ...]
+    synonyms: Tuple[str, ...]
+    pos_tags: Tuple[str, ...]
+    usage_examples: Tuple[str, ...]
+
+    @classmethod
+    def from_json(cls, value: Any) -> "WordCard":
+        card = word_card.validate(value)
+        return cls(*(_freeze(card[field.name]) for field in fields(cls)))
+
+    def to_json_value(self) -> Any:
+        return {field.name: _thaw(getattr(self, field.name)) for field in fields(self)}
+
+
+Result = Union[ListResult, Correction, WordCard]
+
+# Result type of every operation
+RESULT_TYPES: Dict[str, Type] = {
+    "definition": Definition,
+    "synonym": SynonymList,
+    "reverse-definition": ReverseDefinition,
+    "usage-examples": UsageExamples,
+    "pos-tag": PosTags,
+    "translation": Translation,
+    "correction": Correction,
+    "word-card": WordCard,
+}
+
+
+@lru_cache(maxsize=4096)
+def parse(operation_name: str, response: str) -> Result:
+    """
+    Parse the response of an operation into its typed result.
+
+    Results of the same response are the same object.
+
+    Raises:
+        OperationNotFoundError: If there is no operation with this name.
+        InvalidResponseError: If the response is not valid, even once repaired.
+    """
+    if operation_name not in RESULT_TYPES:
+        raise exception.OperationNotFoundError(operation_name)
+
+    try:
+        return RESULT_TYPES[operation_name].from_json(loads(response))
+    except ValueError as ex:
+        raise exception.InvalidResponseError(operation_name, str(ex)) from ex
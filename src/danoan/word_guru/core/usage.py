@@ -0,0 +1,237 @@
+"""
+Token usage of the requests to openai.
+
+The prompt and completion tokens of every request are read from the usage
+reported by openai or, when it is missing, e.g. for streamed responses,
+estimated from the length of the prompt and of the response. Tokens are
+aggregated per operation, languages and model in a sqlite file, such that
+the usage of every process writing to the file is reported together.
+
+Usage is accumulated in memory and written at most once per second and
+when the process exits.
+"""
+
+from danoan.word_guru.core import rate_limit
+
+import asyncio
+import atexit
+from dataclasses import dataclass, field
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+_FLUSH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_guru_usage (
+    operation TEXT NOT NULL,
+    languages TEXT NOT NULL,
+    model TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    estimated_calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    PRIMARY KEY (operation, languages, model)
+);
+CREATE TABLE IF NOT EXISTS word_guru_usage_counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO word_guru_usage VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (operation, languages, model) DO UPDATE SET
+        calls = calls + excluded.calls,
+        estimated_calls = estimated_calls + excluded.estimated_calls,
+        prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+        completion_tokens = completion_tokens + excluded.completion_tokens
+"""
+
+
+@dataclass(frozen=True)
+class UsageKey:
+    operation: str
+    languages: Tuple[str, ...]
+    model: str
+
+
+@dataclass
+class Usage:
+    """
+    Tokens consumed by a number of calls.
+
+    estimated_calls is the number of calls whose tokens are estimated
+    because openai did not report them.
+    """
+
+    calls: int = 0
+    estimated_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "Usage"):
+        self.calls += other.calls
+        self.estimated_calls += other.estimated_calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+
+
+@dataclass
+class UsageReport:
+    usage: Dict[UsageKey, Usage] = field(default_factory=dict)
+    since: Optional[float] = None
+
+    @property
+    def total(self) -> Usage:
+        total = Usage()
+        for usage in self.usage.values():
+            total.add(usage)
+        return total
+
+
+def get_reported_usage(response) -> Optional[Usage]:
+    """
+    Return the usage of a call reported in its response, if any.
+    """
+    usage_metadata = getattr(response, "usage_metadata", None)
+    if not usage_metadata or "input_tokens" not in usage_metadata:
+        return None
+    return Usage(
+        calls=1,
+        prompt_tokens=usage_metadata["input_tokens"],
+        completion_tokens=usage_metadata.get("output_tokens", 0),
+    )
+
+
+def estimate_usage(prompt_text: str, completion_text: str) -> Usage:
+    """
+    Return the estimated usage of a call from the text of its prompt and
+    of its response.
+    """
+    return Usage(
+        calls=1,
+        estimated_calls=1,
+        prompt_tokens=rate_limit.estimate_tokens(prompt_text),
+        completion_tokens=rate_limit.estimate_tokens(completion_text),
+    )
+
+
+class UsageLog:
+    """
+    Token usage per operation, languages and model stored in a sqlite file.
+
+    The file can be shared with a ResultCache. It is safe to share an
+    instance among several threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute(
+            "INSERT OR IGNORE INTO word_guru_usage_counters VALUES ('since', ?)",
+            (time.time(),),
+        )
+
+        self._closed = False
+        self._pending: Dict[UsageKey, Usage] = {}
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def record(self, key: UsageKey, usage: Usage):
+        """
+        Add the usage of calls of an operation.
+        """
+        with self._lock:
+            self._pending.setdefault(key, Usage()).add(usage)
+            if time.monotonic() - self._last_flush >= _FLUSH_INTERVAL:
+                self._flush()
+
+    async def async_record(self, key: UsageKey, usage: Usage):
+        """
+        Asynchronous counterpart of record, running in a worker thread
+        since it may write to the file.
+        """
+        await asyncio.to_thread(self.record, key, usage)
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if self._closed or not self._pending:
+            return
+
+        self._connection.execute("BEGIN")
+        self._connection.executemany(
+            _UPSERT,
+            [
+                (
+                    key.operation,
+                    ",".join(key.languages),
+                    key.model,
+                    usage.calls,
+                    usage.estimated_calls,
+                    usage.prompt_tokens,
+                    usage.completion_tokens,
+                )
+                for key, usage in self._pending.items()
+            ],
+        )
+        self._connection.execute("COMMIT")
+        self._pending.clear()
+
+    def flush(self):
+        """
+        Write the usage recorded since the last write to the file.
+        """
+        with self._lock:
+            self._flush()
+
+    def reset(self):
+        """
+        Remove the usage recorded in the file.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._connection.execute("DELETE FROM word_guru_usage")
+            self._connection.execute("DELETE FROM word_guru_usage_counters")
+            self._connection.execute(
+                "INSERT INTO word_guru_usage_counters VALUES ('since', ?)",
+                (time.time(),),
+            )
+
+    def report(self) -> UsageReport:
+        """
+        Return the usage recorded in the file by every process.
+        """
+        self.flush()
+        with self._lock:
+            report = UsageReport()
+            for row in self._connection.execute(
+                "SELECT * FROM word_guru_usage ORDER BY operation, languages, model"
+            ):
+                operation, languages, model = row[:3]
+                key = UsageKey(
+                    operation, tuple(languages.split(",")) if languages else (), model
+                )
+                report.usage[key] = Usage(*row[3:])
+
+            report.since = self._connection.execute(
+                "SELECT value FROM word_guru_usage_counters WHERE name = 'since'"
+            ).fetchone()[0]
+            return report
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._closed = True
+            self._connection.close()
@@ -0,0 +1,46 @@
+"""
+Word card: the definitions, synonyms, part-of-speech tags and usage
+examples of a word.
+
+A word card is produced by the word-card operation in a single request or,
+as a fallback, assembled from the responses of the individual operations.
+"""
+
+import json
+from typing import Any, Dict
+
+# Field of the word card and the operation producing it
+FIELDS: Dict[str, str] = {
+    "definitions": "definition",
+    "synonyms": "synonym",
+    "pos_tags": "pos-tag",
+    "usage_examples": "usage-examples",
+}
+
+
+def validate(card: Any) -> Dict[str, Any]:
+    """
+    Return the fields of a parsed word card.
+
+    Raises:
+        ValueError: If the card is not a dictionary with a list for every
+                    field of the word card.
+    """
+    if not isinstance(card, dict):
+        raise ValueError("The word card is not a json object.")
+
+    for field in FIELDS:
+        if not isinstance(card.get(field), list):
+            raise ValueError(f"The word card has no {field} list.")
+    return {field: card[field] for field in FIELDS}
+
+
+def parse_field(response: str) -> Any:
+    """
+    Parse the response of an individual operation. Return the raw string
+    if it is not valid json.
+    """
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        return response
@@ -1,2 +1,77 @@
+from danoan.word_guru.core import api
+from danoan.word_guru.core.client import WordGuru
+
+import asyncio
+import pytest
+import threading
+import time
+
+
 def pytest_addoption(parser):
     parser.addoption("--openai-key", action="store")
+
+
+class FakeResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChain:
+    """
+    Replace the prompt | llm chain of a WordGuru client.
+
+    The response echoes the message as a json list. An empty message
+    produces an empty response. Streams yield the response in chunks of
+    four characters.
+    """
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _start(self, prompt_data):
+        with self._lock:
+            self.calls.append(prompt_data)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _end(self, prompt_data):
+        with self._lock:
+            self.in_flight -= 1
+        if prompt_data["message"] == "":
+            return None
+        return FakeResponse(f'["{prompt_data["message"]}"]')
+
+    def invoke(self, prompt_data):
+        self._start(prompt_data)
+        time.sleep(self.delay)
+        return self._end(prompt_data)
+
+    async def ainvoke(self, prompt_data):
+        self._start(prompt_data)
+        await asyncio.sleep(self.delay)
+        return self._end(prompt_data)
+
+    def stream(self, prompt_data):
+        response = self.invoke(prompt_data)
+        if response:
+            for i in range(0, len(response.content), 4):
+                yield FakeResponse(response.content[i : i + 4])
+
+    async def astream(self, prompt_data):
+        response = await self.ainvoke(prompt_data)
+        if response:
+            for i in range(0, len(response.content), 4):
+                yield FakeResponse(response.content[i : i + 4])
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    chain = FakeChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    api._get_default_client.cache_clear()
+    yield chain
+    api._get_default_client.cache_clear()
@@ -1,6 +1,221 @@
 from danoan.word_guru.cli import cli
+from danoan.word_guru.core import api, cache, daemon, operation
+from danoan.word_guru.core.cache import CacheKey, ResultCache
+from danoan.word_guru.core.model import BatchItem
+
+import json
+import pytest
 
 
 def test_cli():
     parser = cli.extend_parser()
     assert parser
+
+
+def test_cli_batch_file(monkeypatch, tmp_path, capsys):
+    batch_file = tmp_path / "words.txt"
+    batch_file.write_text("happiness\n\nlove\n")
+    monkeypatch.setattr(
+        api,
+        "get_definition_batch",
+        lambda openai_key, cache_path, words, language, *args: [
+            BatchItem("happiness", '["happiness"]'),
+            BatchItem("love", error=ValueError("failed")),
+        ],
+    )
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["dictionary", "get-definition", "--batch-file", str(batch_file), "eng"]
+    )
+    assert args.word is None
+    args.func(**vars(args))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"input": "happiness", "response": ["happiness"]},
+        {"input": "love", "error": "failed"},
+    ]
+
+
+def test_cli_forwards_to_daemon(monkeypatch, capsys):
+    requests = []
+
+    def fake_request(socket_path, openai_key, cache_path, *args):
+        requests.append(args)
+        return '["happiness"]'
+
+    monkeypatch.setattr(daemon, "request", fake_request)
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(["dictionary", "get-definition", "happiness", "eng"])
+    args.func(**vars(args))
+
+    assert capsys.readouterr().out == '["happiness"]\n'
+    assert requests == [("definition", "happiness", "eng")]
+
+
+def test_cli_cache_prune(tmp_path, capsys):
+    cache_path = tmp_path / "cache.db"
+    result_cache = ResultCache(cache_path)
+    result_cache.put(
+        CacheKey("definition", "love", ("eng",), "old", "gpt-4o-mini"), '["love"]'
+    )
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(["--cache-path", str(cache_path), "cache", "prune"])
+    args.func(**vars(args))
+
+    assert capsys.readouterr().out.startswith("Removed 1 entries. 0 entries left.")
+
+
+def test_cli_cache_prune_removes_expired_entries(tmp_path, monkeypatch, capsys):
+    cache_path = tmp_path / "cache.db"
+    key = CacheKey(
+        "definition",
+        "love",
+        ("eng",),
+        operation.get_prompt_versions()["definition"],
+        "gpt-4o-mini",
+    )
+    with monkeypatch.context() as patch:
+        patch.setattr(cache.time, "time", lambda: 0.0)
+        ResultCache(cache_path).put(key, '["love"]')
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(["--cache-path", str(cache_path), "cache", "prune"])
+    args.func(**vars(args), cache_ttl=60)
+
+    assert capsys.readouterr().out.startswith("Removed 1 entries. 0 entries left.")
+
+
+def test_cli_cache_warm_export_and_import(fake_chain, tmp_path, capsys):
+    cache_path = tmp_path / "cache.db"
+    word_list = tmp_path / "words.txt"
+    word_list.write_text("the\t100\nof\t50\nhappiness\t2\n")
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["--cache-path", str(cache_path), "cache", "warm", str(word_list)]
+        + ["eng", "fra", "--top", "2", "--operations", "definition", "synonym"]
+    )
+    args.func(**vars(args))
+    assert capsys.readouterr().out.splitlines() == [
+        "definition eng: 2 cached, 0 failed.",
+        "definition fra: 2 cached, 0 failed.",
+        "synonym eng: 2 cached, 0 failed.",
+        "synonym fra: 2 cached, 0 failed.",
+    ]
+    assert len(fake_chain.calls) == 8
+
+    export_file = tmp_path / "cache.jsonl"
+    args = parser.parse_args(
+        ["--cache-path", str(cache_path), "cache", "export", "--output"]
+        + [str(export_file)]
+    )
+    args.func(**vars(args))
+    assert len(export_file.read_text().splitlines()) == 8
+
+    other_cache_path = tmp_path / "other.db"
+    args = parser.parse_args(
+        ["--cache-path", str(other_cache_path), "cache", "import", str(export_file)]
+    )
+    args.func(**vars(args))
+    assert capsys.readouterr().out == "Imported 8 entries.\n"
+    assert len(ResultCache(other_cache_path)) == 8
+
+
+def test_cli_cache_stats(tmp_path, capsys):
+    cache_path = tmp_path / "cache.db"
+    result_cache = ResultCache(cache_path)
+    key = CacheKey("definition", "love", ("eng",), "version", "gpt-4o-mini")
+    result_cache.put(key, '["love"]')
+    result_cache.get(key)
+    result_cache.close()
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(["--cache-path", str(cache_path), "cache", "stats"])
+    args.func(**vars(args))
+
+    output = capsys.readouterr().out
+    assert "Hit ratio: 100.0% (1 hits, 0 misses" in output
+    assert "definition" in output and "eng" in output
+    assert "1  definition eng: love" in output
+
+
+def test_cli_correct_text_stream(fake_chain, monkeypatch, capsys):
+    monkeypatch.setattr(
+        daemon, "request", lambda *args: pytest.fail("The daemon must not be used.")
+    )
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["copywriter", "correct-text", "--stream", "I has a dog", "eng"]
+    )
+    args.func(**vars(args))
+
+    assert capsys.readouterr().out == '["I has a dog"]\n'
+
+
+def test_cli_correct_text_file(monkeypatch, tmp_path, capsys):
+    calls = []
+
+    def get_document_correction(openai_key, cache_path, text, *args):
+        calls.append((text, *args))
+        return "{}"
+
+    monkeypatch.setattr(api, "get_document_correction", get_document_correction)
+    document_path = tmp_path / "document.txt"
+    document_path.write_text("First.\n\nSecond.")
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["copywriter", "correct-text", "--file", str(document_path), "eng"]
+    )
+    args.func(**vars(args))
+
+    assert capsys.readouterr().out == "{}\n"
+    assert calls == [("First.\n\nSecond.", "eng", 2000, 4)]
+
+
+def test_cli_correct_text_file_error(fake_chain, tmp_path, capsys, caplog):
+    document_path = tmp_path / "document.txt"
+    document_path.write_text("First.\n\nSecond.")
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["copywriter", "correct-text", "--file", str(document_path), "eng"]
+    )
+    args.func(**vars(args))
+
+    assert capsys.readouterr().out == ""
+    assert "Could not correct the text: The correction is not a json object" in (
+        caplog.text
+    )
+
+
+def test_cli_translate_to_several_languages(fake_chain, capsys):
+    parser = cli.extend_parser()
+    args = parser.parse_args(["translate", "pareil", "fra", "eng", "ita"])
+    args.func(**vars(args))
+
+    output = json.loads(capsys.readouterr().out)
+    assert output == {"eng": ["pareil"], "ita": ["pareil"]}
+    assert len(fake_chain.calls) == 2
+
+
+def test_cli_stats(fake_chain, tmp_path, capsys):
+    cache_path = str(tmp_path / "cache.db")
+    api.get_definition("key", cache_path, "love", "eng")
+    api.get_client("key", cache_path).usage_log.flush()
+
+    parser = cli.extend_parser()
+    args = parser.parse_args(
+        ["--cache-path", cache_path, "stats", "--calls", "100", "--prompts"]
+    )
+    args.func(**vars(args), tokens_per_minute=1000)
+
+    output = capsys.readouterr().out
+    assert "definition" in output and "eng" in output
+    assert "Projection for 100 calls" in output and " min" in output
+    assert "Prompt sizes" in output
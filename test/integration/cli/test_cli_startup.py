@@ -0,0 +1,80 @@
+"""
+Regression tests of the startup time of the word-guru command line.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Optional
+
+import pytest
+
+# Modules that are only needed once a command sends a request.
+HEAVY_MODULES = [
+    "danoan.word_guru.core.client",
+    "danoan.llm_assistant",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "pycountry",
+    "toml",
+]
+
+# Cumulative import time of the cli module. Importing the heavy modules
+# takes well above one second.
+STARTUP_BUDGET_SECONDS = 0.5
+
+STARTUP_SCRIPT = "from danoan.word_guru.cli import cli; cli.extend_parser()"
+
+# Run the command line without arguments, such that it prints its help.
+MAIN_SCRIPT = "import sys; sys.argv = ['word-guru']; from danoan.word_guru.cli import cli; cli.main()"
+
+
+def _get_import_times(script: str, cwd: Optional[str] = None) -> Dict[str, float]:
+    """
+    Return the cumulative import time in seconds of every module imported
+    by the script, as reported by python -X importtime.
+    """
+    env = dict(os.environ)
+    env.pop("WORD_GURU_CONFIGURATION_FOLDER", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+        env=env,
+    )
+
+    import_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module_name = line.split("|")
+        import_times[module_name.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
+@pytest.fixture(scope="module")
+def import_times():
+    return _get_import_times(STARTUP_SCRIPT)
+
+
+@pytest.fixture(scope="module")
+def main_import_times(tmp_path_factory):
+    # Without a configuration file in the working directory or its parents.
+    return _get_import_times(MAIN_SCRIPT, str(tmp_path_factory.mktemp("main")))
+
+
+@pytest.mark.parametrize("module_name", HEAVY_MODULES)
+def test_heavy_modules_are_not_imported(import_times, module_name):
+    assert module_name not in import_times
+
+
+@pytest.mark.parametrize("module_name", HEAVY_MODULES)
+def test_heavy_modules_are_not_imported_by_main(main_import_times, module_name):
+    assert module_name not in main_import_times
+
+
+def test_startup_time_budget(import_times):
+    assert import_times["danoan.word_guru.cli.cli"] < STARTUP_BUDGET_SECONDS
@@ -78,3 +78,18 @@ def test_get_usage_examples(openai_key, word, language):
     assert response
     obj = json.loads(response)
     assert len(obj) > 0
+
+
+@pytest.mark.api
+@pytest.mark.parametrize(
+    "word,language",
+    [
+        ("happiness", "eng"),
+        ("manteau", "fra"),
+    ],
+)
+def test_get_word_card(openai_key, word, language):
+    response = api.get_word_card(openai_key, None, word, language)
+    obj = json.loads(response)
+    assert set(obj) == {"definitions", "synonyms", "pos_tags", "usage_examples"}
+    assert len(obj["definitions"]) > 0
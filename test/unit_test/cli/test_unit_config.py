@@ -0,0 +1,56 @@
+from danoan.word_guru.cli import cli, config
+from danoan.word_guru.core import api
+from danoan.word_guru.core.resilience import RetryPolicy
+
+import pytest
+
+CONFIGURATION = """
+openai_key = "key"
+cache_path = "word-guru.cache.db"
+cache_max_entries = 1000
+cache_ttl = 86400
+cache_memory_max_entries = 100
+cache_memory_max_bytes = 1048576
+
+[retry_policy]
+max_attempts = 5
+timeout = 10
+hedge_after = 2
+"""
+
+
+@pytest.fixture
+def configuration(tmp_path, monkeypatch):
+    (tmp_path / config.WORD_GURU_CONFIGURATION_FILENAME).write_text(CONFIGURATION)
+    monkeypatch.chdir(tmp_path)
+    yield config.get_configuration()
+    api.configure_default_clients()
+
+
+def test_client_options_are_read(configuration):
+    assert configuration.cache_max_entries == 1000
+    assert configuration.cache_ttl == 86400
+    assert configuration.cache_memory_max_entries == 100
+    assert configuration.cache_memory_max_bytes == 1048576
+    assert configuration.retry_policy == {
+        "max_attempts": 5,
+        "timeout": 10,
+        "hedge_after": 2,
+    }
+
+
+def test_client_options_are_passed_to_default_clients(configuration, tmp_path):
+    cli.configure_clients(configuration.__dict__)
+    client = api.get_client("key", tmp_path / configuration.cache_path)
+
+    assert client.retry_policy == RetryPolicy(max_attempts=5, timeout=10, hedge_after=2)
+    assert (client.cache.max_entries, client.cache.ttl) == (1000, 86400)
+    assert (client.cache.memory.max_entries, client.cache.memory.max_bytes) == (
+        100,
+        1048576,
+    )
+
+
+def test_unknown_retry_policy_fields_are_rejected():
+    with pytest.raises(TypeError):
+        cli.configure_clients({"retry_policy": {"attempts": 5}})
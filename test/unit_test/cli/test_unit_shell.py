@@ -0,0 +1,42 @@
+from danoan.word_guru.cli.commands import shell
+from danoan.word_guru.core import exception
+
+import io
+import pytest
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("def happiness eng", ("definition", "happiness", ["eng"])),
+        ("definition happiness eng", ("definition", "happiness", ["eng"])),
+        ("tr il pleut fra eng", ("translation", "il pleut", ["fra", "eng"])),
+        ("def aujourd'hui fra", ("definition", "aujourd'hui", ["fra"])),
+        (
+            "  rev  a black drink   ita ",
+            ("reverse-definition", "a black drink", ["ita"]),
+        ),
+    ],
+)
+def test_parse_query(query, expected):
+    assert shell.parse_query(query) == expected
+
+
+def test_parse_query_missing_language():
+    with pytest.raises(ValueError):
+        shell.parse_query("tr pareil fra")
+
+
+def test_parse_query_unknown_operation():
+    with pytest.raises(exception.OperationNotFoundError):
+        shell.parse_query("unknown pareil fra")
+
+
+def test_shell(fake_chain, monkeypatch, capsys):
+    queries = "def happiness eng\n\n# comment\ntr pareil fra eng\nbad query\nquit\ndef love eng\n"
+    monkeypatch.setattr("sys.stdin", io.StringIO(queries))
+
+    shell.shell("key", None)
+
+    assert capsys.readouterr().out.splitlines() == ['["happiness"]', '["pareil"]']
+    assert len(fake_chain.calls) == 2
@@ -3,8 +3,41 @@ from danoan.word_guru.core import api, exception
 import pytest
 
 
-def test_get_language():
-    language = api._get_language("eng")
-    assert language
+def test_get_client_is_reused(tmp_path):
+    cache_path = tmp_path / "word-guru.cache.db"
+    client = api.get_client("key", cache_path)
+    assert client is api.get_client("key", str(cache_path))
+    assert client is not api.get_client("key", None)
+
+
+def test_get_definition(fake_chain):
+    response = api.get_definition("key", None, "happiness", "eng")
+    assert response == '["happiness"]'
+    assert fake_chain.calls == [{"language": "English", "message": "happiness"}]
+
+
+def test_get_definition_batch(fake_chain):
+    words = ["happiness", "love", "table"]
+    batch_items = list(
+        api.get_definition_batch("key", None, words, "eng", max_concurrency=2)
+    )
+
+    assert [item.input for item in batch_items] == words
+    assert [item.response for item in batch_items] == [
+        '["happiness"]',
+        '["love"]',
+        '["table"]',
+    ]
+
+
+def test_get_definition_batch_empty_response(fake_chain):
+    words = ["happiness", "", "table"]
+    batch_items = list(api.get_definition_batch("key", None, words, "eng"))
+
+    assert [item.ok for item in batch_items] == [True, False, True]
+    assert isinstance(batch_items[1].error, exception.OpenAIEmptyResponseError)
+
+
+def test_get_definition_batch_language_not_recognized():
     with pytest.raises(exception.LanguageCodeNotRecognizedError):
-        language = api._get_language("en")
+        api.get_definition_batch("key", None, ["happiness"], "xx")
@@ -0,0 +1,31 @@
+from danoan.word_guru.core import async_api, exception
+
+import asyncio
+import pytest
+
+
+def test_get_translation(fake_chain):
+    response = asyncio.run(
+        async_api.get_translation("key", None, "pareil", "fra", "eng")
+    )
+    assert response == '["pareil"]'
+    assert fake_chain.calls == [
+        {"from_language": "French", "to_language": "English", "message": "pareil"}
+    ]
+
+
+def test_get_definition_empty_response(fake_chain):
+    with pytest.raises(exception.OpenAIEmptyResponseError):
+        asyncio.run(async_api.get_definition("key", None, "", "eng"))
+
+
+def test_get_definition_batch(fake_chain):
+    words = ["happiness", "", "love", "table", "notes"]
+    batch_items = asyncio.run(
+        async_api.get_definition_batch("key", None, words, "eng", max_concurrency=2)
+    )
+
+    assert [item.input for item in batch_items] == words
+    assert [item.ok for item in batch_items] == [True, False, True, True, True]
+    assert batch_items[0].response == '["happiness"]'
+    assert fake_chain.max_in_flight == 2
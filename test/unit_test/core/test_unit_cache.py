@@ -0,0 +1,229 @@
+from danoan.word_guru.core import cache
+from danoan.word_guru.core.cache import CacheKey, MemoryCache, ResultCache
+
+import pytest
+
+
+def make_key(message: str) -> CacheKey:
+    return CacheKey("definition", message, ("eng",), "version", "gpt-4o-mini")
+
+
+def test_get_and_put(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    assert result_cache.get(make_key("happiness")) is None
+
+    result_cache.put(make_key("happiness"), '["joy"]')
+    assert result_cache.get(make_key("happiness")) == '["joy"]'
+    assert (result_cache.hits, result_cache.misses) == (1, 1)
+
+
+def test_entries_are_persisted(tmp_path):
+    ResultCache(tmp_path / "cache.db").put(make_key("happiness"), '["joy"]')
+    assert ResultCache(tmp_path / "cache.db").get(make_key("happiness")) == '["joy"]'
+
+
+def test_key_fields_are_distinguished(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.put(make_key("happiness"), '["joy"]')
+
+    for other_key in [
+        CacheKey("synonym", "happiness", ("eng",), "version", "gpt-4o-mini"),
+        CacheKey("definition", "happiness", ("fra",), "version", "gpt-4o-mini"),
+        CacheKey("definition", "happiness", ("eng",), "other", "gpt-4o-mini"),
+        CacheKey("definition", "happiness", ("eng",), "version", "gpt-4o"),
+    ]:
+        assert result_cache.get(other_key) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+
+    result_cache = ResultCache(
+        tmp_path / "cache.db", max_entries=2, memory_max_entries=0
+    )
+    for word in ["a", "b"]:
+        now[0] += 1
+        result_cache.put(make_key(word), word)
+
+    now[0] += 1
+    result_cache.get(make_key("a"))
+    now[0] += 1
+    result_cache.put(make_key("c"), "c")
+
+    assert len(result_cache) == 2
+    assert result_cache.get(make_key("a")) == "a"
+    assert result_cache.get(make_key("b")) is None
+    assert result_cache.get(make_key("c")) == "c"
+
+
+def test_evicted_entries_are_not_served_from_memory(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db", max_entries=1)
+    result_cache.put(make_key("a"), "a")
+    result_cache.put(make_key("b"), "b")
+
+    assert result_cache.get(make_key("a")) is None
+    assert result_cache.get(make_key("b")) == "b"
+
+
+def test_close_unregisters_the_exit_flush(tmp_path, monkeypatch):
+    unregistered = []
+    monkeypatch.setattr(cache.atexit, "unregister", unregistered.append)
+
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.close()
+    assert unregistered == [result_cache.flush_counters]
+
+
+def test_expired_entries_are_not_served(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+
+    result_cache = ResultCache(tmp_path / "cache.db", ttl=10)
+    result_cache.put(make_key("happiness"), '["joy"]')
+    now[0] = 5
+    assert result_cache.get(make_key("happiness")) == '["joy"]'
+    now[0] = 11
+    assert result_cache.get(make_key("happiness")) is None
+    assert len(result_cache) == 0
+
+
+def test_max_entries_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path / "cache.db", max_entries=0)
+
+
+def test_hot_entries_are_served_from_memory(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.put(make_key("happiness"), '["joy"]')
+    assert result_cache.get(make_key("happiness")) == '["joy"]'
+    assert result_cache.memory_hits == 1
+
+    other_process_cache = ResultCache(tmp_path / "cache.db")
+    assert other_process_cache.get(make_key("happiness")) == '["joy"]'
+    assert other_process_cache.get(make_key("happiness")) == '["joy"]'
+    assert (other_process_cache.hits, other_process_cache.memory_hits) == (2, 1)
+
+
+def test_memory_is_bounded_by_entries_and_bytes():
+    memory = MemoryCache(max_entries=2, max_bytes=10)
+    memory.put("a", "aaaa", 0)
+    memory.put("b", "bbbb", 0)
+    memory.get("a")
+    memory.put("c", "cc", 0)
+    assert (memory.get("a"), memory.get("b"), memory.get("c")) == (
+        ("aaaa", 0),
+        None,
+        ("cc", 0),
+    )
+
+    memory.put("d", "dddddd", 0)
+    assert memory.get("a") is None
+    assert memory.size_bytes == 8
+
+    memory.put("e", "e" * 11, 0)
+    assert memory.get("e") is None
+
+
+def test_memory_tier_can_be_disabled(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db", memory_max_entries=0)
+    result_cache.put(make_key("happiness"), '["joy"]')
+    assert result_cache.get(make_key("happiness")) == '["joy"]'
+    assert (result_cache.hits, result_cache.memory_hits) == (1, 0)
+
+
+def test_prune_removes_entries_of_changed_prompts(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.put(make_key("happiness"), '["joy"]')
+    result_cache.put(
+        CacheKey("definition", "love", ("eng",), "old", "gpt-4o-mini"), '["love"]'
+    )
+    result_cache.put(
+        CacheKey("removed-operation", "love", ("eng",), "version", "gpt-4o-mini"),
+        '["love"]',
+    )
+    result_cache._connection.execute("CREATE TABLE full_llm_cache (prompt TEXT)")
+
+    assert result_cache.prune({"definition": "version"}) == 2
+    assert len(result_cache) == 1
+    assert result_cache.get(make_key("happiness")) == '["joy"]'
+    assert not result_cache._connection.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'full_llm_cache'"
+    ).fetchall()
+
+
+def test_compact_shrinks_the_file(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    for index in range(200):
+        result_cache.put(make_key(str(index)), "x" * 1000)
+    result_cache.compact()
+    size = result_cache.size_bytes()
+
+    result_cache.prune({})
+    result_cache.compact()
+    assert result_cache.size_bytes() < size / 4
+
+
+def test_export_and_import_entries(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.put(make_key("happiness"), '["joy"]')
+    result_cache.put(
+        CacheKey("translation", "pareil", ("fra", "eng"), "version", "gpt-4o"),
+        '["same"]',
+    )
+    entries = list(result_cache.export_entries())
+    assert entries[1]["languages"] == ["fra", "eng"]
+
+    other_cache = ResultCache(tmp_path / "other.db", max_entries=1)
+    assert other_cache.import_entries(entries) == 2
+    assert len(other_cache) == 1
+    assert list(other_cache.export_entries()) == entries[1:]
+
+
+def test_import_invalid_entries_is_rolled_back(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    entry = {
+        "operation": "definition",
+        "message": "happiness",
+        "languages": ["eng"],
+        "prompt_version": "version",
+        "model": "gpt-4o-mini",
+        "response": '["joy"]',
+    }
+    with pytest.raises(KeyError):
+        result_cache.import_entries([entry, {"operation": "definition"}])
+    assert len(result_cache) == 0
+
+
+def test_stats(tmp_path):
+    result_cache = ResultCache(tmp_path / "cache.db")
+    result_cache.put(make_key("happiness"), '["joy"]')
+    result_cache.put(make_key("love"), '["love"]')
+    result_cache.put(
+        CacheKey("translation", "pareil", ("fra", "eng"), "version", "gpt-4o"),
+        '["same"]',
+    )
+    for word in ["happiness", "happiness", "love", "table"]:
+        result_cache.get(make_key(word))
+
+    other_process_cache = ResultCache(tmp_path / "cache.db")
+    other_process_cache.get(make_key("love"))
+    other_process_cache.close()
+
+    stats = result_cache.stats()
+    assert stats.entries == {
+        ("definition", ("eng",)): 2,
+        ("translation", ("fra", "eng")): 1,
+    }
+    assert (stats.hits, stats.misses) == (4, 1)
+    assert stats.hit_ratio == 0.8
+    assert stats.top_keys == [
+        ("definition", "happiness", ("eng",), 2),
+        ("definition", "love", ("eng",), 2),
+    ]
+    assert stats.size_bytes > 0
+
+    result_cache.reset_counters()
+    stats = result_cache.stats()
+    assert (stats.hits, stats.misses, stats.top_keys) == (0, 0, [])
+    assert stats.hit_ratio is None
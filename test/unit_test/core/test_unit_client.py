@@ -0,0 +1,529 @@
+from conftest import FakeChain, FakeResponse
+from danoan.word_guru.core import exception, prompt_registry, rate_limit, result
+from danoan.word_guru.core.client import WordGuru
+from danoan.word_guru.core.rate_limit import SharedRateLimiter
+from danoan.word_guru.core.resilience import RetryPolicy
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import json
+import openai
+import pytest
+import time
+
+
+def test_chain_is_built_once_per_language(monkeypatch):
+    rendered = []
+    render_system_prompt = prompt_registry.render_system_prompt
+
+    def counting_render_system_prompt(prompt_filename, language_names):
+        rendered.append(language_names)
+        return render_system_prompt(prompt_filename, language_names)
+
+    monkeypatch.setattr(
+        prompt_registry, "render_system_prompt", counting_render_system_prompt
+    )
+
+    client = WordGuru("key")
+    english = client._language_names(language="eng")
+    french = client._language_names(language="fra")
+    chain = client._get_chain("word-definition.toml", english)
+    assert chain is client._get_chain("word-definition.toml", english)
+    assert chain is not client._get_chain("word-definition.toml", french)
+    assert rendered == [(("language", "English"),), (("language", "French"),)]
+
+
+def test_llm_is_shared_among_prompts():
+    client = WordGuru("key", timeout=10)
+    english = client._language_names(language="eng")
+    client._get_chain("word-definition.toml", english)
+    client._get_chain("classify-pos.toml", english)
+    assert list(client._llms) == ["gpt-4o-mini"]
+
+
+def test_operations(fake_chain):
+    client = WordGuru("key")
+    assert client.synonyms("terrible", "eng") == '["terrible"]'
+    assert client.translate("pareil", "fra", "ita") == '["pareil"]'
+    assert fake_chain.calls[-1]["to_language"] == "Italian"
+
+
+def test_normalized_messages_share_cache_entries(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    assert client.definition("Happiness", "eng") == '["Happiness"]'
+    assert client.definition("  happiness ", "en") == '["Happiness"]'
+    assert client.correct("I has a dog", "eng") == '["I has a dog"]'
+    assert client.correct("i has a dog", "eng") == '["i has a dog"]'
+
+    assert len(fake_chain.calls) == 3
+    assert (client.cache.hits, client.cache.misses) == (1, 3)
+
+
+def test_cached_responses_are_not_rate_limited(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    client.definition("happiness", "eng")
+
+    start = time.perf_counter()
+    batch_items = list(
+        client.execute_batch(
+            "definition", ["happiness"] * 5, ("eng",), requests_per_second=1
+        )
+    )
+    assert time.perf_counter() - start < 0.5
+    assert [item.response for item in batch_items] == ['["happiness"]'] * 5
+    assert len(fake_chain.calls) == 1
+
+
+def test_concurrent_identical_requests_share_a_call(fake_chain):
+    fake_chain.delay = 0.1
+    client = WordGuru("key")
+    words = ["happiness", "Happiness ", "happiness", "love"]
+    with ThreadPoolExecutor(len(words)) as executor:
+        responses = list(
+            executor.map(lambda word: client.definition(word, "eng"), words)
+        )
+
+    assert len(fake_chain.calls) == 2
+    assert len(set(responses[:3])) == 1
+    assert responses[3] == '["love"]'
+
+
+def test_concurrent_identical_coroutines_share_a_call(fake_chain):
+    fake_chain.delay = 0.1
+    client = WordGuru("key")
+
+    async def run():
+        return await asyncio.gather(
+            *(client.async_execute("definition", "happiness", "eng") for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ['["happiness"]'] * 5
+    assert asyncio.run(run()) == ['["happiness"]'] * 5
+    assert len(fake_chain.calls) == 2
+
+
+def test_late_identical_requests_read_the_cache(fake_chain, tmp_path, monkeypatch):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    client.definition("happiness", "eng")
+    get = client.cache.get
+    reads = []
+
+    # The first read misses, as for a request checking the cache just
+    # before the flight of an identical request ended.
+    def get_after_flight(key, count=True):
+        reads.append(key)
+        return None if len(reads) == 1 else get(key, count)
+
+    monkeypatch.setattr(client.cache, "get", get_after_flight)
+    assert client.definition("happiness", "eng") == '["happiness"]'
+
+    reads.clear()
+    response = asyncio.run(client.async_execute("definition", "happiness", "eng"))
+    assert response == '["happiness"]'
+    assert len(fake_chain.calls) == 1
+
+
+class WordCardChain(FakeChain):
+    def _end(self, prompt_data):
+        super()._end(prompt_data)
+        card = {
+            "definitions": [prompt_data["message"]],
+            "synonyms": [],
+            "pos_tags": ["noun"],
+            "usage_examples": [],
+        }
+        return FakeResponse(json.dumps(card))
+
+
+def test_word_card_in_a_single_request(monkeypatch):
+    chain = WordCardChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key")
+
+    card = json.loads(client.word_card("happiness", "eng"))
+    assert card["definitions"] == ["happiness"]
+    assert card["pos_tags"] == ["noun"]
+    assert len(chain.calls) == 1
+
+
+def test_word_card_falls_back_to_individual_operations(fake_chain):
+    client = WordGuru("key")
+
+    card = json.loads(client.word_card("happiness", "eng"))
+    assert card == {
+        "definitions": ["happiness"],
+        "synonyms": ["happiness"],
+        "pos_tags": ["happiness"],
+        "usage_examples": ["happiness"],
+    }
+    assert len(fake_chain.calls) == 5
+
+    card = json.loads(asyncio.run(client.async_word_card("love", "eng", False)))
+    assert card["synonyms"] == ["love"]
+    assert len(fake_chain.calls) == 9
+
+
+def test_word_card_fallback_replaces_the_invalid_cached_card(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    card = client.word_card("happiness", "eng")
+    assert len(fake_chain.calls) == 5
+
+    assert client.execute("word-card", "happiness", "eng") == card
+    assert client.word_card("happiness", "eng") == card
+    assert asyncio.run(client.async_word_card("happiness", "eng")) == card
+    assert len(fake_chain.calls) == 5
+
+
+def test_rate_limiter_refunds_every_hedged_attempt(monkeypatch, tmp_path):
+    class RecordingLimiter(SharedRateLimiter):
+        refunded = []
+
+        def refund(self, tokens):
+            self.refunded.append(tokens)
+
+    class UsageChain(FakeChain):
+        def _end(self, prompt_data):
+            response = super()._end(prompt_data)
+            response.usage_metadata = {"total_tokens": 10}
+            return response
+
+    chain = UsageChain(delay=0.1)
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    limiter = RecordingLimiter(tmp_path / "rate-limit.db", tokens_per_minute=60000)
+    client = WordGuru(
+        "key", retry_policy=RetryPolicy(hedge_after=0.01), rate_limiter=limiter
+    )
+
+    client.definition("love", "eng")
+    time.sleep(0.2)
+    assert len(chain.calls) == 2
+    assert len(limiter.refunded) == 2
+
+
+class PackedChain(FakeChain):
+    """
+    Answer packed requests with a json object, leaving out the entry skip
+    and answering the entry wrong with a string instead of a list.
+    """
+
+    def _end(self, prompt_data):
+        response = super()._end(prompt_data)
+        if not prompt_data["message"].startswith("["):
+            return response
+        entries = json.loads(prompt_data["message"])
+        return FakeResponse(
+            json.dumps(
+                {
+                    entry: entry if entry == "wrong" else [entry]
+                    for entry in entries
+                    if entry != "skip"
+                }
+            )
+        )
+
+
+def test_execute_packed(monkeypatch, tmp_path):
+    chain = PackedChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    client.definition("cached", "eng")
+
+    words = ["a", "skip", "cached", "b", "c", "d", "e"]
+    batch_items = list(
+        client.execute_packed("definition", words, ("eng",), pack_size=3)
+    )
+
+    assert [item.input for item in batch_items] == words
+    assert [item.response for item in batch_items] == [f'["{w}"]' for w in words]
+    assert [call["message"] for call in chain.calls[1:]] == [
+        '["a", "skip"]',
+        '["skip"]',
+        "skip",
+        '["b", "c", "d"]',
+        '["e"]',
+    ]
+    assert len(chain.calls) == 6
+
+    batch_items = list(client.execute_packed("definition", ["b", "d"], ("eng",)))
+    assert [item.response for item in batch_items] == ['["b"]', '["d"]']
+    assert len(chain.calls) == 6
+
+    # Packed answers are not served to single requests.
+    assert client.definition("d", "eng") == '["d"]'
+    assert len(chain.calls) == 7
+
+
+def test_execute_packed_requests_invalid_answers_one_by_one(monkeypatch, tmp_path):
+    chain = PackedChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+
+    batch_items = list(
+        client.execute_packed("definition", ["a", "wrong"], ("eng",), retries=0)
+    )
+    assert [item.response for item in batch_items] == ['["a"]', '["wrong"]']
+    assert [call["message"] for call in chain.calls] == ['["a", "wrong"]', "wrong"]
+
+    list(client.execute_packed("definition", ["wrong"], ("eng",)))
+    assert len(chain.calls) == 2
+
+
+def test_execute_packed_reports_failed_packs_per_entry(monkeypatch):
+    def fail(*args):
+        raise KeyError("variable")
+
+    chain = PackedChain()
+    monkeypatch.setattr(chain, "invoke", fail)
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key")
+
+    batch_items = list(
+        client.execute_packed("definition", ["a", "b", "c"], ("eng",), pack_size=2)
+    )
+    assert [item.input for item in batch_items] == ["a", "b", "c"]
+    assert all(isinstance(item.error, KeyError) for item in batch_items)
+
+
+def test_execute_packed_validates_arguments():
+    client = WordGuru("key")
+    with pytest.raises(ValueError):
+        client.execute_packed("definition", ["a"], ("eng",), pack_size=0)
+    with pytest.raises(exception.LanguageCodeNotRecognizedError):
+        client.execute_packed("definition", ["a"], ("xx",))
+
+
+def test_translate_many(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    client.translate("pareil", "fra", "eng")
+
+    translations = client.translate_many("pareil", "fra", ["eng", "ita", "por", "ita"])
+    assert translations == {
+        "eng": '["pareil"]',
+        "ita": '["pareil"]',
+        "por": '["pareil"]',
+    }
+    assert len(fake_chain.calls) == 3
+    assert fake_chain.max_in_flight == 2
+
+    translations = asyncio.run(
+        client.async_translate_many("pareil", "fra", ["ita", "deu"])
+    )
+    assert list(translations) == ["ita", "deu"]
+    assert len(fake_chain.calls) == 4
+
+    with pytest.raises(exception.LanguageCodeNotRecognizedError):
+        client.translate_many("pareil", "fra", ["eng", "xx"])
+
+
+class RateLimitedChain(FakeChain):
+    """
+    Answer every other request with 429 Too Many Requests.
+    """
+
+    def _end(self, prompt_data):
+        response = super()._end(prompt_data)
+        if len(self.calls) % 2 == 1:
+            request = httpx.Request("POST", "http://127.0.0.1/v1/chat/completions")
+            raise openai.RateLimitError(
+                "error",
+                response=httpx.Response(
+                    429, headers={"retry-after": "0"}, request=request
+                ),
+                body=None,
+            )
+        return response
+
+
+def test_retry_policy(monkeypatch):
+    chain = RateLimitedChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+
+    client = WordGuru("key")
+    assert client.definition("love", "eng") == '["love"]'
+    assert asyncio.run(client.async_execute("definition", "happy", "eng"))
+    assert len(chain.calls) == 4
+
+    client = WordGuru("key", retry_policy=RetryPolicy(max_attempts=1))
+    with pytest.raises(openai.RateLimitError):
+        client.definition("joy", "eng")
+
+
+class RateLimitedStreamChain(RateLimitedChain):
+    """
+    Report the usage of streams in their last chunk.
+    """
+
+    def stream(self, prompt_data):
+        chunks = list(super().stream(prompt_data))
+        chunks[-1].usage_metadata = {
+            "input_tokens": 30,
+            "output_tokens": 5,
+            "total_tokens": 35,
+        }
+        yield from chunks
+
+    async def astream(self, prompt_data):
+        for chunk in self.stream(prompt_data):
+            yield chunk
+
+
+def test_stream_follows_retry_policy_and_accounts_usage(monkeypatch, tmp_path):
+    class RecordingLimiter(SharedRateLimiter):
+        refunded = []
+
+        def refund(self, tokens):
+            self.refunded.append(tokens)
+
+        async def async_refund(self, tokens):
+            self.refunded.append(tokens)
+
+    chain = RateLimitedStreamChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    limiter = RecordingLimiter(tmp_path / "rate-limit.db", tokens_per_minute=60000)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db", rate_limiter=limiter)
+
+    assert "".join(client.stream("correction", "I has a dog", "eng")) == (
+        '["I has a dog"]'
+    )
+
+    async def collect():
+        return [c async for c in client.async_stream("correction", "joy", "eng")]
+
+    assert "".join(asyncio.run(collect())) == '["joy"]'
+    assert len(chain.calls) == 4
+    assert len(limiter.refunded) == 2
+
+    usage = client.usage_log.report().total
+    assert (usage.calls, usage.estimated_calls, usage.prompt_tokens) == (2, 0, 60)
+
+
+def test_shared_rate_limiter(fake_chain, tmp_path):
+    class RecordingLimiter(SharedRateLimiter):
+        acquired = []
+
+        def acquire(self, tokens=0):
+            self.acquired.append(tokens)
+            super().acquire(tokens)
+
+    limiter = RecordingLimiter(tmp_path / "rate-limit.db", requests_per_minute=600)
+    client = WordGuru("key", rate_limiter=limiter)
+    client.definition("love", "eng")
+    list(client.stream("definition", "happy", "eng"))
+
+    assert len(limiter.acquired) == 2
+    assert all(
+        tokens > rate_limit.DEFAULT_COMPLETION_TOKENS for tokens in limiter.acquired
+    )
+
+
+def test_token_usage_is_recorded_per_operation(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    client.definition("love", "eng")
+    client.definition("happiness", "eng")
+    client.translate("pareil", "fra", "it")
+    list(client.run_batch("word-definition.toml", ["joy"], language="eng"))
+
+    report = client.usage_log.report()
+    assert {key.operation: usage.calls for key, usage in report.usage.items()} == {
+        "definition": 3,
+        "translation": 1,
+    }
+    translation = next(key for key in report.usage if key.operation == "translation")
+    assert translation.languages == ("fra", "ita")
+    assert report.total.estimated_calls == 4
+
+
+class CorrectionChain(FakeChain):
+    def _end(self, prompt_data):
+        super()._end(prompt_data)
+        return FakeResponse(json.dumps({"grammar": [prompt_data["message"]]}))
+
+
+def test_correct_document(monkeypatch, tmp_path):
+    chain = CorrectionChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+
+    text = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
+    corrections = json.loads(client.correct_document(text, "eng"))
+    assert corrections == {"grammar": text.split("\n\n")}
+    assert len(chain.calls) == 3
+
+    edited = text.replace("Second", "Edited")
+    corrections = json.loads(client.correct_document(edited, "eng"))
+    assert corrections["grammar"][1] == "Edited paragraph."
+    assert [call["message"] for call in chain.calls[3:]] == ["Edited paragraph."]
+
+
+class BrokenChain(FakeChain):
+    """
+    Answer with an unterminated json list, which only the repair prompt fixes.
+    """
+
+    def _end(self, prompt_data):
+        super()._end(prompt_data)
+        if prompt_data["message"].startswith("Synonyms:"):
+            return FakeResponse('["joy", "bliss"]')
+        return FakeResponse('Synonyms: ["joy", "bliss"')
+
+
+def test_get_result_repairs_invalid_responses(monkeypatch, tmp_path):
+    chain = BrokenChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+
+    synonyms = client.get_result("synonym", "love", "eng")
+    assert synonyms == result.SynonymList(("joy", "bliss"))
+    assert len(chain.calls) == 2
+
+    assert client.get_result("synonym", "love", "eng") is synonyms
+    assert json.loads(client.synonyms("love", "eng")) == ["joy", "bliss"]
+    assert len(chain.calls) == 2
+
+
+def test_async_get_result_repairs_invalid_responses(monkeypatch, tmp_path):
+    chain = BrokenChain()
+    monkeypatch.setattr(WordGuru, "_get_chain", lambda self, *args: chain)
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+
+    synonyms = asyncio.run(client.async_get_result("synonym", "love", "eng"))
+    assert synonyms == result.SynonymList(("joy", "bliss"))
+    assert len(chain.calls) == 2
+
+    assert json.loads(client.synonyms("love", "eng")) == ["joy", "bliss"]
+    assert len(chain.calls) == 2
+
+
+def test_get_result_raises_invalid_response_error(fake_chain):
+    client = WordGuru("key")
+    with pytest.raises(exception.InvalidResponseError):
+        client.get_result("correction", "love", "eng")
+
+
+def test_stream(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    chunks = list(client.stream("correction", "I has a dog", "eng"))
+    assert chunks == ['["I ', "has ", "a do", 'g"]']
+
+    assert list(client.stream("correction", "I has a dog", "eng")) == [
+        '["I has a dog"]'
+    ]
+    assert len(fake_chain.calls) == 1
+
+    with pytest.raises(exception.OpenAIEmptyResponseError):
+        list(client.stream("correction", "", "eng"))
+    with pytest.raises(exception.LanguageCodeNotRecognizedError):
+        client.stream("correction", "I has a dog", "xx")
+
+
+def test_async_stream(fake_chain):
+    client = WordGuru("key")
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in client.async_stream("translation", "pareil", "fr", "en")
+        ]
+
+    assert "".join(asyncio.run(collect())) == '["pareil"]'
@@ -0,0 +1,160 @@
+from danoan.word_guru.core import concurrency
+from danoan.word_guru.core.rate_limit import RateLimiter
+
+import asyncio
+import threading
+import time
+import pytest
+
+
+def test_ordered_map_preserves_order():
+    def slow_identity(x):
+        time.sleep(0.01 * (5 - x))
+        return x
+
+    batch_items = list(concurrency.ordered_map(slow_identity, range(5), 4))
+    assert [item.response for item in batch_items] == list(range(5))
+
+
+def test_ordered_map_stores_errors():
+    def fail_on_two(x):
+        if x == 2:
+            raise ValueError(x)
+        return x
+
+    batch_items = list(concurrency.ordered_map(fail_on_two, range(4), 2))
+    assert [item.ok for item in batch_items] == [True, True, False, True]
+    assert isinstance(batch_items[2].error, ValueError)
+
+
+def test_ordered_map_bounds_concurrency():
+    lock = threading.Lock()
+    in_flight = [0]
+    max_in_flight = [0]
+
+    def track(x):
+        with lock:
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return x
+
+    list(concurrency.ordered_map(track, range(20), 3))
+    assert max_in_flight[0] <= 3
+
+
+def test_ordered_map_invalid_concurrency():
+    with pytest.raises(ValueError):
+        list(concurrency.ordered_map(lambda x: x, range(2), 0))
+
+
+def test_rate_limiter():
+    rate_limiter = RateLimiter(100)
+    start = time.monotonic()
+    for _ in range(5):
+        rate_limiter.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_single_flight():
+    calls = []
+    single_flight = concurrency.SingleFlight()
+
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    threads = [
+        threading.Thread(target=single_flight.do, args=("key", slow_call))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert single_flight.do("key", lambda: "new result") == "new result"
+
+
+def test_single_flight_shares_errors():
+    def failing_call():
+        raise ValueError()
+
+    single_flight = concurrency.SingleFlight()
+    with pytest.raises(ValueError):
+        single_flight.do("key", failing_call)
+    assert single_flight.do("key", lambda: 1) == 1
+
+
+def test_async_single_flight_shares_calls_and_errors():
+    calls = []
+    single_flight = concurrency.AsyncSingleFlight()
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def failing_call():
+        await asyncio.sleep(0.05)
+        raise ValueError()
+
+    async def run():
+        results = await asyncio.gather(
+            *(single_flight.do("key", slow_call) for _ in range(5))
+        )
+        errors = await asyncio.gather(
+            *(single_flight.do("error", failing_call) for _ in range(3)),
+            return_exceptions=True,
+        )
+        return results, errors
+
+    results, errors = asyncio.run(run())
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_async_single_flight_survives_the_cancellation_of_the_first_caller():
+    calls = []
+    single_flight = concurrency.AsyncSingleFlight()
+
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(single_flight.do("key", slow_call))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(single_flight.do("key", slow_call))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(run()) == "result"
+    assert len(calls) == 1
+
+
+def test_async_ordered_map_bounds_pending_calls():
+    in_flight = []
+    max_in_flight = []
+
+    async def function(item):
+        in_flight.append(item)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01 * (item % 3))
+        in_flight.remove(item)
+        if item == 4:
+            raise ValueError()
+        return item * 2
+
+    batch_items = asyncio.run(concurrency.async_ordered_map(function, range(10), 3))
+    assert [batch_item.input for batch_item in batch_items] == list(range(10))
+    assert batch_items[2].response == 4
+    assert isinstance(batch_items[4].error, ValueError)
+    assert max(max_in_flight) == 3
@@ -0,0 +1,69 @@
+from danoan.word_guru.core import daemon, exception
+
+import pytest
+import socket
+import threading
+
+
+@pytest.fixture
+def socket_path(fake_chain, tmp_path):
+    socket_path = tmp_path / "word-guru.sock"
+    server = daemon.create_server(socket_path)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_request(socket_path, fake_chain):
+    response = daemon.request(
+        socket_path, "key", None, "translation", "pareil", "fra", "eng"
+    )
+    assert response == '["pareil"]'
+    assert fake_chain.calls[0]["to_language"] == "English"
+
+
+def test_request_empty_response(socket_path):
+    with pytest.raises(exception.OpenAIEmptyResponseError):
+        daemon.request(socket_path, "key", None, "definition", "", "eng")
+
+
+def test_request_error(socket_path):
+    with pytest.raises(exception.LanguageCodeNotRecognizedError) as ex:
+        daemon.request(socket_path, "key", None, "definition", "love", "xx")
+    assert ex.value.language_code == "xx"
+
+    with pytest.raises(exception.DaemonRequestError) as ex:
+        daemon.request(socket_path, "key", None, "definition", "love", "eng", "fra")
+    assert ex.value.error_type == "TypeError"
+
+
+def test_request_timeout(tmp_path):
+    socket_path = tmp_path / "word-guru.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+    try:
+        with pytest.raises(exception.DaemonRequestError) as ex:
+            daemon.request(
+                socket_path, "key", None, "definition", "love", "eng", timeout=0.1
+            )
+        assert ex.value.error_type == "TimeoutError"
+    finally:
+        server.close()
+
+
+def test_daemon_not_running(tmp_path):
+    socket_path = tmp_path / "word-guru.sock"
+    assert not daemon.is_running(socket_path)
+    with pytest.raises(exception.DaemonNotRunningError):
+        daemon.request(socket_path, "key", None, "definition", "love", "eng")
+
+
+def test_create_server_twice(socket_path):
+    assert daemon.is_running(socket_path)
+    with pytest.raises(FileExistsError):
+        daemon.create_server(socket_path)
@@ -0,0 +1,37 @@
+from danoan.word_guru.core import document
+
+import pytest
+
+
+def test_split_chunks():
+    text = "First paragraph.\n\n  \n\nSecond one. It is long! Really?\n\n"
+    assert document.split_chunks(text) == [
+        "First paragraph.",
+        "Second one. It is long! Really?",
+    ]
+    assert document.split_chunks(text, chunk_size=20) == [
+        "First paragraph.",
+        "Second one.",
+        "It is long! Really?",
+    ]
+    assert document.split_chunks("") == []
+    with pytest.raises(ValueError):
+        document.split_chunks(text, chunk_size=0)
+
+
+def test_merge_corrections():
+    responses = [
+        '{"grammar": ["a"], "spelling": []}',
+        '{"grammar": ["b"], "style": ["c"]}',
+    ]
+    assert document.merge_corrections(responses) == {
+        "grammar": ["a", "b"],
+        "spelling": [],
+        "style": ["c"],
+    }
+
+
+@pytest.mark.parametrize("response", ['["a"]', '{"grammar": "a"}'])
+def test_merge_invalid_corrections(response):
+    with pytest.raises(ValueError):
+        document.merge_corrections([response])
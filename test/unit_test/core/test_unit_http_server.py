@@ -0,0 +1,189 @@
+from danoan.word_guru.core.client import WordGuru
+from danoan.word_guru.core.http_server import WordGuruHTTPServer
+
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import httpx
+import json
+import openai
+import pytest
+import threading
+
+
+@pytest.fixture
+def server(fake_chain, tmp_path):
+    client = WordGuru("key", cache_path=tmp_path / "cache.db")
+    server = WordGuruHTTPServer(("127.0.0.1", 0), client, max_concurrency=4)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request(method, path, json.dumps(body) if body else None)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_health(server):
+    assert request(server, "GET", "/health") == (200, {"status": "ok"})
+
+
+def test_operations(server):
+    status, body = request(server, "GET", "/operations")
+    assert status == 200
+    assert body["translation"] == ["from_language", "to_language"]
+    assert body["translations"] == ["from_language", "to_languages"]
+
+
+def test_translation(server, fake_chain):
+    body = {"message": "pareil", "from_language": "fra", "to_language": "eng"}
+    assert request(server, "POST", "/translation", body) == (
+        200,
+        {"response": ["pareil"]},
+    )
+
+
+def test_translations(server, fake_chain):
+    body = {"message": "pareil", "from_language": "fra", "to_languages": ["eng", "ita"]}
+    assert request(server, "POST", "/translations", body) == (
+        200,
+        {"response": {"eng": ["pareil"], "ita": ["pareil"]}},
+    )
+    assert len(fake_chain.calls) == 2
+
+
+def test_word_card_falls_back_to_individual_operations(server, fake_chain):
+    body = {"message": "love", "language": "eng"}
+    status, body = request(server, "POST", "/word-card", body)
+    assert status == 200
+    assert body["response"]["synonyms"] == ["love"]
+    assert len(fake_chain.calls) == 5
+
+
+def test_document_correction(server, monkeypatch):
+    monkeypatch.setattr(
+        server.client, "correct_document", lambda *args: '{"corrections": []}'
+    )
+    body = {"message": "Il a manger.", "language": "fra", "chunk_size": 100}
+    assert request(server, "POST", "/document-correction", body) == (
+        200,
+        {"response": {"corrections": []}},
+    )
+
+
+def test_cached_answers_do_not_wait(server, fake_chain):
+    body = {"message": "love", "language": "eng"}
+    request(server, "POST", "/definition", body)
+    for _ in range(server.max_concurrency):
+        server._semaphore.acquire()
+    try:
+        assert request(server, "POST", "/definition", body) == (
+            200,
+            {"response": ["love"]},
+        )
+    finally:
+        for _ in range(server.max_concurrency):
+            server._semaphore.release()
+    assert len(fake_chain.calls) == 1
+
+
+def test_batch(server):
+    body = {"messages": ["love", "", "table"], "language": "eng"}
+    status, body = request(server, "POST", "/definition/batch", body)
+    assert status == 200
+    assert body["results"][0] == {"input": "love", "response": ["love"]}
+    assert "error" in body["results"][1]
+    assert body["results"][2] == {"input": "table", "response": ["table"]}
+
+
+@pytest.mark.parametrize(
+    "path,body,status",
+    [
+        ("/unknown", {"message": "love", "language": "eng"}, 404),
+        ("/definition/other", {"message": "love", "language": "eng"}, 404),
+        ("/definition", {"message": "love"}, 400),
+        ("/definition", {"message": "love", "language": "xx"}, 400),
+        ("/definition", {"message": "", "language": "eng"}, 502),
+        ("/definition", {"message": 1, "language": "eng"}, 400),
+        ("/definition", {"message": None, "language": "eng"}, 400),
+        ("/definition", {"message": "love", "language": 1}, 400),
+        ("/definition/batch", {"messages": "abc", "language": "eng"}, 400),
+        ("/definition/batch", {"messages": ["a", 1], "language": "eng"}, 400),
+        ("/definition", ["love", "eng"], 400),
+        ("/translations", {"message": "a", "from_language": "fra"}, 400),
+        (
+            "/translations",
+            {"message": "a", "from_language": "fra", "to_languages": ["xx"]},
+            400,
+        ),
+        ("/document-correction", {"message": "a", "language": "fra"}, 502),
+        (
+            "/document-correction",
+            {"message": "a", "language": "fra", "chunk_size": 0},
+            400,
+        ),
+    ],
+)
+def test_errors(server, path, body, status):
+    assert request(server, "POST", path, body)[0] == status
+
+
+def test_invalid_content_length(server):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.putrequest("POST", "/definition")
+    connection.putheader("Content-Length", "abc")
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length."}
+
+
+def test_keep_alive(server):
+    connection = http.client.HTTPConnection(*server.server_address)
+    for word in ["love", "table"]:
+        connection.request(
+            "POST", "/synonym", json.dumps({"message": word, "language": "eng"})
+        )
+        response = connection.getresponse()
+        assert json.loads(response.read()) == {"response": [word]}
+
+
+def test_identical_requests_are_coalesced(server, fake_chain):
+    fake_chain.delay = 0.2
+    body = {"message": "trending", "language": "eng"}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: request(server, "POST", "/definition", body), range(8)
+            )
+        )
+
+    assert all(result == (200, {"response": ["trending"]}) for result in results)
+    assert len(fake_chain.calls) == 1
+
+
+def test_provider_errors(server, monkeypatch):
+    def fail(*args):
+        raise openai.APIConnectionError(request=httpx.Request("POST", "/"))
+
+    monkeypatch.setattr(server.client, "get_result", fail)
+    body = {"message": "love", "language": "eng"}
+    assert request(server, "POST", "/definition", body)[0] == 502
+
+
+def test_internal_errors(server, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(server.client, "get_result", fail)
+    body = {"message": "love", "language": "eng"}
+    assert request(server, "POST", "/definition", body) == (
+        500,
+        {"error": "Internal error."},
+    )
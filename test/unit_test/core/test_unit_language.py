@@ -0,0 +1,38 @@
+from danoan.word_guru.core import exception, language
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "language_code,name",
+    [
+        ("eng", "English"),
+        ("en", "English"),
+        ("FRA", "French"),
+        ("it", "Italian"),
+        ("grc", "Ancient Greek (to 1453)"),
+    ],
+)
+def test_get_language_name(language_code, name):
+    assert language.get_language_name(language_code) == name
+
+
+def test_get_alpha3():
+    assert language.get_alpha3("pt") == "por"
+    assert language.get_alpha3("por") == "por"
+
+
+@pytest.mark.parametrize("language_code", ["xx", "zzz", "english", ""])
+def test_language_code_not_recognized(language_code):
+    with pytest.raises(exception.LanguageCodeNotRecognizedError):
+        language.get_language_name(language_code)
+
+
+def test_common_languages_do_not_import_pycountry(monkeypatch):
+    language._get_pycountry_language_name.cache_clear()
+    monkeypatch.setattr(
+        language,
+        "_get_pycountry_language_name",
+        lambda code: pytest.fail("pycountry must not be used"),
+    )
+    assert language.get_language_name("deu") == "German"
@@ -0,0 +1,34 @@
+from danoan.word_guru.core import operation, packing
+
+import pytest
+
+
+def test_split():
+    assert list(packing.split(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(packing.split([], 2)) == []
+    with pytest.raises(ValueError):
+        list(packing.split(range(5), 0))
+
+
+def test_unpack():
+    response = '{"love": ["affection"], "happiness": "", "Table ": ["board"]}'
+    entries = ["love", "happiness", "table", "chair"]
+    assert packing.unpack(response, entries, operation.normalize_word) == {
+        "love": '["affection"]',
+        "table": '["board"]',
+    }
+
+
+@pytest.mark.parametrize("response", ["not json", '["love"]'])
+def test_unpack_invalid_response(response):
+    assert packing.unpack(response, ["love"], operation.normalize_word) == {}
+
+
+def test_packed_prompt_versions():
+    versions = packing.get_prompt_versions()
+    assert set(versions) == {
+        packing.get_packed_name(name) for name in operation.OPERATIONS
+    }
+    assert versions["definition (packed)"].startswith(
+        operation.get_prompt_versions()["definition"]
+    )
@@ -0,0 +1,47 @@
+from danoan.word_guru.core import exception, prompt_registry
+
+import pytest
+
+
+def test_list_prompts():
+    assert prompt_registry.list_prompts() == (
+        "alternative-expression.toml",
+        "classify-pos.toml",
+        "correct-text.toml",
+        "packed.toml",
+        "repair-json.toml",
+        "reverse-definition.toml",
+        "translate.toml",
+        "usage-examples.toml",
+        "word-card.toml",
+        "word-definition.toml",
+    )
+
+
+def test_get_prompt_is_parsed_once():
+    prompt_config = prompt_registry.get_prompt("word-definition.toml")
+    assert prompt_config.name == "Word Definition"
+    assert prompt_config is prompt_registry.get_prompt("word-definition.toml")
+
+
+def test_get_prompt_not_found():
+    with pytest.raises(exception.PromptNotFoundError):
+        prompt_registry.get_prompt("unknown.toml")
+
+
+def test_render_system_prompt():
+    system_prompt = prompt_registry.render_system_prompt(
+        "translate.toml", (("from_language", "French"), ("to_language", "English"))
+    )
+    assert "You are a French to English translator." in system_prompt
+    assert "{" not in system_prompt
+
+
+@pytest.mark.parametrize("prompt_filename", prompt_registry.list_prompts())
+def test_every_system_prompt_renders(prompt_filename):
+    language_names = (
+        ("language", "English"),
+        ("from_language", "French"),
+        ("to_language", "English"),
+    )
+    prompt_registry.render_system_prompt(prompt_filename, language_names)
@@ -0,0 +1,85 @@
+from danoan.word_guru.core import rate_limit
+from danoan.word_guru.core.rate_limit import SharedRateLimiter
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+
+def test_shared_rate_limiter_validates_limits(tmp_path):
+    with pytest.raises(ValueError):
+        SharedRateLimiter(tmp_path / "rate-limit.db")
+    with pytest.raises(ValueError):
+        SharedRateLimiter(tmp_path / "rate-limit.db", requests_per_minute=0)
+
+
+def test_limiters_of_the_same_file_share_their_buckets(tmp_path):
+    path = tmp_path / "rate-limit.db"
+    first = SharedRateLimiter(path, tokens_per_minute=6000, name="account")
+    second = SharedRateLimiter(path, tokens_per_minute=6000, name="account")
+    other = SharedRateLimiter(path, tokens_per_minute=6000, name="other")
+
+    start = time.monotonic()
+    first.acquire(6000)
+    other.acquire(10)
+    assert time.monotonic() - start < 0.05
+
+    second.acquire(10)
+    assert time.monotonic() - start >= 0.09
+
+    first.refund(6000)
+    start = time.monotonic()
+    second.acquire(10)
+    assert time.monotonic() - start < 0.05
+
+
+def test_refunds_do_not_exceed_the_capacity(tmp_path):
+    limiter = SharedRateLimiter(tmp_path / "rate-limit.db", tokens_per_minute=6000)
+    limiter.refund(6000)
+
+    start = time.monotonic()
+    limiter.acquire(6000)
+    limiter.acquire(10)
+    assert time.monotonic() - start >= 0.09
+
+
+def test_requests_per_minute(tmp_path):
+    limiter = SharedRateLimiter(tmp_path / "rate-limit.db", requests_per_minute=600)
+    limiter._update(600, 0)
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_get_shared_limiter(tmp_path):
+    assert rate_limit.get_shared_limiter("account") is None
+
+    rate_limit.configure_shared_limits(500, None, tmp_path / "rate-limit.db")
+    try:
+        limiter = rate_limit.get_shared_limiter("account")
+        assert limiter.requests_per_minute == 500
+        assert limiter.path == tmp_path / "rate-limit.db"
+        assert rate_limit.get_shared_limiter("account") is limiter
+    finally:
+        rate_limit.configure_shared_limits()
+
+
+def test_async_acquire_does_not_block_the_event_loop(tmp_path):
+    path = tmp_path / "rate-limit.db"
+    limiter = SharedRateLimiter(path, requests_per_minute=600)
+    other_process = sqlite3.connect(str(path), isolation_level=None)
+    other_process.execute("BEGIN IMMEDIATE")
+
+    async def run():
+        acquire = asyncio.ensure_future(limiter.async_acquire())
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+        assert not acquire.done()
+
+        other_process.execute("COMMIT")
+        await acquire
+
+    asyncio.run(asyncio.wait_for(run(), 5))
@@ -0,0 +1,167 @@
+from danoan.word_guru.core import exception, resilience
+from danoan.word_guru.core.resilience import CircuitBreaker, RetryPolicy
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+FAST_POLICY = RetryPolicy(max_attempts=3, backoff_base=0.001)
+
+
+def status_error(status_code: int, **headers: str) -> openai.APIStatusError:
+    request = httpx.Request("POST", "http://127.0.0.1/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    if status_code == 429:
+        return openai.RateLimitError("error", response=response, body=None)
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+class Flaky:
+    """
+    Fail with the given errors, then answer ok.
+    """
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    async def async_call(self) -> str:
+        return self()
+
+
+def test_is_retryable():
+    assert resilience.is_retryable(status_error(429))
+    assert resilience.is_retryable(status_error(503))
+    assert resilience.is_retryable(TimeoutError())
+    assert not resilience.is_retryable(status_error(400))
+    assert not resilience.is_retryable(exception.OpenAIEmptyResponseError())
+    assert not resilience.is_outage(status_error(429))
+    assert resilience.is_outage(status_error(500))
+
+
+def test_backoff_delay():
+    assert resilience.get_backoff_delay(FAST_POLICY, 0, status_error(429)) <= 0.001
+    assert resilience.get_backoff_delay(
+        FAST_POLICY, 0, status_error(429, **{"retry-after": "2"})
+    ) == pytest.approx(2)
+    assert resilience.get_backoff_delay(
+        FAST_POLICY, 0, status_error(429, **{"retry-after-ms": "250"})
+    ) == pytest.approx(0.25)
+    assert (
+        resilience.get_backoff_delay(
+            FAST_POLICY, 0, status_error(429, **{"retry-after": "3600"})
+        )
+        is None
+    )
+
+
+def test_retry_transient_errors():
+    fn = Flaky(status_error(429), status_error(502))
+    assert resilience.call(fn, FAST_POLICY) == "ok"
+    assert fn.calls == 3
+
+    fn = Flaky(status_error(429), status_error(429), status_error(429))
+    with pytest.raises(openai.RateLimitError):
+        resilience.call(fn, FAST_POLICY)
+    assert fn.calls == 3
+
+    fn = Flaky(status_error(400))
+    with pytest.raises(openai.APIStatusError):
+        resilience.call(fn, FAST_POLICY)
+    assert fn.calls == 1
+
+
+def test_async_retry_and_timeout():
+    fn = Flaky(status_error(500))
+    assert asyncio.run(resilience.async_call(fn.async_call, FAST_POLICY)) == "ok"
+    assert fn.calls == 2
+
+    calls = []
+
+    async def slow_then_fast():
+        calls.append(None)
+        await asyncio.sleep(1 if len(calls) == 1 else 0)
+        return "ok"
+
+    policy = RetryPolicy(timeout=0.05, backoff_base=0.001)
+    start = time.monotonic()
+    assert asyncio.run(resilience.async_call(slow_then_fast, policy)) == "ok"
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 2
+
+
+def test_circuit_breaker():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    policy = RetryPolicy(max_attempts=1)
+
+    for _ in range(2):
+        with pytest.raises(openai.APIStatusError):
+            resilience.call(Flaky(status_error(503)), policy, circuit_breaker)
+    assert circuit_breaker.is_open
+
+    fn = Flaky()
+    with pytest.raises(exception.CircuitOpenError):
+        resilience.call(fn, policy, circuit_breaker)
+    assert fn.calls == 0
+
+    time.sleep(0.06)
+    assert resilience.call(fn, policy, circuit_breaker) == "ok"
+    assert not circuit_breaker.is_open
+
+
+def test_errors_of_the_caller_do_not_close_the_circuit():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    policy = RetryPolicy(max_attempts=1)
+
+    for error in [status_error(503), TypeError(), status_error(503)]:
+        with pytest.raises(type(error)):
+            resilience.call(Flaky(error), policy, circuit_breaker)
+    assert circuit_breaker.is_open
+
+    time.sleep(0.06)
+    with pytest.raises(TypeError):
+        resilience.call(Flaky(TypeError()), policy, circuit_breaker)
+    assert circuit_breaker.is_open
+    assert resilience.call(Flaky(), policy, circuit_breaker) == "ok"
+    assert not circuit_breaker.is_open
+
+
+def test_rate_limits_do_not_open_the_circuit():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    fn = Flaky(status_error(429))
+    assert resilience.call(fn, FAST_POLICY, circuit_breaker) == "ok"
+    assert not circuit_breaker.is_open
+
+
+def test_hedged_call():
+    calls = []
+
+    def slow_then_fast():
+        calls.append(None)
+        time.sleep(1 if len(calls) == 1 else 0)
+        return "ok"
+
+    start = time.monotonic()
+    assert resilience.call(slow_then_fast, RetryPolicy(hedge_after=0.05)) == "ok"
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 2
+
+    async def async_slow_then_fast():
+        calls.append(None)
+        await asyncio.sleep(1 if len(calls) == 3 else 0)
+        return "ok"
+
+    start = time.monotonic()
+    policy = RetryPolicy(hedge_after=0.05)
+    assert asyncio.run(resilience.async_call(async_slow_then_fast, policy)) == "ok"
+    assert time.monotonic() - start < 0.5
+    assert len(calls) == 4
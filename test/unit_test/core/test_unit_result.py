@@ -0,0 +1,92 @@
+from danoan.word_guru.core import exception, result
+
+import json
+import pytest
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '["a", "b"]',
+        '```json\n["a", "b"]\n```',
+        'Here are the synonyms: ["a", "b"]. Enjoy!',
+        '["a", "b",]',
+    ],
+)
+def test_loads_repairs_common_defects(response):
+    assert result.loads(response) == ["a", "b"]
+
+
+def test_loads_raises_value_error():
+    with pytest.raises(ValueError):
+        result.loads('["a", "b"')
+
+
+def test_parse_types():
+    synonyms = result.parse("synonym", '["joy", "bliss"]')
+    assert isinstance(synonyms, result.SynonymList)
+    assert list(synonyms) == ["joy", "bliss"]
+
+    correction = result.parse("correction", '{"grammar": [{"original": "a"}]}')
+    assert isinstance(correction, result.Correction)
+    assert correction.categories["grammar"][0]["original"] == "a"
+    with pytest.raises(TypeError):
+        correction.categories["spelling"] = ()
+    with pytest.raises(TypeError):
+        correction.categories["grammar"][0]["original"] = "b"
+
+    card = {
+        "definitions": ["a state of well-being"],
+        "synonyms": ["joy"],
+        "pos_tags": ["noun"],
+        "usage_examples": [],
+    }
+    word_card = result.parse("word-card", json.dumps(card))
+    assert word_card.pos_tags == ("noun",)
+
+
+def test_to_json_value():
+    card = {
+        "definitions": ["a state of well-being"],
+        "synonyms": ["joy"],
+        "pos_tags": ["noun"],
+        "usage_examples": [],
+    }
+    corrections = {"grammar": [{"original": "a", "corrected": "b"}]}
+    assert result.parse("synonym", '["joy"]').to_json_value() == ["joy"]
+    assert result.parse("word-card", json.dumps(card)).to_json_value() == card
+    assert (
+        result.parse("correction", json.dumps(corrections)).to_json_value()
+        == corrections
+    )
+
+
+def test_parse_invalid_responses():
+    with pytest.raises(exception.OperationNotFoundError):
+        result.parse("unknown", "[]")
+    with pytest.raises(exception.InvalidResponseError):
+        result.parse("synonym", '{"joy": 1}')
+    with pytest.raises(exception.InvalidResponseError):
+        result.parse("synonym", "joy, bliss")
+    with pytest.raises(exception.InvalidResponseError):
+        result.parse("word-card", '{"definitions": []}')
+
+
+def test_parsed_results_are_memoized():
+    response = '["joy", "bliss"]'
+    assert result.parse("synonym", response) is result.parse("synonym", response)
+
+
+def test_memoized_corrections_are_immutable():
+    response = '{"grammar": [{"original": "a", "changes": ["b"]}]}'
+    correction = result.parse("correction", response)
+    entry = correction.categories["grammar"][0]
+    with pytest.raises(TypeError):
+        entry["original"] = "c"
+    with pytest.raises(AttributeError):
+        entry["changes"].append("c")
+
+    assert result.parse("correction", response).categories["grammar"][0] == {
+        "original": "a",
+        "changes": ("b",),
+    }
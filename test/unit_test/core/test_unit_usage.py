@@ -0,0 +1,37 @@
+from conftest import FakeResponse
+from danoan.word_guru.core import usage
+from danoan.word_guru.core.usage import Usage, UsageKey, UsageLog
+
+
+def test_reported_and_estimated_usage():
+    response = FakeResponse("answer")
+    assert usage.get_reported_usage(response) is None
+    assert usage.estimate_usage("a" * 40, "answer") == Usage(1, 1, 11, 2)
+
+    response.usage_metadata = {"input_tokens": 30, "output_tokens": 5}
+    assert usage.get_reported_usage(response) == Usage(1, 0, 30, 5)
+
+
+def test_usage_log(tmp_path):
+    path = tmp_path / "cache.db"
+    definition = UsageKey("definition", ("eng",), "gpt-4o-mini")
+    translation = UsageKey("translation", ("fra", "eng"), "gpt-4o-mini")
+
+    usage_log = UsageLog(path)
+    usage_log.record(definition, Usage(1, 0, 100, 10))
+    usage_log.record(definition, Usage(1, 1, 120, 20))
+    other_log = UsageLog(path)
+    other_log.record(translation, Usage(1, 0, 50, 5))
+    other_log.flush()
+
+    report = usage_log.report()
+    assert report.usage == {
+        definition: Usage(2, 1, 220, 30),
+        translation: Usage(1, 0, 50, 5),
+    }
+    assert report.total.total_tokens == 305
+
+    other_log.reset()
+    assert usage_log.report().usage == {}
+    usage_log.close()
+    other_log.close()